@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
-from typing import List
+from typing import Generator, List
 import logging
 
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Q, JSONField
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KeyTextTransform
 
 from fyle_integrations_platform_connector import PlatformConnector
 from fyle.platform.internals.decorators import retry
@@ -11,7 +13,7 @@ from fyle.platform.exceptions import InternalServerError, RetryException
 
 from apps.fyle.models import Expense, ExpenseGroup
 from apps.workspaces.models import Workspace, FyleCredential, Configuration
-from apps.fyle.helpers import get_updated_accounting_export_summary, get_batched_expenses
+from apps.fyle.helpers import get_updated_accounting_export_summary
 from fyle_netsuite_api.logging_middleware import get_logger, get_caller_info
 
 
@@ -113,28 +115,28 @@ def mark_expenses_as_skipped(final_query: Q, expenses_object_ids: List, workspac
     return skipped_expenses_list
 
 
+def __mark_as_synced(expenses) -> None:
+    """
+    Mark accounting export summary of the expenses as synced with a single update
+    :param expenses: Expenses queryset
+    :return: None
+    """
+    expenses.update(
+        accounting_export_summary=RawSQL(
+            "jsonb_set(accounting_export_summary, '{synced}', 'true')", [], output_field=JSONField()
+        ),
+        previous_export_state=KeyTextTransform('state', 'accounting_export_summary'),
+        updated_at=datetime.now(timezone.utc)
+    )
+
+
 def mark_accounting_export_summary_as_synced(expenses: List[Expense]) -> None:
     """
     Mark accounting export summary as synced in bulk
     :param expenses: List of expenses
     :return: None
     """
-    # Mark all expenses as synced
-    expense_to_be_updated = []
-    current_time = datetime.now(timezone.utc)
-    for expense in expenses:
-        expense.accounting_export_summary['synced'] = True
-        updated_accounting_export_summary = expense.accounting_export_summary
-        expense_to_be_updated.append(
-            Expense(
-                id=expense.id,
-                accounting_export_summary=updated_accounting_export_summary,
-                previous_export_state=updated_accounting_export_summary['state'],
-                updated_at=current_time
-            )
-        )
-
-    Expense.objects.bulk_update(expense_to_be_updated, ['accounting_export_summary', 'previous_export_state', 'updated_at'], batch_size=50)
+    __mark_as_synced(Expense.objects.filter(id__in=[expense.id for expense in expenses]))
 
 
 def update_failed_expenses(failed_expenses: List[Expense], is_mapping_error: bool) -> None:
@@ -246,7 +248,7 @@ def bulk_post_accounting_export_summary(platform: PlatformConnector, payload: Li
 def create_generator_and_post_in_batches(accounting_export_summary_batches: List[dict], platform: PlatformConnector, workspace_id: int) -> None:
     """
     Create generator and post in batches
-    :param accounting_export_summary_batches: Accounting export summary batches
+    :param accounting_export_summary_batches: Accounting export summary batches, any iterable of batches
     :param platform: Platform connector object
     :param workspace_id: Workspace id
     :return: None
@@ -256,8 +258,9 @@ def create_generator_and_post_in_batches(accounting_export_summary_batches: List
             if batched_payload:
                 bulk_post_accounting_export_summary(platform, batched_payload)
 
-                batched_expenses = get_batched_expenses(batched_payload, workspace_id)
-                mark_accounting_export_summary_as_synced(batched_expenses)
+                __mark_as_synced(Expense.objects.filter(
+                    workspace_id=workspace_id, expense_id__in=[expense['id'] for expense in batched_payload]
+                ))
         except RetryException:
             logger.error(
                 'Internal server error while posting accounting export summary to Fyle workspace_id: %s',
@@ -267,19 +270,59 @@ def create_generator_and_post_in_batches(accounting_export_summary_batches: List
             __handle_post_accounting_export_summary_exception(exception, workspace_id)
 
 
-def post_accounting_export_summary(workspace_id: int, expense_ids: List = None, fund_source: str = None, is_failed: bool = False) -> None:
+def __get_accounting_export_summary_batches(filters: dict, batch_size: int, workspace_id: int, caller_info: str) -> Generator[List[dict], None, None]:
+    """
+    Yield accounting export summary payloads of the expenses matching the filters, paginated by id
+    Expenses marked as synced after a batch is posted drop out of the filters, so pages are
+    keyed on the last seen id instead of an offset
+    :param filters: Expense filters
+    :param batch_size: Batch size
+    :param workspace_id: Workspace id
+    :param caller_info: Caller info for logging
+    :return: Generator of payloads
+    """
+    worker_logger = get_logger()
+    last_id = 0
+
+    while True:
+        expenses = list(
+            Expense.objects.filter(**filters, id__gt=last_id).order_by('id').values_list(
+                'id', 'accounting_export_summary'
+            )[:batch_size]
+        )
+
+        if not expenses:
+            return
+
+        last_id = expenses[-1][0]
+
+        payload = []
+        for _, accounting_export_summary in expenses:
+            accounting_export_summary.pop('synced')
+            payload.append(accounting_export_summary)
+
+        worker_logger.info(
+            'Called from %s, Posting accounting export summary to Fyle workspace_id: %s, payload: %s',
+            caller_info,
+            workspace_id,
+            payload
+        )
+        yield payload
+
+
+def post_accounting_export_summary(workspace_id: int, expense_ids: List = None, fund_source: str = None, is_failed: bool = False, batch_size: int = None) -> None:
     """
     Post accounting export summary to Fyle
     :param org_id: org id
     :param workspace_id: workspace id
     :param fund_source: fund source
+    :param batch_size: number of expenses posted per request
     :return: None
     """
     configuration = Configuration.objects.get(workspace_id=workspace_id)
     if configuration.skip_accounting_export_summary_post:
         return
-    
-    worker_logger = get_logger()
+
     caller_info = get_caller_info()
     # Iterate through all expenses which are not synced and post accounting export summary to Fyle in batches
     fyle_credentials = FyleCredential.objects.get(workspace_id=workspace_id)
@@ -298,28 +341,8 @@ def post_accounting_export_summary(workspace_id: int, expense_ids: List = None,
     if is_failed:
         filters['accounting_export_summary__state'] = 'ERROR'
 
-    expenses_count = Expense.objects.filter(**filters).count()
-
-    accounting_export_summary_batches = []
-    page_size = 20
-    for offset in range(0, expenses_count, page_size):
-        limit = offset + page_size
-        paginated_expenses = Expense.objects.filter(**filters).order_by('id')[offset:limit]
-
-        payload = []
-
-        for expense in paginated_expenses:
-            accounting_export_summary = expense.accounting_export_summary
-            accounting_export_summary.pop('synced')
-            payload.append(expense.accounting_export_summary)
-
-        accounting_export_summary_batches.append(payload)
-
-    worker_logger.info(
-        'Called from %s, Posting accounting export summary to Fyle workspace_id: %s, payload: %s',
-        caller_info,
-        workspace_id,
-        accounting_export_summary_batches
+    accounting_export_summary_batches = __get_accounting_export_summary_batches(
+        filters, batch_size or settings.ACCOUNTING_EXPORT_SUMMARY_BATCH_SIZE, workspace_id, caller_info
     )
     create_generator_and_post_in_batches(accounting_export_summary_batches, platform, workspace_id)
 
@@ -46,18 +46,6 @@ def get_updated_accounting_export_summary(
         'synced': is_synced
     }
 
-def get_batched_expenses(batched_payload: List[dict], workspace_id: int) -> List[Expense]:
-    """
-    Get batched expenses
-    :param batched_payload: batched payload
-    :param workspace_id: workspace id
-    :return: batched expenses
-    """
-    expense_ids = [expense['id'] for expense in batched_payload]
-    return Expense.objects.filter(expense_id__in=expense_ids, workspace_id=workspace_id)
-
-
-
 def get_exportable_expense_group_ids(workspace_id):
     configuration = Configuration.objects.get(workspace_id=workspace_id)
     fund_source = []
@@ -138,6 +126,88 @@ def get_source_account_type(fund_source: List[str]) -> List[str]:
     return source_account_type
 
 
+def format_platform_datetime(value: datetime) -> str:
+    """
+    Format datetime as a Fyle platform gte filter
+    :param value: datetime
+    :return: filter
+    """
+    return 'gte.{}'.format(datetime.strftime(value, '%Y-%m-%dT%H:%M:%S.000Z'))
+
+
+def get_expenses_query_params(
+    source_account_type: List[str],
+    state: str,
+    settled_at: datetime = None,
+    approved_at: datetime = None,
+    last_paid_at: datetime = None
+) -> dict:
+    """
+    Get query params of the expenses to import, matching the filters of platform.expenses.get
+    :param source_account_type: Source account types
+    :param state: Expense state
+    :param settled_at: Settled at
+    :param approved_at: Approved at
+    :param last_paid_at: Last paid at
+    :return: query params
+    """
+    states = [state]
+    # Expenses move on to later states after the sync, so incremental syncs include them
+    if state == 'PAYMENT_PROCESSING' and settled_at:
+        states.append('PAID')
+    elif state == 'APPROVED' and (settled_at or approved_at):
+        states.extend(['PAYMENT_PROCESSING', 'PAID'])
+
+    # Paged by offset and saved page by page, so the order is on keys that don't change with
+    # the sync and new expenses land on the last page instead of shifting earlier pages
+    query_params = {
+        'order': 'created_at.asc,id.asc',
+        'source_account->type': 'eq.{}'.format(source_account_type[0]) if len(source_account_type) == 1
+            else 'in.{}'.format(tuple(source_account_type)).replace('\'', '"'),
+        'state': 'eq.{}'.format(states[0]) if len(states) == 1 else 'in.{}'.format(tuple(states)).replace('\'', '"')
+    }
+
+    if settled_at:
+        query_params['last_settled_at'] = format_platform_datetime(settled_at)
+
+    if last_paid_at:
+        query_params['report_last_paid_at'] = format_platform_datetime(last_paid_at)
+
+    if approved_at:
+        query_params['report_last_approved_at'] = format_platform_datetime(approved_at)
+
+    return query_params
+
+
+def get_expenses_in_pages(
+    platform: PlatformConnector,
+    source_account_type: List[str],
+    state: str,
+    settled_at: datetime = None,
+    approved_at: datetime = None,
+    last_paid_at: datetime = None
+):
+    """
+    Get expenses page by page, with the same filters and constructed objects as platform.expenses.get
+    :param platform: Platform connector
+    :param source_account_type: Source account types
+    :param state: Expense state
+    :param settled_at: Settled at
+    :param approved_at: Approved at
+    :param last_paid_at: Last paid at
+    :return: Generator of lists of expenses
+    """
+    query_params = get_expenses_query_params(source_account_type, state, settled_at, approved_at, last_paid_at)
+
+    for expense_list in platform.expenses.connection.list_all(query_params):
+        # Non reimbursable personal cash expenses are never imported
+        expenses = [
+            expense for expense in expense_list['data']
+            if expense['is_reimbursable'] or expense['source_account']['type'] != 'PERSONAL_CASH_ACCOUNT'
+        ]
+        yield platform.expenses.construct_expense_object(expenses, platform.workspace_id)
+
+
 def get_filter_credit_expenses(expense_group_settings: ExpenseGroupSettings) -> bool:
     """
     Get filter credit expenses
@@ -1,6 +1,7 @@
 """
 Fyle Models
 """
+import json
 import logging
 from dateutil import parser
 from typing import List, Dict
@@ -8,11 +9,9 @@ from datetime import datetime, timezone
 from collections import defaultdict
 
 
-from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.fields import ArrayField
-from django.db.models.fields.json import KeyTextTransform
 from django.db import models
-from django.db.models import Count, Q, JSONField
+from django.db.models import Q, JSONField
 
 from fyle_accounting_mappings.models import ExpenseAttribute
 from fyle_accounting_mappings.mixins import AutoAddCreateUpdateInfoMixin
@@ -145,9 +144,12 @@ class Expense(models.Model):
     def create_expense_objects(expenses: List[Dict], workspace_id, skip_update: bool = False, imported_from: ExpenseImportSourceEnum = None):
         """
         Bulk create expense objects
-        """
 
-        expense_objects = []
+        Expenses are upserted on expense_id with a single INSERT ... ON CONFLICT DO UPDATE per batch,
+        and the ones that are not skipped and not part of an expense group yet are returned
+        """
+        expense_objects_map = {}
+        update_fields = None
 
         for expense in expenses:
             for custom_property_field in expense['custom_properties']:
@@ -202,22 +204,38 @@ class Expense(models.Model):
             if expense_data_to_append:
                 defaults.update(expense_data_to_append)
 
-            expense_object, created = Expense.objects.update_or_create(
-                expense_id=expense['id'],
-                defaults=defaults
-            )
+            if update_fields is None:
+                update_fields = list(defaults.keys()) + ['updated_at']
 
-            # Only set imported_from for newly created expenses
-            if created and imported_from:
-                expense_object.imported_from = imported_from
-                expense_object.save(
-                    update_fields=['imported_from']
-                )
-            
-            if (not expense_object.is_skipped and not ExpenseGroup.objects.filter(expenses__id=expense_object.id).first()):
-                expense_objects.append(expense_object)
+            expense_objects_map[expense['id']] = Expense(expense_id=expense['id'], **defaults)
+
+        if not expense_objects_map:
+            return []
+
+        expense_ids = list(expense_objects_map.keys())
+
+        # Only set imported_from for newly created expenses
+        if imported_from:
+            existing_expense_ids = set(Expense.objects.filter(expense_id__in=expense_ids).values_list('expense_id', flat=True))
+            for expense_id, expense_object in expense_objects_map.items():
+                if expense_id not in existing_expense_ids:
+                    expense_object.imported_from = imported_from
+
+        Expense.objects.bulk_create(
+            expense_objects_map.values(),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['expense_id'],
+            update_fields=update_fields
+        )
+
+        ungrouped_expenses = {
+            expense.expense_id: expense for expense in Expense.objects.filter(
+                expense_id__in=expense_ids, expensegroup__isnull=True
+            ).exclude(is_skipped=True)
+        }
 
-        return expense_objects
+        return [ungrouped_expenses[expense_id] for expense_id in expense_ids if expense_id in ungrouped_expenses]
 
 
 def get_default_expense_group_fields():
@@ -349,23 +367,47 @@ class ExpenseGroupSettings(AutoAddCreateUpdateInfoMixin, models.Model):
         )
 
 
-def _group_expenses(expenses, group_fields, workspace_id):
-    expense_ids = list(map(lambda expense: expense.id, expenses))
-    expenses = Expense.objects.filter(id__in=expense_ids).all()
+def _get_custom_property_text(value):
+    """
+    Get the text of a custom property value, as Postgres returns it for custom_properties ->> key
+    """
+    if value is None or isinstance(value, str):
+        return value
+
+    return json.dumps(value)
+
 
+def _group_expenses(expenses, group_fields, workspace_id):
+    """
+    Group already loaded expenses by the group fields in memory
+    :return: list of group dicts with the group field values, total and expense_ids
+    """
     custom_fields = {}
+    model_fields = []
 
     for field in group_fields:
         if field.lower() not in ALLOWED_FIELDS:
-            group_fields.pop(group_fields.index(field))
-            field = ExpenseAttribute.objects.filter(workspace_id=workspace_id,
-                                                    attribute_type=field.upper()).first()
-            if field:
-                custom_fields[field.attribute_type.lower()] = KeyTextTransform(field.display_name, 'custom_properties')
+            attribute = ExpenseAttribute.objects.filter(workspace_id=workspace_id, attribute_type=field.upper()).first()
+            if attribute:
+                custom_fields[attribute.attribute_type.lower()] = attribute.display_name
+        else:
+            model_fields.append(field)
 
-    expense_groups = list(
-        expenses.values(*group_fields, **custom_fields).annotate(total=Count('*'), expense_ids=ArrayAgg('id')))
-    return expense_groups
+    expense_groups = {}
+
+    for expense in sorted(expenses, key=lambda expense: expense.id):
+        group = {field: getattr(expense, field) for field in model_fields}
+        for field, display_name in custom_fields.items():
+            group[field] = _get_custom_property_text((expense.custom_properties or {}).get(display_name))
+
+        key = tuple(group.values())
+        if key not in expense_groups:
+            expense_groups[key] = {**group, 'total': 0, 'expense_ids': []}
+
+        expense_groups[key]['total'] += 1
+        expense_groups[key]['expense_ids'].append(expense.id)
+
+    return list(expense_groups.values())
 
 
 def filter_expense_groups(
@@ -375,49 +417,55 @@ def filter_expense_groups(
     reimbursable_export_type=None,
     ccc_export_type=None,
 ):
-
+    """
+    Filter negative expenses out of the expense groups
+    :param expense_groups: expense groups from _group_expenses
+    :param expenses: expenses that were grouped
+    :param expense_group_fields: expense group fields
+    :param reimbursable_export_type: reimbursable export type
+    :param ccc_export_type: ccc export type
+    :return: filtered expense groups, skipped expense ids
+    """
     filtered_expense_groups = []
     skipped_expense_ids = []
 
+    expenses_by_id = {expense.id: expense for expense in expenses}
+
+    # Negative expenses are skipped only when the group (or spent_at bucket) totals to a negative amount
+    filter_negative_totals = 'expense_id' not in expense_group_fields and (
+        reimbursable_export_type in ('EXPENSE REPORT', 'BILL') or ccc_export_type == 'BILL'
+    )
+    filter_negative_expenses = not filter_negative_totals and (
+        reimbursable_export_type not in ['JOURNAL ENTRY'] or ccc_export_type == 'BILL'
+    )
+    bucket_by_spent_at = 'spent_at' in expense_group_fields
+
     for expense_group in expense_groups:
-        expense_group_expenses_ids = expense_group['expense_ids']
         filtered_expenses = [
-            item for item in expenses if item.id in expense_group_expenses_ids
+            expenses_by_id[expense_id] for expense_id in expense_group['expense_ids'] if expense_id in expenses_by_id
         ]
-        if 'expense_id' not in expense_group_fields and (
-            reimbursable_export_type in ('EXPENSE REPORT', 'BILL') or ccc_export_type == 'BILL'
-        ):
-            total_amount = 0
-            if "spent_at" in expense_group_fields:
-                grouped_data = defaultdict(list)
-                for expense in filtered_expenses:
-                    spent_at = expense.spent_at
-                    grouped_data[spent_at].append(expense)
-                grouped_expenses = list(grouped_data.values())
-                expense_groups = []
-                for group_expense in grouped_expenses:
-                    total_amount = 0
-                    for expense in group_expense:
-                        total_amount += expense.amount
-                    if total_amount < 0:
-                        skipped_expense_ids.extend([expense.id for expense in group_expense if expense.amount < 0])
-                        filtered_expenses = list(
-                            filter(lambda expense: expense.amount > 0, group_expense)
-                        )
-            else:
-                for expense in filtered_expenses:
-                    total_amount += expense.amount
 
-                if total_amount < 0:
-                    skipped_expense_ids.extend([expense.id for expense in filtered_expenses if expense.amount < 0])
-                    filtered_expenses = list(
-                        filter(lambda expense: expense.amount > 0, filtered_expenses)
-                    )
-        elif reimbursable_export_type not in ['JOURNAL ENTRY'] or ccc_export_type == 'BILL':
+        if filter_negative_totals:
+            bucket_totals = defaultdict(int)
+            for expense in filtered_expenses:
+                bucket_totals[expense.spent_at if bucket_by_spent_at else None] += expense.amount
+
+            negative_buckets = {bucket for bucket, total_amount in bucket_totals.items() if total_amount < 0}
+
+            if negative_buckets:
+                group_expenses = filtered_expenses
+                filtered_expenses = []
+                for expense in group_expenses:
+                    if (expense.spent_at if bucket_by_spent_at else None) not in negative_buckets:
+                        filtered_expenses.append(expense)
+                    elif expense.amount > 0:
+                        filtered_expenses.append(expense)
+                    elif expense.amount < 0:
+                        skipped_expense_ids.append(expense.id)
+
+        elif filter_negative_expenses:
             skipped_expense_ids.extend([expense.id for expense in filtered_expenses if expense.amount < 0])
-            filtered_expenses = list(
-                filter(lambda expense: expense.amount > 0, filtered_expenses)
-            )
+            filtered_expenses = [expense for expense in filtered_expenses if expense.amount > 0]
 
         filtered_expense_ids = [item.id for item in filtered_expenses]
 
@@ -452,8 +500,12 @@ class ExpenseGroup(models.Model):
     def create_expense_groups_by_report_id_fund_source(expense_objects: List[Expense], configuration: Configuration, workspace_id):
         """
         Group expense by report_id and fund_source
+        Groups, their description and employee name are computed from the loaded expenses,
+        then all groups and their expense links are inserted in bulk
         """
         expense_group_settings = ExpenseGroupSettings.objects.get(workspace_id=workspace_id)
+        expense_objects = list(expense_objects)
+        expenses_by_id = {expense.id: expense for expense in expense_objects}
         expense_groups = []
         filtered_corporate_credit_card_expense_groups = []
         skipped_expense_ids = []
@@ -528,22 +580,19 @@ class ExpenseGroup(models.Model):
         
         expense_groups.extend(filtered_corporate_credit_card_expense_groups)
 
+        expense_group_objects = []
+        expense_group_expense_ids = []
+
         for expense_group in expense_groups:
-            if expense_group_settings.reimbursable_export_date_type == 'last_spent_at' and expense_group['fund_source'] == 'PERSONAL':
-                expense_group['last_spent_at'] = Expense.objects.filter(
-                    id__in=expense_group['expense_ids']).order_by('-spent_at').first().spent_at
-
-            if expense_group_settings.ccc_export_date_type == 'last_spent_at' and expense_group['fund_source'] == 'CCC':
-                expense_group['last_spent_at'] = Expense.objects.filter(
-                    id__in=expense_group['expense_ids']).order_by('-spent_at').first().spent_at
-            
-            employee_name = Expense.objects.filter(
-                id__in=expense_group['expense_ids']
-            ).first().employee_name
-
-            employee_name = Expense.objects.filter(
-                id__in=expense_group['expense_ids']
-            ).first().employee_name
+            group_expenses = [expenses_by_id[expense_id] for expense_id in expense_group['expense_ids']]
+
+            if (expense_group_settings.reimbursable_export_date_type == 'last_spent_at' and expense_group['fund_source'] == 'PERSONAL') or \
+                    (expense_group_settings.ccc_export_date_type == 'last_spent_at' and expense_group['fund_source'] == 'CCC'):
+                # Postgres sorts nulls first in descending order
+                spent_at_values = [expense.spent_at for expense in group_expenses]
+                expense_group['last_spent_at'] = None if None in spent_at_values else max(spent_at_values)
+
+            employee_name = min(group_expenses, key=lambda expense: expense.id).employee_name
             expense_ids = expense_group['expense_ids']
             expense_group.pop('total')
             expense_group.pop('expense_ids')
@@ -555,14 +604,23 @@ class ExpenseGroup(models.Model):
                     else:
                         expense_group[key] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
 
-            expense_group_object = ExpenseGroup.objects.create(
+            expense_group_objects.append(ExpenseGroup(
                 workspace_id=workspace_id,
                 fund_source=expense_group['fund_source'],
                 description=expense_group,
                 employee_name=employee_name
-            )
-            
-            expense_group_object.expenses.add(*expense_ids)
+            ))
+            expense_group_expense_ids.append(expense_ids)
+
+        if expense_group_objects:
+            ExpenseGroup.objects.bulk_create(expense_group_objects, batch_size=1000)
+
+            ExpenseGroupExpense = ExpenseGroup.expenses.through
+            ExpenseGroupExpense.objects.bulk_create([
+                ExpenseGroupExpense(expensegroup_id=expense_group_object.id, expense_id=expense_id)
+                for expense_group_object, expense_ids in zip(expense_group_objects, expense_group_expense_ids)
+                for expense_id in expense_ids
+            ], batch_size=1000)
 
         return skipped_expense_ids
 
@@ -4,6 +4,7 @@ from typing import List, Dict
 import traceback
 from datetime import datetime, timedelta, timezone
 
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Count, Q
 from django_q.models import Schedule
@@ -24,6 +25,7 @@ from fyle_accounting_library.fyle_platform.helpers import (
     filter_expenses_based_on_state
 )
 from apps.workspaces.models import (
+    FeatureConfig,
     FyleCredential,
     LastExportDetail,
     Workspace,
@@ -35,6 +37,7 @@ from fyle_accounting_mappings.models import ExpenseAttribute, CategoryMapping
 from .models import Expense, ExpenseFilter, ExpenseGroup, ExpenseGroupSettings, SOURCE_ACCOUNT_MAP as EXPENSE_SOURCE_ACCOUNT_MAP
 from .helpers import construct_expense_filter_query, update_task_log_post_import
 from .helpers import (
+    get_expenses_in_pages,
     get_filter_credit_expenses,
     get_source_account_type,
     get_fund_source,
@@ -105,6 +108,10 @@ def create_expense_groups(workspace_id: int, fund_source: List[str], task_log: T
     :param fund_source: expense fund source
     """
     try:
+        if FeatureConfig.get_feature_config(workspace_id=workspace_id, key='stream_expense_import'):
+            stream_expenses_and_create_groups(workspace_id, fund_source, task_log, imported_from)
+            return
+
         with transaction.atomic():
             expense_group_settings = ExpenseGroupSettings.objects.get(workspace_id=workspace_id)
             workspace = Workspace.objects.get(pk=workspace_id)
@@ -190,6 +197,99 @@ def create_expense_groups(workspace_id: int, fund_source: List[str], task_log: T
         update_task_log_post_import(task_log, 'FATAL', error=error)
 
 
+def _save_expense_pages(pages, workspace_id: int, imported_from: ExpenseImportSourceEnum, expense_ids: List[int]) -> int:
+    """
+    Save expenses page by page, each page in its own transaction
+    :param pages: Generator of lists of expenses
+    :param workspace_id: workspace id
+    :param imported_from: Imported from
+    :param expense_ids: Ids of saved expenses that are not part of an expense group, populated in place
+    :return: Number of expenses fetched
+    """
+    expenses_count = 0
+
+    for expenses in pages:
+        with transaction.atomic():
+            expense_objects = Expense.create_expense_objects(expenses, workspace_id, imported_from=imported_from)
+
+        expense_ids.extend(expense_object.id for expense_object in expense_objects)
+        expenses_count += len(expenses)
+
+    return expenses_count
+
+
+def stream_expenses_and_create_groups(workspace_id: int, fund_source: List[str], task_log: TaskLog | None, imported_from: ExpenseImportSourceEnum):
+    """
+    Import expenses page by page and group them once every page is saved
+
+    Only one page of expenses, or the expenses of one batch of employees while grouping, is
+    held in memory at a time. The sync watermarks are advanced after grouping succeeds, so a
+    run that fails midway is resumed by the next run from the same watermark, upserting the
+    already saved pages again.
+    :param workspace_id: workspace id
+    :param fund_source: expense fund source
+    :param task_log: Task log object
+    :param imported_from: Imported from
+    """
+    expense_group_settings = ExpenseGroupSettings.objects.get(workspace_id=workspace_id)
+    workspace = Workspace.objects.get(pk=workspace_id)
+    last_synced_at = workspace.last_synced_at if imported_from != ExpenseImportSourceEnum.CONFIGURATION_UPDATE else None
+    ccc_last_synced_at = workspace.ccc_last_synced_at if imported_from != ExpenseImportSourceEnum.CONFIGURATION_UPDATE else None
+    fyle_credentials = FyleCredential.objects.get(workspace_id=workspace_id)
+
+    platform = PlatformConnector(fyle_credentials)
+
+    filter_credit_expenses = True
+    if expense_group_settings.import_card_credits:
+        filter_credit_expenses = False
+
+    sync_started_at = datetime.now()
+    expense_ids = []
+    reimbursable_expenses_count = 0
+    ccc_expenses_count = 0
+
+    if 'PERSONAL' in fund_source:
+        reimbursable_expenses_count = _save_expense_pages(get_expenses_in_pages(
+            platform,
+            source_account_type=['PERSONAL_CASH_ACCOUNT'],
+            state=expense_group_settings.expense_state,
+            settled_at=(last_synced_at if expense_group_settings.expense_state == 'PAYMENT_PROCESSING' else None),
+            last_paid_at=(last_synced_at if expense_group_settings.expense_state == 'PAID' else None)
+        ), workspace_id, imported_from, expense_ids)
+
+    if 'CCC' in fund_source:
+        ccc_expenses_count = _save_expense_pages(get_expenses_in_pages(
+            platform,
+            source_account_type=['PERSONAL_CORPORATE_CREDIT_CARD_ACCOUNT'],
+            state=expense_group_settings.ccc_expense_state,
+            settled_at=(ccc_last_synced_at if expense_group_settings.ccc_expense_state == 'PAYMENT_PROCESSING' else None),
+            approved_at=(ccc_last_synced_at if expense_group_settings.ccc_expense_state == 'APPROVED' else None),
+            last_paid_at=(ccc_last_synced_at if expense_group_settings.ccc_expense_state == 'PAID' else None)
+        ), workspace_id, imported_from, expense_ids)
+
+    logger.info('Saved %s expenses page by page for workspace_id: %s', reimbursable_expenses_count + ccc_expenses_count, workspace_id)
+
+    with transaction.atomic():
+        ungrouped_expenses = Expense.objects.filter(id__in=expense_ids, expensegroup__isnull=True).exclude(is_skipped=True)
+
+        # Expense groups never span employees, so the expenses are grouped a batch of employees at a time
+        employee_emails = list(ungrouped_expenses.order_by('employee_email').values_list('employee_email', flat=True).distinct())
+        for index in range(0, max(len(employee_emails), 1), settings.EXPENSE_GROUPING_BATCH_SIZE):
+            expense_objects = list(ungrouped_expenses.filter(
+                employee_email__in=employee_emails[index:index + settings.EXPENSE_GROUPING_BATCH_SIZE]
+            ).order_by('id'))
+            group_expense_objects_and_save(expense_objects, task_log, workspace, filter_credit_expenses=filter_credit_expenses)
+
+        if imported_from != ExpenseImportSourceEnum.CONFIGURATION_UPDATE:
+            if workspace.last_synced_at or reimbursable_expenses_count:
+                workspace.last_synced_at = sync_started_at
+
+            if workspace.ccc_last_synced_at or ccc_expenses_count:
+                workspace.ccc_last_synced_at = sync_started_at
+
+            workspace.save()
+
+
 def skip_expenses_and_post_accounting_export_summary(expense_ids: List[int], workspace: Workspace, q_filters: Q = None):
     """
     Skip expenses and post accounting export summary
@@ -224,11 +324,26 @@ def group_expenses_and_save(
     :param imported_from: Imported from
     :param filter_credit_expenses: Filter credit expenses
     """
+    expense_objects = Expense.create_expense_objects(expenses, workspace.id, imported_from=imported_from)
+    group_expense_objects_and_save(expense_objects, task_log, workspace, filter_credit_expenses=filter_credit_expenses)
+
+
+def group_expense_objects_and_save(
+    expense_objects: List[Expense],
+    task_log: TaskLog | None,
+    workspace: Workspace,
+    filter_credit_expenses: bool = False
+):
+    """
+    Apply skip rules to saved expenses and group the rest into expense groups
+    :param expense_objects: Saved expenses that are not part of an expense group
+    :param task_log: Task log object
+    :param workspace: Workspace object
+    :param filter_credit_expenses: Filter credit expenses
+    """
     expense_filters = ExpenseFilter.objects.filter(workspace_id=workspace.id).order_by('rank')
     configuration: Configuration = Configuration.objects.get(workspace_id=workspace.id)
 
-    expense_objects = Expense.create_expense_objects(expenses, workspace.id, imported_from=imported_from)
-
     # Step 1: Mark negative expenses as skipped if filter_credit_expenses is True
     if filter_credit_expenses:
         negative_expense_ids = [e.id for e in expense_objects if e.amount < 0 and not e.is_skipped]
@@ -6,6 +6,7 @@ from django_q.models import OrmQ, Schedule
 
 from apps.fyle.actions import update_failed_expenses, post_accounting_export_summary
 from apps.fyle.models import ExpenseGroup
+from apps.netsuite.tasks import discard_interrupted_exports
 from apps.tasks.models import TaskLog
 from apps.workspaces.actions import export_to_netsuite
 from apps.workspaces.models import Workspace
@@ -17,6 +18,23 @@ logger = logging.getLogger(__name__)
 logger.level = logging.INFO
 
 target_func = ['apps.netsuite.tasks.create_bill', 'apps.netsuite.tasks.create_expense_report', 'apps.netsuite.tasks.create_credit_card_charge', 'apps.netsuite.tasks.create_journal_entry']
+batched_target_func = 'apps.netsuite.tasks.create_exports_in_batch'
+
+
+def get_queued_expense_group_ids(chain: list) -> list:
+    """
+    Get ids of the expense groups exported by a queued chain task
+    :param chain: Chain task, [func, args, ...]
+    :return: expense group ids
+    """
+    if len(chain) > 1 and chain[0] in target_func and isinstance(chain[1][0], int):
+        return [chain[1][0]]
+
+    # Batched exports take the export type first and the expense group ids as a list
+    if len(chain) > 1 and chain[0] == batched_target_func and len(chain[1]) > 1 and isinstance(chain[1][1], list):
+        return chain[1][1]
+
+    return []
 
 
 def re_export_stuck_exports():
@@ -40,10 +58,10 @@ def re_export_stuck_exports():
         for orm in ormqs:
             if 'chain' in orm.task and orm.task['chain']:
                 for chain in orm.task['chain']:
-                    if len(chain) > 1 and chain[0] in target_func and isinstance(chain[1][0], int):
-                        if chain[1][0] in expense_group_ids:
-                            logger.info('Skipping Re Export For Expense group %s', chain[1][0])
-                            expense_group_ids.remove(chain[1][0])
+                    for queued_expense_group_id in get_queued_expense_group_ids(chain):
+                        if queued_expense_group_id in expense_group_ids:
+                            logger.info('Skipping Re Export For Expense group %s', queued_expense_group_id)
+                            expense_group_ids.remove(queued_expense_group_id)
 
         logger.info('Re-exporting Expense Group IDs: %s', expense_group_ids)
         expense_groups = ExpenseGroup.objects.filter(id__in=expense_group_ids)
@@ -51,6 +69,8 @@ def re_export_stuck_exports():
         for expense_group in expense_groups:
             expenses.extend(expense_group.expenses.all())
         workspace_ids_list = list(workspace_ids)
+        # Exports that died between creating the export objects and saving the NetSuite response leave the objects behind
+        discard_interrupted_exports(expense_group_ids)
         task_logs.update(status='FAILED', updated_at=datetime.now(timezone.utc), re_attempt_export=True, stuck_export_re_attempt_count=F('stuck_export_re_attempt_count') + 1)
         for workspace_id in workspace_ids_list:
             errored_expenses = [expense for expense in expenses if expense.workspace_id == workspace_id]
@@ -0,0 +1,210 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from netsuitesdk import NetSuiteConnection
+
+logger = logging.getLogger(__name__)
+logger.level = logging.INFO
+
+ACCOUNT_SLOT_CACHE_KEY = 'netsuite_account_slot_{ns_account_id}_{slot}'
+ACCOUNT_SLOT_POLL_INTERVAL = 1
+
+__account_slots = threading.local()
+
+
+class NetSuiteConnectionPool:
+    """
+    Process wide pool of NetSuite connections
+
+    Building a NetSuiteConnection parses the WSDL, builds a zeep client and sets up
+    a fresh HTTP session, so connections are reused across tasks in the same process.
+    Connections are keyed by credential id and updated_at so that rotated credentials
+    never reuse a stale client, and by thread so that a zeep client is never shared
+    between concurrently running threads.
+    """
+
+    def __init__(self, idle_timeout: int = None, max_size: int = None):
+        self.__lock = threading.Lock()
+        self.__connections = {}
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.NETSUITE_CONNECTION_POOL_IDLE_TIMEOUT
+        self.max_size = max_size if max_size is not None else settings.NETSUITE_CONNECTION_POOL_MAX_SIZE
+
+    @staticmethod
+    def get_key(netsuite_credentials, search_body_fields_only: bool, page_size: int) -> tuple:
+        """
+        Get pool key for the credentials
+        :param netsuite_credentials: NetSuite credentials
+        :param search_body_fields_only: Search body fields only
+        :param page_size: Page size
+        :return: pool key
+        """
+        updated_at = netsuite_credentials.updated_at.isoformat() if netsuite_credentials.updated_at else None
+        return (
+            netsuite_credentials.id,
+            updated_at,
+            search_body_fields_only,
+            page_size,
+            threading.get_ident()
+        )
+
+    def __evict_idle_connections(self, now: float):
+        expired_keys = [
+            key for key, (_, last_used_at) in self.__connections.items()
+            if now - last_used_at > self.idle_timeout
+        ]
+
+        for key in expired_keys:
+            self.__connections.pop(key, None)
+
+        if len(self.__connections) >= self.max_size:
+            least_recently_used_key = min(self.__connections, key=lambda key: self.__connections[key][1])
+            self.__connections.pop(least_recently_used_key, None)
+
+    def get_connection(self, netsuite_credentials, search_body_fields_only: bool = True, page_size: int = 300) -> NetSuiteConnection:
+        """
+        Get a pooled NetSuite connection, creating one if none is available
+        :param netsuite_credentials: NetSuite credentials
+        :param search_body_fields_only: Search body fields only
+        :param page_size: Page size
+        :return: NetSuite connection
+        """
+        if not settings.NETSUITE_CONNECTION_POOL_ENABLED or not netsuite_credentials.id:
+            return self.create_connection(netsuite_credentials, search_body_fields_only, page_size)
+
+        key = self.get_key(netsuite_credentials, search_body_fields_only, page_size)
+        now = time.monotonic()
+
+        with self.__lock:
+            pooled = self.__connections.get(key)
+            if pooled and now - pooled[1] <= self.idle_timeout:
+                self.__connections[key] = (pooled[0], now)
+                return pooled[0]
+
+        connection = self.create_connection(netsuite_credentials, search_body_fields_only, page_size)
+
+        with self.__lock:
+            self.__evict_idle_connections(now)
+            self.__connections[key] = (connection, now)
+
+        return connection
+
+    @staticmethod
+    def create_connection(netsuite_credentials, search_body_fields_only: bool, page_size: int) -> NetSuiteConnection:
+        """
+        Create a new NetSuite connection
+        :param netsuite_credentials: NetSuite credentials
+        :param search_body_fields_only: Search body fields only
+        :param page_size: Page size
+        :return: NetSuite connection
+        """
+        return NetSuiteConnection(
+            account=netsuite_credentials.ns_account_id,
+            consumer_key=netsuite_credentials.ns_consumer_key,
+            consumer_secret=netsuite_credentials.ns_consumer_secret,
+            token_key=netsuite_credentials.ns_token_id,
+            token_secret=netsuite_credentials.ns_token_secret,
+            search_body_fields_only=search_body_fields_only,
+            page_size=page_size
+        )
+
+    def invalidate(self, netsuite_credentials_id: int):
+        """
+        Drop all pooled connections of the credentials
+        :param netsuite_credentials_id: NetSuite credentials id
+        """
+        with self.__lock:
+            keys = [key for key in self.__connections if key[0] == netsuite_credentials_id]
+            for key in keys:
+                self.__connections.pop(key, None)
+
+        if keys:
+            logger.info('Invalidated %s pooled NetSuite connections for credentials %s', len(keys), netsuite_credentials_id)
+
+    def has_connections(self, netsuite_credentials_id: int) -> bool:
+        """
+        Check if the pool holds any connection of the credentials
+        :param netsuite_credentials_id: NetSuite credentials id
+        :return: True if a connection is pooled
+        """
+        with self.__lock:
+            return any(key[0] == netsuite_credentials_id for key in self.__connections)
+
+    def clear(self):
+        """
+        Drop all pooled connections
+        """
+        with self.__lock:
+            self.__connections.clear()
+
+    def __len__(self):
+        return len(self.__connections)
+
+
+netsuite_connection_pool = NetSuiteConnectionPool()
+
+
+def get_slot_owner() -> str:
+    """
+    Get the owner of the slots taken by the current thread
+    :return: process and thread id
+    """
+    return '{}:{}'.format(os.getpid(), threading.get_ident())
+
+
+def acquire_account_slot(ns_account_id: str) -> Optional[str]:
+    """
+    Take one of the concurrency slots of a NetSuite account. The slots are keys in the shared
+    cache, so they bound the syncs of the account across worker processes, and expire after
+    NETSUITE_ACCOUNT_SLOT_TTL seconds in case a worker dies while holding one
+    :param ns_account_id: NetSuite account id
+    :return: cache key of the slot, none if no slot was free within NETSUITE_ACCOUNT_SLOT_WAIT_TIMEOUT seconds
+    """
+    deadline = time.monotonic() + settings.NETSUITE_ACCOUNT_SLOT_WAIT_TIMEOUT
+
+    while True:
+        for slot in range(settings.NETSUITE_ACCOUNT_CONCURRENCY_LIMIT):
+            slot_key = ACCOUNT_SLOT_CACHE_KEY.format(ns_account_id=ns_account_id, slot=slot)
+            if cache.add(slot_key, get_slot_owner(), settings.NETSUITE_ACCOUNT_SLOT_TTL):
+                return slot_key
+
+        if time.monotonic() >= deadline:
+            return None
+
+        time.sleep(ACCOUNT_SLOT_POLL_INTERVAL)
+
+
+@contextmanager
+def account_slot(ns_account_id: str):
+    """
+    Hold one of the concurrency slots of a NetSuite account for the current thread. If no slot
+    frees up within the wait timeout, the work goes ahead without one rather than waiting forever
+    :param ns_account_id: NetSuite account id
+    """
+    slot_key = acquire_account_slot(ns_account_id)
+    if not slot_key:
+        logger.warning('No concurrency slot of NetSuite account %s was free, syncing without one', ns_account_id)
+
+    __account_slots.ns_account_id = ns_account_id
+    try:
+        yield
+    finally:
+        __account_slots.ns_account_id = None
+        # A slot that expired may have been taken by another worker since
+        if slot_key and cache.get(slot_key) == get_slot_owner():
+            cache.delete(slot_key)
+
+
+def holds_account_slot(ns_account_id: str) -> bool:
+    """
+    Check if the current thread holds a concurrency slot of the NetSuite account
+    :param ns_account_id: NetSuite account id
+    :return: True if a slot is held
+    """
+    return getattr(__account_slots, 'ns_account_id', None) == ns_account_id
@@ -1,27 +1,36 @@
 import re
 import json
+import time
+import requests
+import hashlib
+import threading
 import copy
 from random import randint
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 from django.utils import timezone
-from django.db import transaction
+from django.db import connections, transaction
 
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 
 from workers.helpers import RoutingKeyEnum, WorkerActionEnum, publish_to_rabbitmq
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Max
 
 
 from requests_oauthlib import OAuth1Session
 
+from apps.workspaces.enums import CacheKeyEnum
 from apps.workspaces.helpers import get_app_name
 from netsuitesdk import NetSuiteConnection, NetSuiteRequestError
+from netsuitesdk.internal.utils import PaginatedSearch
 
 import text_unidecode
+import zeep
 
 from fyle_accounting_mappings.models import DestinationAttribute, ExpenseAttribute, MappingSetting
 
@@ -31,7 +40,8 @@ from apps.workspaces.models import Configuration, FeatureConfig
 from apps.mappings.models import SubsidiaryMapping, GeneralMapping
 from apps.netsuite.models import Bill, BillLineitem, ExpenseReport, ExpenseReportLineItem, JournalEntry, \
     JournalEntryLineItem, CustomSegment, VendorPayment, VendorPaymentLineitem, CreditCardChargeLineItem, \
-    CreditCardCharge, get_tax_info, NetSuiteAttributesCount
+    CreditCardCharge, get_tax_info, NetSuiteAttributesCount, NetSuiteDimensionSyncState
+from apps.netsuite.connection_pool import netsuite_connection_pool, account_slot, holds_account_slot
 from apps.workspaces.models import NetSuiteCredentials, FyleCredential, Workspace
 
 logger = logging.getLogger(__name__)
@@ -49,6 +59,159 @@ AttributeDisableCallbackPath = {
     'COST_CENTER': 'fyle_integrations_imports.modules.cost_centers.disable_cost_centers'
 }
 
+# Search fields of record types that aren't searched by lastModifiedDate
+INCREMENTAL_SYNC_SEARCH_FIELDS = {
+    'Item': 'modified'
+}
+
+BATCH_EXPORT_API_MAP = {
+    'CREATING_BILL': 'vendor_bills',
+    'CREATING_EXPENSE_REPORT': 'expense_reports',
+    'CREATING_JOURNAL_ENTRY': 'journal_entries'
+}
+
+
+class UpsertListRecordCollector:
+    """
+    Stands in for the NetSuite client while the SDK builds records, collecting
+    the records passed to upsert instead of posting them one at a time
+    """
+
+    def __init__(self, ns_client):
+        self.ns_client = ns_client
+        self.records = []
+
+    def __getattr__(self, name):
+        return getattr(self.ns_client, name)
+
+    def upsert(self, record, record_type=None):
+        self.records.append(record)
+        return {}
+
+
+class SyncContext:
+    """
+    Workspace state shared by the pages of a dimension sync, loaded once per sync
+    """
+
+    def __init__(self, workspace_id: int):
+        self.workspace_id = workspace_id
+        self.configuration = Configuration.objects.filter(workspace_id=workspace_id).first()
+        self.synced_at = timezone.now()
+        self.is_full_sync = True
+        self.is_incremental_sync_enabled = False
+        self.active_record_count = 0
+        self.__mapping_settings = None
+        self.__destination_ids = {}
+        self.__fingerprints = {}
+
+    def add_fetched_records(self, records: List[Dict]):
+        """
+        Count the active records of a fetched page
+        :param records: Fetched records
+        """
+        self.active_record_count += sum(1 for record in records if not record['isInactive'])
+
+    def get_mapping_setting(self, destination_field: str) -> Optional[MappingSetting]:
+        """
+        Get the mapping setting of the destination field
+        :param destination_field: Destination field
+        :return: mapping setting or none
+        """
+        if self.__mapping_settings is None:
+            self.__mapping_settings = {}
+            for mapping_setting in MappingSetting.objects.filter(workspace_id=self.workspace_id).order_by('id'):
+                self.__mapping_settings.setdefault(mapping_setting.destination_field, mapping_setting)
+
+        return self.__mapping_settings.get(destination_field)
+
+    def get_destination_ids(self, attribute_type: str, display_name: str) -> set:
+        """
+        Get destination ids of the existing destination attributes
+        :param attribute_type: Attribute type
+        :param display_name: Display name
+        :return: set of destination ids
+        """
+        key = (attribute_type, display_name)
+        if key not in self.__destination_ids:
+            self.__destination_ids[key] = set(DestinationAttribute.objects.filter(
+                workspace_id=self.workspace_id,
+                attribute_type=attribute_type,
+                display_name=display_name
+            ).values_list('destination_id', flat=True))
+
+        return self.__destination_ids[key]
+
+    def add_destination_ids(self, attribute_type: str, display_name: str, attributes: List[Dict]):
+        """
+        Track destination ids of attributes saved by the sync
+        :param attribute_type: Attribute type
+        :param display_name: Display name
+        :param attributes: Saved attributes
+        """
+        self.get_destination_ids(attribute_type, display_name).update(
+            attribute['destination_id'] for attribute in attributes
+        )
+
+    @staticmethod
+    def get_fingerprint(value: str, active: bool, detail: dict, code: str) -> str:
+        """
+        Get content hash of the fields compared by the destination attribute upsert
+        :param value: Value
+        :param active: Active
+        :param detail: Detail
+        :param code: Code
+        :return: fingerprint
+        """
+        content = json.dumps([value, active, detail, code], sort_keys=True, default=str)
+        return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+    def __get_fingerprints(self, attribute_type: str, display_name: str = None) -> dict:
+        key = (attribute_type, display_name)
+        if key not in self.__fingerprints:
+            filters = {
+                'workspace_id': self.workspace_id,
+                'attribute_type': attribute_type
+            }
+            if display_name:
+                filters['display_name'] = display_name
+
+            fingerprints = {}
+            for attribute in DestinationAttribute.objects.filter(**filters).values(
+                    'destination_id', 'value', 'active', 'detail', 'code').iterator():
+                # Destination ids shared by more than one attribute are never skipped
+                fingerprints[attribute['destination_id']] = None if attribute['destination_id'] in fingerprints \
+                    else self.get_fingerprint(attribute['value'], attribute['active'], attribute['detail'], attribute['code'])
+
+            self.__fingerprints[key] = fingerprints
+
+        return self.__fingerprints[key]
+
+    def get_changed_attributes(self, attributes: List[Dict], attribute_type: str, display_name: str = None) -> List[Dict]:
+        """
+        Drop attributes identical to the saved destination attributes so that
+        the upsert only compares and writes records that changed in NetSuite
+        :param attributes: Attributes to be upserted
+        :param attribute_type: Attribute type
+        :param display_name: Display name the upsert is filtered by
+        :return: changed attributes
+        """
+        fingerprints = self.__get_fingerprints(attribute_type, display_name)
+        unique_attributes = {attribute['destination_id']: attribute for attribute in attributes}
+
+        changed_attributes = []
+        for destination_id, attribute in unique_attributes.items():
+            fingerprint = self.get_fingerprint(
+                attribute['value'], attribute.get('active'), attribute.get('detail'), attribute.get('code')
+            )
+            if destination_id in fingerprints and fingerprints[destination_id] is None:
+                changed_attributes.append(attribute)
+            elif fingerprints.get(destination_id) != fingerprint:
+                changed_attributes.append(attribute)
+                fingerprints[destination_id] = fingerprint
+
+        return changed_attributes
+
 
 class NetSuiteConnector:
     """
@@ -57,17 +220,14 @@ class NetSuiteConnector:
 
     def __init__(self, netsuite_credentials: NetSuiteCredentials, workspace_id: int,
                  search_body_fields_only: bool = True, page_size: int = 300):
-        self.connection = NetSuiteConnection(
-            account=netsuite_credentials.ns_account_id,
-            consumer_key=netsuite_credentials.ns_consumer_key,
-            consumer_secret=netsuite_credentials.ns_consumer_secret,
-            token_key=netsuite_credentials.ns_token_id,
-            token_secret=netsuite_credentials.ns_token_secret,
+        self.connection = netsuite_connection_pool.get_connection(
+            netsuite_credentials,
             search_body_fields_only=search_body_fields_only,
             page_size=page_size
         )
 
         self.__netsuite_credentials = netsuite_credentials
+        self.__workspace_created_at = None
 
         self.workspace_id = workspace_id
 
@@ -93,6 +253,40 @@ class NetSuiteConnector:
         else:
             return '{0} @{1}%'.format(item_id, rate)
 
+    def get_attribute_count(self, attribute_type: str, api) -> int:
+        """
+        Get the number of active records of the attribute type, cached for
+        NETSUITE_ATTRIBUTE_COUNT_CACHE_TTL seconds
+        :param attribute_type: Attribute type, e.g. accounts
+        :param api: NetSuite SDK api of the record type
+        :return: attribute count
+        """
+        cache_key = CacheKeyEnum.NETSUITE_ATTRIBUTE_COUNT.value.format(
+            workspace_id=self.workspace_id, attribute_type=attribute_type)
+        attribute_count = cache.get(cache_key)
+
+        if attribute_count is None:
+            attribute_count = api.count()
+            self.update_attribute_count(attribute_type, attribute_count)
+
+        return attribute_count
+
+    def update_attribute_count(self, attribute_type: str, attribute_count: int):
+        """
+        Save and cache the number of active records of the attribute type
+        :param attribute_type: Attribute type, e.g. accounts
+        :param attribute_count: Attribute count
+        """
+        cache_key = CacheKeyEnum.NETSUITE_ATTRIBUTE_COUNT.value.format(
+            workspace_id=self.workspace_id, attribute_type=attribute_type)
+        cache.set(cache_key, attribute_count, settings.NETSUITE_ATTRIBUTE_COUNT_CACHE_TTL)
+
+        NetSuiteAttributesCount.update_attribute_count(
+            workspace_id=self.workspace_id,
+            attribute_type=attribute_type,
+            count=attribute_count
+        )
+
     def is_sync_allowed(self, attribute_count: int) -> bool:
         """
         Checks if the sync is allowed
@@ -104,8 +298,11 @@ class NetSuiteConnector:
             bool: True if sync allowed, False otherwise
         """
         if attribute_count > SYNC_UPPER_LIMIT:
-            workspace = Workspace.objects.get(id=self.workspace_id)
-            if workspace.created_at > timezone.make_aware(datetime(2024, 10, 1), timezone.get_current_timezone()):
+            # Workspace creation date is loaded once per connector, every dimension sync checks it
+            if self.__workspace_created_at is None:
+                self.__workspace_created_at = Workspace.objects.values_list('created_at', flat=True).get(id=self.workspace_id)
+
+            if self.__workspace_created_at > timezone.make_aware(datetime(2024, 10, 1), timezone.get_current_timezone()):
                 return False
             else:
                 return True
@@ -130,15 +327,236 @@ class NetSuiteConnector:
 
         return params
 
-    def is_import_enabled(self, attribute_type: str) -> bool:
+    def get_modified_records_generator(self, api, last_modified_at: datetime):
+        """
+        Get records modified after the datetime
+        :param api: NetSuite SDK api of the record type
+        :param last_modified_at: Last modified datetime
+        :return: records generator, none when the record type can't be searched by modified date
+        """
+        search_field = INCREMENTAL_SYNC_SEARCH_FIELDS.get(api.type_name, 'lastModifiedDate')
+        basic_search_type = api.ns_client.get_complex_type('{}SearchBasic'.format(api.type_name))
+
+        try:
+            basic_search = basic_search_type(**{
+                search_field: api.ns_client.SearchDateField(searchValue=last_modified_at, operator='after')
+            })
+        except TypeError:
+            logger.info('%s can not be searched by %s, falling back to a full sync', api.type_name, search_field)
+            return None
+
+        paginated_search = PaginatedSearch(
+            client=api.ns_client,
+            type_name=api.type_name,
+            basic_search=basic_search,
+            pageSize=20
+        )
+
+        return api._paginated_search_generator(paginated_search=paginated_search)
+
+    def get_records_generator(self, dimension: str, api, sync_context: SyncContext):
+        """
+        Get records of the dimension, only those modified since the last sync when
+        incremental sync is enabled and a full sync isn't due
+        :param dimension: NetSuite dimension
+        :param api: NetSuite SDK api of the record type
+        :param sync_context: Sync context
+        :return: records generator
+        """
+        sync_context.is_incremental_sync_enabled = FeatureConfig.get_feature_config(
+            workspace_id=self.workspace_id, key='incremental_dimension_sync')
+
+        if sync_context.is_incremental_sync_enabled:
+            last_modified_at = NetSuiteDimensionSyncState.get_last_modified_at(self.workspace_id, dimension)
+            records_generator = self.get_modified_records_generator(api, last_modified_at) if last_modified_at else None
+
+            if records_generator is not None:
+                sync_context.is_full_sync = False
+                return records_generator
+
+        return api.get_all_generator()
+
+    def get_search_record(self, api, search: Dict):
+        """
+        Get the search record of the search params
+        :param api: NetSuite SDK api of the record type
+        :param search: Search params
+        :return: search record
+        """
+        ns_client = api.ns_client
+
+        search_fields = {}
+        if search['active'] is not None:
+            search_fields['isInactive'] = ns_client.SearchBooleanField(searchValue=not search['active'])
+        if search['last_modified_date']:
+            search_fields['lastModifiedDate'] = ns_client.SearchDateField(
+                searchValue=search['last_modified_date'],
+                operator=search['operator']
+            )
+
+        search_record = ns_client.search_factory(type_name=api.type_name)
+        search_record.basic = ns_client.basic_search_factory(type_name=api.type_name, **search_fields)
+
+        return search_record
+
+    def get_search_results_generator(self, api, search: Dict, search_id: str = None, page_index: int = 0):
+        """
+        Get the search results page by page, continuing the search of the search id after the
+        page index when there is one and running the search from page 1 otherwise
+        :param api: NetSuite SDK api of the record type
+        :param search: Search params
+        :param search_id: NetSuite id of a search already run
+        :param page_index: Index of the last page already synced
+        :return: search results generator
+        """
+        ns_client = api.ns_client
+
+        if search_id:
+            result = ns_client.searchMoreWithId(searchId=search_id, pageIndex=page_index + 1)
+        else:
+            result = ns_client.search(searchRecord=self.get_search_record(api, search))
+            if not result.totalRecords:
+                return
+
+        yield result
+
+        while result.pageIndex < result.totalPages:
+            result = ns_client.searchMoreWithId(searchId=result.searchId, pageIndex=result.pageIndex + 1)
+            yield result
+
+    def get_checkpointed_records_generator(self, dimension: str, api, sync_context: SyncContext,
+                                           last_modified_date=None, active: bool = None, operator: str = 'after'):
+        """
+        Get records of the dimension, saving a checkpoint after every synced page so
+        that a sync that didn't finish continues its NetSuite search from the page after
+        the checkpoint while the search id is still valid, and runs the search of the
+        checkpoint again from page 1 once it has expired
+        :param dimension: NetSuite dimension
+        :param api: NetSuite SDK api of the record type
+        :param sync_context: Sync context
+        :param last_modified_date: Last modified date the records are searched by
+        :param active: Active status the records are searched by, none for no filter
+        :param operator: Operator of the last modified date search
+        :return: records generator
+        """
+        search = {
+            'last_modified_date': last_modified_date.isoformat() if isinstance(last_modified_date, datetime) else last_modified_date,
+            'active': active,
+            'operator': operator
+        }
+        search_id = None
+        page_index = 0
+
+        checkpoint = NetSuiteDimensionSyncState.get_checkpoint(self.workspace_id, dimension)
+        if checkpoint:
+            search = checkpoint['search']
+            sync_context.synced_at = datetime.fromisoformat(checkpoint['started_at'])
+
+            if datetime.fromisoformat(checkpoint['saved_at']) > timezone.now() - timedelta(seconds=settings.NETSUITE_SEARCH_ID_TTL):
+                search_id = checkpoint['search_id']
+                page_index = checkpoint['page_index']
+                logger.info('Resuming sync of %s for workspace %s after page %s', dimension, self.workspace_id, page_index)
+            else:
+                logger.info('Search of %s for workspace %s has expired, syncing again from page 1', dimension, self.workspace_id)
+
+        search_results = self.get_search_results_generator(api, search, search_id, page_index)
+        try:
+            result = next(search_results, None)
+        except NetSuiteRequestError as exception:
+            if not search_id:
+                raise
+            logger.info('Search of %s for workspace %s can not be resumed, syncing again from page 1 - %s', dimension, self.workspace_id, exception)
+            page_index = 0
+            search_results = self.get_search_results_generator(api, search)
+            result = next(search_results, None)
+
+        while result is not None:
+            yield result.records or []
+
+            page_index = result.pageIndex
+            NetSuiteDimensionSyncState.save_checkpoint(self.workspace_id, dimension, {
+                'search': search,
+                'search_id': result.searchId,
+                'page_index': page_index,
+                'started_at': sync_context.synced_at.isoformat(),
+                'saved_at': timezone.now().isoformat()
+            })
+            result = next(search_results, None)
+
+        if checkpoint or page_index:
+            NetSuiteDimensionSyncState.save_checkpoint(self.workspace_id, dimension)
+
+    def update_dimension_sync_state(self, dimension: str, sync_context: SyncContext):
+        """
+        Move the watermark and refresh the attribute count of the dimension after a completed sync
+        :param dimension: NetSuite dimension
+        :param sync_context: Sync context
+        """
+        if sync_context.is_incremental_sync_enabled:
+            NetSuiteDimensionSyncState.update_sync_state(
+                self.workspace_id, dimension, sync_context.synced_at, sync_context.is_full_sync
+            )
+
+        # A full sync fetched every record, so its active records are the current count
+        if sync_context.is_full_sync:
+            self.update_attribute_count(dimension, sync_context.active_record_count)
+
+    def upsert_destination_attributes(self, attributes: List[Dict], attribute_type: str, sync_context: SyncContext,
+                                      display_name: str = None, **kwargs) -> List[Dict]:
+        """
+        Upsert a page of destination attributes, skipping the ones unchanged since they were last saved
+        :param attributes: Attributes of the page
+        :param attribute_type: Attribute type
+        :param sync_context: Sync context
+        :param display_name: Display name the upsert is filtered by
+        :param kwargs: Keyword arguments of the destination attribute upsert
+        :return: upserted attributes
+        """
+        changed_attributes = sync_context.get_changed_attributes(attributes, attribute_type, display_name)
+
+        if changed_attributes:
+            DestinationAttribute.bulk_create_or_update_destination_attributes(
+                changed_attributes, attribute_type, self.workspace_id, True, display_name, **kwargs
+            )
+
+        return changed_attributes
+
+    def sync_destination_attributes(self, records_generator: Iterable[List[Dict]], get_attributes: Callable,
+                                    attribute_type: str, sync_context: SyncContext, display_name: str = None, **kwargs) -> int:
+        """
+        Upsert every fetched page of records as soon as it is fetched, so that each record
+        is written at most once per sync and only one page is held in memory
+        :param records_generator: Generator of pages of NetSuite records
+        :param get_attributes: Builds the destination attributes of a page of records
+        :param attribute_type: Attribute type
+        :param sync_context: Sync context
+        :param display_name: Display name the upsert is filtered by
+        :param kwargs: Keyword arguments of the destination attribute upsert
+        :return: number of upserted attributes
+        """
+        upserted_count = 0
+
+        for records in records_generator:
+            sync_context.add_fetched_records(records)
+            upserted_count += len(self.upsert_destination_attributes(
+                get_attributes(records), attribute_type, sync_context, display_name, **kwargs
+            ))
+
+        return upserted_count
+
+    def is_import_enabled(self, attribute_type: str, sync_context: SyncContext = None) -> bool:
         """
         Check if import is enabled for the attribute type
         :param attribute_type: Type of the attribute
+        :param sync_context: Sync context
         :return: Whether import is enabled
         """
         is_import_to_fyle_enabled = False
 
-        configuration = Configuration.objects.filter(workspace_id=self.workspace_id).first()
+        if sync_context:
+            configuration = sync_context.configuration
+        else:
+            configuration = Configuration.objects.filter(workspace_id=self.workspace_id).first()
         if not configuration:
             return is_import_to_fyle_enabled
 
@@ -155,25 +573,32 @@ class NetSuiteConnector:
             is_import_to_fyle_enabled = True
 
         elif attribute_type in ['PROJECT', 'DEPARTMENT', 'LOCATION', 'CLASS', 'CUSTOMER']:
-            mapping_setting = MappingSetting.objects.filter(workspace_id=self.workspace_id, destination_field=attribute_type).first()
+            if sync_context:
+                mapping_setting = sync_context.get_mapping_setting(attribute_type)
+            else:
+                mapping_setting = MappingSetting.objects.filter(workspace_id=self.workspace_id, destination_field=attribute_type).first()
             if mapping_setting and mapping_setting.import_to_fyle:
                 is_import_to_fyle_enabled = True
 
         return is_import_to_fyle_enabled
 
-    def get_attribute_disable_callback_path(self, attribute_type: str) -> Optional[str]:
+    def get_attribute_disable_callback_path(self, attribute_type: str, sync_context: SyncContext = None) -> Optional[str]:
         """
         Get the attribute disable callback path
         :param attribute_type: Type of the attribute
+        :param sync_context: Sync context
         :return: attribute disable callback path or none
         """
         if attribute_type in ['ACCOUNT', 'EXPENSE_CATEGORY', 'ITEM', 'VENDOR']:
             return AttributeDisableCallbackPath.get(attribute_type)
 
-        mapping_setting = MappingSetting.objects.filter(
-            workspace_id=self.workspace_id,
-            destination_field=attribute_type
-        ).first()
+        if sync_context:
+            mapping_setting = sync_context.get_mapping_setting(attribute_type)
+        else:
+            mapping_setting = MappingSetting.objects.filter(
+                workspace_id=self.workspace_id,
+                destination_field=attribute_type
+            ).first()
 
         if mapping_setting and not mapping_setting.is_custom:
             return AttributeDisableCallbackPath.get(mapping_setting.source_field)
@@ -197,20 +622,18 @@ class NetSuiteConnector:
         """
         Sync accounts
         """
-        attribute_count = self.connection.accounts.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='accounts',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('accounts', self.connection.accounts)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of accounts for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
-        accounts_generator = self.connection.accounts.get_all_generator()
+        sync_context = SyncContext(self.workspace_id)
+        accounts_generator = self.get_records_generator('accounts', self.connection.accounts, sync_context)
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='ACCOUNT', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='ACCOUNT', sync_context=sync_context)
         for accounts in accounts_generator:
+            sync_context.add_fetched_records(accounts)
             attributes = {
                 'bank_account': [],
                 'credit_card_account': [],
@@ -219,8 +642,7 @@ class NetSuiteConnector:
                 'ccc_account': [],
                 'vendor_payment_account': []
             }
-            destination_ids = DestinationAttribute.objects.filter(workspace_id=self.workspace_id,
-                attribute_type='ACCOUNT', display_name='Account').values_list('destination_id', flat=True)
+            destination_ids = sync_context.get_destination_ids('ACCOUNT', 'Account')
 
             for account in list(accounts):
                 if account['acctType'] != '_expense':
@@ -282,14 +704,17 @@ class NetSuiteConnector:
                     })
 
             for attribute_type, attribute in attributes.items():
-                if attribute:
-                    DestinationAttribute.bulk_create_or_update_destination_attributes(
-                        attribute, attribute_type.upper(), self.workspace_id, True, attribute_type.title().replace('_',' '),
-                        skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='ACCOUNT'),
-                        app_name=get_app_name(),
-                        attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='ACCOUNT'),
-                        is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='ACCOUNT')
-                    )
+                self.upsert_destination_attributes(
+                    attribute, attribute_type.upper(), sync_context, attribute_type.title().replace('_',' '),
+                    skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='ACCOUNT'),
+                    app_name=get_app_name(),
+                    attribute_disable_callback_path=attribute_disable_callback_path,
+                    is_import_to_fyle_enabled=is_import_to_fyle_enabled
+                )
+
+            sync_context.add_destination_ids('ACCOUNT', 'Account', attributes['account'])
+
+        self.update_dimension_sync_state('accounts', sync_context)
 
         return []
 
@@ -297,29 +722,25 @@ class NetSuiteConnector:
         """
         Sync Expense Categories
         """
-        attribute_count = self.connection.expense_categories.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='expense_categories',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('expense_categories', self.connection.expense_categories)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of expense categories for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
         
-        categories_generator = self.connection.expense_categories.get_all_generator()
-        is_expense_category_import_enabled = self.is_import_enabled(attribute_type='EXPENSE_CATEGORY')
+        sync_context = SyncContext(self.workspace_id)
+        categories_generator = self.get_records_generator('expense_categories', self.connection.expense_categories, sync_context)
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='EXPENSE_CATEGORY', sync_context=sync_context)
+        is_expense_category_import_enabled = self.is_import_enabled(attribute_type='EXPENSE_CATEGORY', sync_context=sync_context)
 
         for categories in categories_generator:
+            sync_context.add_fetched_records(categories)
             attributes = {
                 'expense_category': [],
                 'ccc_expense_category': []
             }
-            destination_ids = DestinationAttribute.objects.filter(workspace_id=self.workspace_id,
-                    attribute_type='EXPENSE_CATEGORY', display_name='Expense Category').values_list('destination_id', flat=True)
+            destination_ids = sync_context.get_destination_ids('EXPENSE_CATEGORY', 'Expense Category')
 
             for category in categories:
                 detail = {
@@ -351,14 +772,16 @@ class NetSuiteConnector:
                     )
 
             for attribute_type, attribute in attributes.items():
-                DestinationAttribute.bulk_create_or_update_destination_attributes(
-                    attribute, attribute_type.upper(), self.workspace_id, True,
+                self.upsert_destination_attributes(
+                    attribute, attribute_type.upper(), sync_context,
                     skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='EXPENSE_CATEGORY'),
                     app_name=get_app_name(),
-                    attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='EXPENSE_CATEGORY'),
+                    attribute_disable_callback_path=attribute_disable_callback_path,
                     is_import_to_fyle_enabled=is_expense_category_import_enabled
                 )
 
+            sync_context.add_destination_ids('EXPENSE_CATEGORY', 'Expense Category', attributes['expense_category'])
+
         if not is_expense_category_import_enabled:
             payload = {
                 'workspace_id': self.workspace_id,
@@ -369,38 +792,40 @@ class NetSuiteConnector:
             }
             publish_to_rabbitmq(payload=payload, routing_key=RoutingKeyEnum.IMPORT.value)
 
+        self.update_dimension_sync_state('expense_categories', sync_context)
+
         return []
 
     def sync_items(self):
         """
         Sync Items
         """
-        attribute_count = self.connection.items.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='items',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('items', self.connection.items)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of items for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
 
-        item_generator = self.connection.items.get_all_generator()
-        for items in item_generator:
-            attributes = []
+        sync_context = SyncContext(self.workspace_id)
+        item_generator = self.get_records_generator('items', self.connection.items, sync_context)
+        configuration = sync_context.configuration
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='ITEM', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='ITEM', sync_context=sync_context)
 
-            destination_attributes = DestinationAttribute.objects.filter(workspace_id=self.workspace_id,
-                attribute_type='ACCOUNT', display_name='Item').values('destination_id', 'value')
-            configuration = Configuration.objects.filter(workspace_id=self.workspace_id).first()
+        def get_attributes(items: List[Dict]) -> List[Dict]:
+            attributes = []
 
             disabled_fields_map = {}
-            for destination_attribute in destination_attributes:
-                disabled_fields_map[destination_attribute['destination_id']] = {
-                    'value': destination_attribute['value']
-                }
+            # Incremental syncs fetch inactive items too, so only full syncs disable the items not fetched
+            if sync_context.is_full_sync:
+                destination_attributes = DestinationAttribute.objects.filter(workspace_id=self.workspace_id,
+                    attribute_type='ACCOUNT', display_name='Item').values('destination_id', 'value')
+
+                for destination_attribute in destination_attributes:
+                    disabled_fields_map[destination_attribute['destination_id']] = {
+                        'value': destination_attribute['value']
+                    }
 
             for item in items:
                 if not item['isInactive']:
@@ -414,6 +839,14 @@ class NetSuiteConnector:
                     # the category is active so remove it from the map
                     if item['internalId'] in disabled_fields_map:
                         disabled_fields_map.pop(item['internalId'])
+                elif not sync_context.is_full_sync:
+                    attributes.append({
+                        'attribute_type': 'ACCOUNT',
+                        'display_name': 'Item',
+                        'value': item['itemId'],
+                        'destination_id': item['internalId'],
+                        'active': False
+                    })
 
             for destination_id in disabled_fields_map:
                     attributes.append({
@@ -424,13 +857,17 @@ class NetSuiteConnector:
                         'active': False
                     })
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                attributes, 'ACCOUNT', self.workspace_id, True, 'Item',
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='ITEM'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='ITEM'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='ITEM')
-            )
+            return attributes
+
+        self.sync_destination_attributes(
+            item_generator, get_attributes, 'ACCOUNT', sync_context, 'Item',
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='ITEM'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
+
+        self.update_dimension_sync_state('items', sync_context)
 
         return []
 
@@ -557,14 +994,17 @@ class NetSuiteConnector:
         
         custom_segment_attributes = list(value_to_attribute_map.values())
 
+        existing_attributes = {}
+        for existing in DestinationAttribute.objects.filter(
+            attribute_type=attribute_type,
+            workspace_id=self.workspace_id
+        ).order_by('id').values('id', 'value', 'destination_id').iterator():
+            existing_attributes.setdefault(existing['value'], existing)
+
         for custom_segment_attribute in custom_segment_attributes:
-            existing = DestinationAttribute.objects.filter(
-                attribute_type=custom_segment_attribute['attribute_type'],
-                value=custom_segment_attribute['value'],
-                workspace_id=self.workspace_id
-            ).first()
-            if existing and existing.destination_id != custom_segment_attribute['destination_id']:
-                changed_destination_attributes.append((existing.id, existing.destination_id, custom_segment_attribute['destination_id']))
+            existing = existing_attributes.get(custom_segment_attribute['value'])
+            if existing and existing['destination_id'] != custom_segment_attribute['destination_id']:
+                changed_destination_attributes.append((existing['id'], existing['destination_id'], custom_segment_attribute['destination_id']))
 
         if not changed_destination_attributes:
             return
@@ -634,29 +1074,100 @@ class NetSuiteConnector:
 
         return list(custom_segment_attributes.values())
 
-    def sync_custom_segments(self):
+    @staticmethod
+    def get_custom_segment_attribute_type(custom_segment: CustomSegment) -> str:
         """
-        Sync Custom Segments
+        Get the destination attribute type of a custom segment
+        :param custom_segment: Custom segment
+        :return: attribute type
         """
-        custom_segments: List[CustomSegment] = CustomSegment.objects.filter(workspace_id=self.workspace_id).all()
+        attribute_type = custom_segment.name.upper().replace(' ', '_')
+        if attribute_type in ('LOCATION', 'DEPARTMENT', 'CLASS'):
+            attribute_type = '{}-CS'.format(attribute_type)
 
-        for custom_segment in custom_segments:
-            attribute_type = custom_segment.name.upper().replace(' ', '_')
-            if attribute_type in ('LOCATION', 'DEPARTMENT', 'CLASS'):
-                attribute_type = '{}-CS'.format(attribute_type)
+        return attribute_type
 
-            if custom_segment.segment_type == 'CUSTOM_LIST':
-                custom_segment_attributes = self.get_custom_list_attributes(attribute_type, custom_segment.internal_id)
+    def sync_custom_segment(self, custom_segment: CustomSegment) -> int:
+        """
+        Sync attributes of a custom segment
+        :param custom_segment: Custom segment
+        :return: number of attributes synced
+        """
+        attribute_type = self.get_custom_segment_attribute_type(custom_segment)
 
-            if custom_segment.segment_type == 'CUSTOM_SEGMENT':
-                custom_segment_attributes = self.get_custom_segment_attributes(attribute_type, custom_segment.internal_id)
+        if custom_segment.segment_type == 'CUSTOM_LIST':
+            custom_segment_attributes = self.get_custom_list_attributes(attribute_type, custom_segment.internal_id)
 
-            elif custom_segment.segment_type == 'CUSTOM_RECORD':
-                custom_segment_attributes = self.get_custom_record_attributes(
-                    attribute_type, custom_segment.internal_id)
+        elif custom_segment.segment_type == 'CUSTOM_SEGMENT':
+            custom_segment_attributes = self.get_custom_segment_attributes(attribute_type, custom_segment.internal_id)
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                custom_segment_attributes, attribute_type, self.workspace_id, True)
+        elif custom_segment.segment_type == 'CUSTOM_RECORD':
+            custom_segment_attributes = self.get_custom_record_attributes(
+                attribute_type, custom_segment.internal_id)
+
+        DestinationAttribute.bulk_create_or_update_destination_attributes(
+            custom_segment_attributes, attribute_type, self.workspace_id, True)
+
+        return len(custom_segment_attributes)
+
+    def __sync_custom_segment_in_worker(self, custom_segment: CustomSegment) -> int:
+        """
+        Sync a custom segment with a connector of the worker thread
+        """
+        try:
+            with account_slot(self.__netsuite_credentials.ns_account_id):
+                netsuite_connection = NetSuiteConnector(self.__netsuite_credentials, self.workspace_id)
+                return netsuite_connection.sync_custom_segment(custom_segment)
+        finally:
+            connections.close_all()
+
+    def sync_custom_segments(self):
+        """
+        Sync Custom Segments, concurrently when parallel dimension sync is enabled. Each worker holds
+        a slot of the account, so segments are synced one after the other when called from a
+        parallel dimension sync that already holds one, and under a single slot otherwise.
+        A failing segment doesn't stop the others, its error is raised once all are synced
+        """
+        custom_segments: List[CustomSegment] = list(CustomSegment.objects.filter(workspace_id=self.workspace_id).all())
+        ns_account_id = self.__netsuite_credentials.ns_account_id
+
+        is_parallel = len(custom_segments) > 1 and not holds_account_slot(ns_account_id) \
+            and FeatureConfig.get_feature_config(workspace_id=self.workspace_id, key='parallel_dimension_sync')
+        sync_custom_segment = self.__sync_custom_segment_in_worker if is_parallel else self.sync_custom_segment
+
+        def sync(custom_segment: CustomSegment) -> Tuple[int, float, Exception]:
+            started_at = time.monotonic()
+            try:
+                return sync_custom_segment(custom_segment), time.monotonic() - started_at, None
+            except Exception as exception:
+                logger.info('Error while syncing custom segment %s for workspace %s - %s',
+                            custom_segment.name, self.workspace_id, exception)
+                return None, time.monotonic() - started_at, exception
+
+        if is_parallel:
+            max_workers = min(settings.NETSUITE_DIMENSION_SYNC_MAX_WORKERS, len(custom_segments))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(sync, custom_segments))
+        elif holds_account_slot(ns_account_id):
+            results = [sync(custom_segment) for custom_segment in custom_segments]
+        else:
+            with account_slot(ns_account_id):
+                results = [sync(custom_segment) for custom_segment in custom_segments]
+
+        exceptions = []
+        for custom_segment, (synced_count, sync_duration, exception) in zip(custom_segments, results):
+            NetSuiteDimensionSyncState.update_sync_stats(
+                workspace_id=self.workspace_id,
+                dimension='custom_segment_{}'.format(self.get_custom_segment_attribute_type(custom_segment).lower()),
+                synced_count=synced_count,
+                sync_duration=sync_duration,
+                sync_error=str(exception) if exception else None
+            )
+            if exception:
+                exceptions.append(exception)
+
+        if exceptions:
+            raise exceptions[0]
 
         return []
 
@@ -664,23 +1175,21 @@ class NetSuiteConnector:
         """
         Sync Currencies
         """
-        currencies_generator = self.connection.currencies.get_all_generator()
+        # Currencies are fetched with a single getAll call, so they form a single page
+        currencies_generator = [list(self.connection.currencies.get_all_generator())]
 
-        currency_attributes = []
-
-        for currency in currencies_generator:
-            currency_attributes.append(
-                {
-                    'attribute_type': 'CURRENCY',
-                    'display_name': 'Currency',
-                    'value': currency['symbol'],
-                    'destination_id': currency['internalId'],
-                    'active': True
-                }
-            )
+        def get_attributes(currencies: List[Dict]) -> List[Dict]:
+            return [{
+                'attribute_type': 'CURRENCY',
+                'display_name': 'Currency',
+                'value': currency['symbol'],
+                'destination_id': currency['internalId'],
+                'active': True
+            } for currency in currencies]
 
-        DestinationAttribute.bulk_create_or_update_destination_attributes(
-            currency_attributes, 'CURRENCY', self.workspace_id, True)
+        self.sync_destination_attributes(
+            currencies_generator, get_attributes, 'CURRENCY', SyncContext(self.workspace_id)
+        )
 
         return []
 
@@ -688,13 +1197,7 @@ class NetSuiteConnector:
         """
         Sync locations
         """
-        attribute_count = self.connection.locations.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='locations',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('locations', self.connection.locations)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of locations for workspace %s as it has %s counts which is over the limit of %s', 
@@ -703,17 +1206,14 @@ class NetSuiteConnector:
 
         subsidiary_mapping = SubsidiaryMapping.objects.get(workspace_id=self.workspace_id)
 
-        location_generator = self.connection.locations.get_all_generator()
-
-        location_attributes = []
-
-        destination_ids = DestinationAttribute.objects.filter(
-            workspace_id=self.workspace_id,
-            attribute_type='LOCATION',
-            display_name='Location'
-        ).values_list('destination_id', flat=True)
+        sync_context = SyncContext(self.workspace_id)
+        location_generator = self.get_records_generator('locations', self.connection.locations, sync_context)
+        destination_ids = sync_context.get_destination_ids('LOCATION', 'Location')
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='LOCATION', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='LOCATION', sync_context=sync_context)
 
-        for locations in location_generator:
+        def get_attributes(locations: List[Dict]) -> List[Dict]:
+            location_attributes = []
             for location in locations:
                 if location['isInactive'] and location['internalId'] not in destination_ids:
                     continue
@@ -739,13 +1239,17 @@ class NetSuiteConnector:
                         'active': not location['isInactive']
                     })
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                location_attributes, 'LOCATION', self.workspace_id, True,
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='LOCATION'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='LOCATION'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='LOCATION')
-            )
+            return location_attributes
+
+        self.sync_destination_attributes(
+            location_generator, get_attributes, 'LOCATION', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='LOCATION'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
+
+        self.update_dimension_sync_state('locations', sync_context)
 
         return []
 
@@ -753,31 +1257,22 @@ class NetSuiteConnector:
         """
         Sync classification
         """
-        configuration = Configuration.objects.filter(workspace_id=self.workspace_id).first()
-        attribute_count = self.connection.classifications.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='classifications',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('classifications', self.connection.classifications)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of classes for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
 
-        classification_generator = self.connection.classifications.get_all_generator()
-
-        classification_attributes = []
+        sync_context = SyncContext(self.workspace_id)
+        classification_generator = self.get_records_generator('classifications', self.connection.classifications, sync_context)
+        configuration = sync_context.configuration
+        destination_ids = sync_context.get_destination_ids('CLASS', 'Class')
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='CLASS', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='CLASS', sync_context=sync_context)
 
-        destination_ids = DestinationAttribute.objects.filter(
-            workspace_id=self.workspace_id,
-            attribute_type='CLASS',
-            display_name='Class'
-        ).values_list('destination_id', flat=True)
-
-        for classifications in classification_generator:
+        def get_attributes(classifications: List[Dict]) -> List[Dict]:
+            classification_attributes = []
             for classification in classifications:
                 if classification['isInactive'] and classification['internalId'] not in destination_ids:
                     continue
@@ -794,13 +1289,17 @@ class NetSuiteConnector:
                     'active': not classification['isInactive']
                 })
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                classification_attributes, 'CLASS', self.workspace_id, True,
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='CLASS'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='CLASS'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='CLASS')
-            )
+            return classification_attributes
+
+        self.sync_destination_attributes(
+            classification_generator, get_attributes, 'CLASS', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='CLASS'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
+
+        self.update_dimension_sync_state('classifications', sync_context)
 
         return []
 
@@ -808,48 +1307,38 @@ class NetSuiteConnector:
         """
         Sync departments
         """
-        attribute_count = self.connection.departments.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='departments',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('departments', self.connection.departments)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of departments for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
-        department_generator = self.connection.departments.get_all_generator()
-
-        department_attributes = []
 
-        destination_ids = DestinationAttribute.objects.filter(
-            workspace_id=self.workspace_id,
-            attribute_type='DEPARTMENT',
-            display_name='Department'
-        ).values_list('destination_id', flat=True)
-
-        for departments in department_generator:
-            for department in departments:
-                if department['isInactive'] and department['internalId'] not in destination_ids:
-                    continue
-
-                department_attributes.append({
-                    'attribute_type': 'DEPARTMENT',
-                    'display_name': 'Department',
-                    'value': department['name'],
-                    'destination_id': department['internalId'],
-                    'active': not department['isInactive']
-                })
+        sync_context = SyncContext(self.workspace_id)
+        department_generator = self.get_records_generator('departments', self.connection.departments, sync_context)
+        destination_ids = sync_context.get_destination_ids('DEPARTMENT', 'Department')
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='DEPARTMENT', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='DEPARTMENT', sync_context=sync_context)
+
+        def get_attributes(departments: List[Dict]) -> List[Dict]:
+            return [{
+                'attribute_type': 'DEPARTMENT',
+                'display_name': 'Department',
+                'value': department['name'],
+                'destination_id': department['internalId'],
+                'active': not department['isInactive']
+            } for department in departments
+                if not department['isInactive'] or department['internalId'] in destination_ids]
+
+        self.sync_destination_attributes(
+            department_generator, get_attributes, 'DEPARTMENT', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='DEPARTMENT'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                department_attributes, 'DEPARTMENT', self.workspace_id, True,
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='DEPARTMENT'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='DEPARTMENT'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='DEPARTMENT')
-            )
+        self.update_dimension_sync_state('departments', sync_context)
 
         return []
 
@@ -857,13 +1346,7 @@ class NetSuiteConnector:
         """
         Sync vendors
         """
-        attribute_count = self.connection.vendors.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='vendors',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('vendors', self.connection.vendors)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of vendors for workspace %s as it has %s counts which is over the limit of %s', 
@@ -871,7 +1354,8 @@ class NetSuiteConnector:
             return
 
         subsidiary_mapping = SubsidiaryMapping.objects.get(workspace_id=self.workspace_id)
-        configuration = Configuration.objects.filter(workspace_id=self.workspace_id).first()
+        sync_context = SyncContext(self.workspace_id)
+        configuration = sync_context.configuration
         if not configuration:
             configuration = Configuration(
                 workspace_id=self.workspace_id,
@@ -880,9 +1364,13 @@ class NetSuiteConnector:
 
         params = self.get_generator_params(attribute_type='VENDOR', display_name='Vendor')
 
-        vendors_generator = self.connection.vendors.get_records_generator(**params)
+        vendors_generator = self.get_checkpointed_records_generator(
+            'vendors', self.connection.vendors, sync_context, **params
+        )
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='VENDOR', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='VENDOR', sync_context=sync_context)
 
-        for vendors in vendors_generator:
+        def get_attributes(vendors: List[Dict]) -> List[Dict]:
             attributes = []
             for vendor in vendors:
                 detail = {
@@ -908,13 +1396,15 @@ class NetSuiteConnector:
                         'active': not vendor['isInactive']
                     })
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                attributes, 'VENDOR', self.workspace_id, True,
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='VENDOR'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='VENDOR'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='VENDOR')
-            )
+            return attributes
+
+        self.sync_destination_attributes(
+            vendors_generator, get_attributes, 'VENDOR', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='VENDOR'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
 
         return []
 
@@ -1038,24 +1528,75 @@ class NetSuiteConnector:
                     logger.info('Failed to create vendor after %s attempts', retry_count)
                     raise
 
+    def get_employee_emails(self, internal_ids: List[str]) -> Dict[str, str]:
+        """
+        Get emails of NetSuite employees in a single getList request
+        :param internal_ids: Employee internal ids
+        :return: emails by employee internal id
+        """
+        record_refs = [
+            self.connection.client.RecordRef(type='employee', internalId=internal_id) for internal_id in internal_ids
+        ]
+        response = self.connection.client.request('getList', baseRef=record_refs)
+        read_responses = response.body.readResponseList.readResponse
+
+        employee_emails = {}
+        for read_response in read_responses:
+            if read_response.status.isSuccess:
+                employee_emails[read_response.record.internalId] = read_response.record.email
+            else:
+                logger.info('Unable to get supervisor for workspace %s - %s', self.workspace_id, read_response.status.statusDetail)
+
+        return employee_emails
+
+    def get_supervisor_emails(self, employees: List[Dict], fetched_employee_emails: Dict[str, str]) -> Dict[str, str]:
+        """
+        Get emails of the supervisors of the employees
+        Supervisors are looked up in the employees fetched so far in the sync, then in the synced
+        employee attributes, and only the remaining ones are fetched from NetSuite
+        :param employees: Employees page
+        :param fetched_employee_emails: emails of employees fetched in the sync, by internal id
+        :return: emails by supervisor internal id
+        """
+        supervisor_ids = {employee['supervisor']['internalId'] for employee in employees if employee['supervisor']}
+
+        supervisor_emails = {
+            supervisor_id: fetched_employee_emails[supervisor_id]
+            for supervisor_id in supervisor_ids if supervisor_id in fetched_employee_emails
+        }
+
+        remaining_supervisor_ids = supervisor_ids - supervisor_emails.keys()
+        if remaining_supervisor_ids:
+            employee_attributes = DestinationAttribute.objects.filter(
+                workspace_id=self.workspace_id,
+                attribute_type='EMPLOYEE',
+                destination_id__in=remaining_supervisor_ids
+            ).values_list('destination_id', 'detail')
+
+            for destination_id, detail in employee_attributes:
+                supervisor_emails[destination_id] = detail.get('email') if detail else None
+
+        remaining_supervisor_ids = supervisor_ids - supervisor_emails.keys()
+        if remaining_supervisor_ids:
+            supervisor_emails.update(self.get_employee_emails(list(remaining_supervisor_ids)))
+
+        return supervisor_emails
+
     def sync_employees(self):
         """
         Sync employees
         """
-        attribute_count = self.connection.employees.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='employees',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('employees', self.connection.employees)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of employees for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
         
-        configuration = Configuration.objects.filter(workspace_id=self.workspace_id).first()
+        sync_context = SyncContext(self.workspace_id)
+        configuration = sync_context.configuration
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='EMPLOYEE', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='EMPLOYEE', sync_context=sync_context)
 
         subsidiary_mapping = SubsidiaryMapping.objects.get(workspace_id=self.workspace_id)
 
@@ -1073,13 +1614,21 @@ class NetSuiteConnector:
             last_modified_date_query['search_value'] = search_value
             last_modified_date_query['operator'] ='onOrAfter'
 
-        employees_generator = self.connection.employees.get_all_generator(
-            last_modified_date_query=last_modified_date_query,
-            page_size=200
+        employees_generator = self.get_checkpointed_records_generator(
+            'employees', self.connection.employees, sync_context,
+            last_modified_date=last_modified_date_query.get('search_value'), active=True, operator='onOrAfter'
         )
 
-        for employees in employees_generator:
+        import_supervisors = configuration and configuration.import_netsuite_employees
+        fetched_employee_emails = {}
+
+        def get_attributes(employees: List[Dict]) -> List[Dict]:
             attributes = []
+            supervisor_emails = {}
+            if import_supervisors:
+                fetched_employee_emails.update({employee['internalId']: employee['email'] for employee in employees})
+                supervisor_emails = self.get_supervisor_emails(employees, fetched_employee_emails)
+
             for employee in employees:
                 allow_access_to_fyle = False
                 for field in employee['customFieldList']['customField']:    # Check if Allow access to fyle is enabled
@@ -1087,10 +1636,9 @@ class NetSuiteConnector:
                         allow_access_to_fyle = True
 
                 supervisor = []
-                if configuration and configuration.import_netsuite_employees:
-                    if employee['supervisor']:
-                        supervisor.append(self.connection.employees.get(
-                            employee['supervisor']['internalId'], employee['supervisor']['externalId'])['email'])
+                if import_supervisors:
+                    if employee['supervisor'] and employee['supervisor']['internalId'] in supervisor_emails:
+                        supervisor.append(supervisor_emails[employee['supervisor']['internalId']])
 
                 parent_department = None
                 if employee['department']:
@@ -1138,13 +1686,15 @@ class NetSuiteConnector:
                         'active': active_status
                     })
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                attributes, 'EMPLOYEE', self.workspace_id, True,
-                    skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='EMPLOYEE'),
-                    app_name=get_app_name(),
-                    attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='EMPLOYEE'),
-                    is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='EMPLOYEE')
-                )
+            return attributes
+
+        self.sync_destination_attributes(
+            employees_generator, get_attributes, 'EMPLOYEE', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='EMPLOYEE'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
 
         return []
 
@@ -1265,23 +1815,22 @@ class NetSuiteConnector:
         Sync subsidiaries
         """
         subsidiary_generator = self.connection.subsidiaries.get_all_generator()
-        subsidiary_attributes = []
-
-        for subsidiaries in subsidiary_generator:
-            for subsidiary in subsidiaries:
-                subsidiary_attributes.append({
-                    'attribute_type': 'SUBSIDIARY',
-                    'display_name': 'Subsidiary',
-                    'value': subsidiary['name'],
-                    'destination_id': subsidiary['internalId'],
-                    'detail': {
-                        'country': subsidiary['country']
-                    },
-                    'active': True
-                })
 
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                subsidiary_attributes, 'SUBSIDIARY', self.workspace_id, True)
+        def get_attributes(subsidiaries: List[Dict]) -> List[Dict]:
+            return [{
+                'attribute_type': 'SUBSIDIARY',
+                'display_name': 'Subsidiary',
+                'value': subsidiary['name'],
+                'destination_id': subsidiary['internalId'],
+                'detail': {
+                    'country': subsidiary['country']
+                },
+                'active': True
+            } for subsidiary in subsidiaries]
+
+        self.sync_destination_attributes(
+            subsidiary_generator, get_attributes, 'SUBSIDIARY', SyncContext(self.workspace_id)
+        )
 
         return []
     
@@ -1304,13 +1853,7 @@ class NetSuiteConnector:
         """
         Sync Tax Details
         """
-        attribute_count = self.connection.tax_items.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='tax_items',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('tax_items', self.connection.tax_items)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of tax items for workspace %s as it has %s counts which is over the limit of %s', 
@@ -1319,10 +1862,11 @@ class NetSuiteConnector:
         
         general_mapping = GeneralMapping.objects.filter(workspace_id=self.workspace_id).first()
 
+        sync_context = SyncContext(self.workspace_id)
         tax_items_generator = self.connection.tax_items.get_all_generator()
 
         if general_mapping and general_mapping.override_tax_details:
-            for tax_items in tax_items_generator:
+            def get_tax_item_attributes(tax_items: List[Dict]) -> List[Dict]:
                 tax_item_attributes = []
                 for tax_item in tax_items:
                     tax_rate = -1
@@ -1336,10 +1880,11 @@ class NetSuiteConnector:
                         if destination_attribute:
                             tax_item_attributes.append(destination_attribute)
 
-                DestinationAttribute.bulk_create_or_update_destination_attributes(
-                        tax_item_attributes, 'TAX_ITEM', self.workspace_id, True) 
+                return tax_item_attributes
+
+            self.sync_destination_attributes(tax_items_generator, get_tax_item_attributes, 'TAX_ITEM', sync_context)
         else:
-            for tax_items in tax_items_generator:
+            def get_tax_item_attributes(tax_items: List[Dict]) -> List[Dict]:
                 tax_item_attributes = []
                 for tax_item in tax_items:
                     if not tax_item['isInactive'] and tax_item['itemId'] and tax_item['taxType'] and tax_item['rate']:
@@ -1350,11 +1895,11 @@ class NetSuiteConnector:
                         if destination_attribute:
                             tax_item_attributes.append(destination_attribute)
 
-                DestinationAttribute.bulk_create_or_update_destination_attributes(
-                        tax_item_attributes, 'TAX_ITEM', self.workspace_id, True)    
+                return tax_item_attributes
 
-            tax_groups_generator = self.connection.tax_groups.get_all_generator()
-            for tax_groups in tax_groups_generator:
+            self.sync_destination_attributes(tax_items_generator, get_tax_item_attributes, 'TAX_ITEM', sync_context)
+
+            def get_tax_group_attributes(tax_groups: List[Dict]) -> List[Dict]:
                 tax_group_attributes = []
                 for tax_group in tax_groups:
                     if not tax_group['isInactive'] and tax_group['itemId']:
@@ -1378,8 +1923,10 @@ class NetSuiteConnector:
                                 }
                             })
 
-                DestinationAttribute.bulk_create_or_update_destination_attributes(
-                        tax_group_attributes, 'TAX_ITEM', self.workspace_id, True)
+                return tax_group_attributes
+
+            tax_groups_generator = self.connection.tax_groups.get_all_generator()
+            self.sync_destination_attributes(tax_groups_generator, get_tax_group_attributes, 'TAX_ITEM', sync_context)
 
         return []
 
@@ -1387,27 +1934,21 @@ class NetSuiteConnector:
         """
         Sync projects
         """
-        attribute_count = self.connection.projects.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='projects',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('projects', self.connection.projects)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of projects for workspace %s as it has %s counts which is over the limit of %s', 
                         self.workspace_id, attribute_count, SYNC_UPPER_LIMIT)
             return
         
-        projects_generator = self.connection.projects.get_all_generator()
-        for projects in projects_generator:
+        sync_context = SyncContext(self.workspace_id)
+        projects_generator = self.get_records_generator('projects', self.connection.projects, sync_context)
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='PROJECT', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='PROJECT', sync_context=sync_context)
+
+        def get_attributes(projects: List[Dict]) -> List[Dict]:
             attributes = []
-            destination_ids = DestinationAttribute.objects.filter(
-                workspace_id=self.workspace_id,
-                attribute_type= 'PROJECT',
-                display_name='Project'
-            ).values_list('destination_id', flat=True)
+            destination_ids = sync_context.get_destination_ids('PROJECT', 'Project')
 
             for project in projects:
                 value = self.__decode_project_or_customer_name(project['entityId'])
@@ -1428,13 +1969,20 @@ class NetSuiteConnector:
                         'destination_id': project['internalId'],
                         'active': True
                     })
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                attributes, 'PROJECT', self.workspace_id, True,
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='PROJECT'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='PROJECT'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='PROJECT')
-            )
+
+            sync_context.add_destination_ids('PROJECT', 'Project', attributes)
+
+            return attributes
+
+        self.sync_destination_attributes(
+            projects_generator, get_attributes, 'PROJECT', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='PROJECT'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
+
+        self.update_dimension_sync_state('projects', sync_context)
 
         return []
 
@@ -1442,13 +1990,7 @@ class NetSuiteConnector:
         """
         Sync customers
         """
-        attribute_count = self.connection.customers.count()
-        
-        NetSuiteAttributesCount.update_attribute_count(
-            workspace_id=self.workspace_id,
-            attribute_type='customers',
-            count=attribute_count
-        )
+        attribute_count = self.get_attribute_count('customers', self.connection.customers)
         
         if not self.is_sync_allowed(attribute_count=attribute_count):
             logger.info('Skipping sync of customers for workspace %s as it has %s counts which is over the limit of %s', 
@@ -1457,27 +1999,29 @@ class NetSuiteConnector:
 
         params = self.get_generator_params(attribute_type='PROJECT', display_name='Customer')
 
-        customers_generator = self.connection.customers.get_records_generator(**params)
-
-        for customers in customers_generator:
-            attributes = []
-            for customer in customers:
-                value = self.__decode_project_or_customer_name(customer['entityId'])
-                attributes.append({
-                    'attribute_type': 'PROJECT',
-                    'display_name': 'Customer',
-                    'value': value,
-                    'destination_id': customer['internalId'],
-                    'active': not customer['isInactive']
-                })
-
-            DestinationAttribute.bulk_create_or_update_destination_attributes(
-                attributes, 'PROJECT', self.workspace_id, True,
-                skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='PROJECT'),
-                app_name=get_app_name(),
-                attribute_disable_callback_path=self.get_attribute_disable_callback_path(attribute_type='PROJECT'),
-                is_import_to_fyle_enabled=self.is_import_enabled(attribute_type='PROJECT')
-            )
+        sync_context = SyncContext(self.workspace_id)
+        customers_generator = self.get_checkpointed_records_generator(
+            'customers', self.connection.customers, sync_context, **params
+        )
+        attribute_disable_callback_path = self.get_attribute_disable_callback_path(attribute_type='PROJECT', sync_context=sync_context)
+        is_import_to_fyle_enabled = self.is_import_enabled(attribute_type='PROJECT', sync_context=sync_context)
+
+        def get_attributes(customers: List[Dict]) -> List[Dict]:
+            return [{
+                'attribute_type': 'PROJECT',
+                'display_name': 'Customer',
+                'value': self.__decode_project_or_customer_name(customer['entityId']),
+                'destination_id': customer['internalId'],
+                'active': not customer['isInactive']
+            } for customer in customers]
+
+        self.sync_destination_attributes(
+            customers_generator, get_attributes, 'PROJECT', sync_context,
+            skip_deletion=self.is_duplicate_deletion_skipped(attribute_type='PROJECT'),
+            app_name=get_app_name(),
+            attribute_disable_callback_path=attribute_disable_callback_path,
+            is_import_to_fyle_enabled=is_import_to_fyle_enabled
+        )
 
         return []
 
@@ -1953,6 +2497,76 @@ class NetSuiteConnector:
             else:
                 raise
 
+    def upsert_list(self, export_type: str, payloads: List[Dict]) -> List:
+        """
+        Post records of the same type to NetSuite in a single upsertList request
+        :param export_type: Task log type of the records
+        :param payloads: Constructed payloads
+        :return: Created record refs or NetSuiteRequestError for each payload, in order
+        """
+        collector = UpsertListRecordCollector(self.connection.client)
+        api = getattr(self.connection, BATCH_EXPORT_API_MAP[export_type])
+        batch_api = api.__class__(collector)
+
+        for payload in payloads:
+            batch_api.post(payload)
+
+        response = self.connection.client.request('upsertList', record=collector.records)
+        write_responses = response.body.writeResponseList.writeResponse
+
+        results = []
+        for write_response in write_responses:
+            if write_response.status.isSuccess:
+                results.append(zeep.helpers.serialize_object(write_response.baseRef))
+            else:
+                detail = write_response.status.statusDetail[0]
+                # Same message as a single upsert, so the errors match the same error references
+                results.append(NetSuiteRequestError(
+                    'An error occured in a upsert request: {}'.format(detail['message']), code=detail['code']
+                ))
+
+        return results
+
+    def post_exports_in_batch(self, export_type: str, exports: List, configuration: Configuration, general_mapping: GeneralMapping) -> List:
+        """
+        Post bills, expense reports or journal entries to NetSuite in a single request
+        :param export_type: Task log type of the exports
+        :param exports: List of (export object, line items) tuples
+        :param configuration: Workspace configuration
+        :param general_mapping: General mapping
+        :return: Created record refs or NetSuiteRequestError for each export, in order
+        """
+        payloads = []
+        for export_object, lineitems in exports:
+            if export_type == 'CREATING_BILL':
+                payload = self.__construct_bill(export_object, lineitems, general_mapping)
+            elif export_type == 'CREATING_EXPENSE_REPORT':
+                payload = self.__construct_expense_report(export_object, lineitems, general_mapping)
+            else:
+                payload = self.__construct_journal_entry(export_object, lineitems, configuration, general_mapping)
+
+            logger.info('| Payload for batched %s | Content: {WORKSPACE_ID: %s EXPENSE_GROUP_ID: %s PAYLOAD: %s}', export_type, self.workspace_id, export_object.expense_group.id, payload)
+            payloads.append(payload)
+
+        return self.upsert_list(export_type, payloads)
+
+    def post_export(self, export_type: str, export_object, lineitems: List, configuration: Configuration, general_mapping: GeneralMapping):
+        """
+        Post a single bill, expense report or journal entry to NetSuite
+        :param export_type: Task log type of the export
+        :param export_object: Bill, ExpenseReport or JournalEntry
+        :param lineitems: Line items of the export
+        :param configuration: Workspace configuration
+        :param general_mapping: General mapping
+        :return: Created record ref
+        """
+        if export_type == 'CREATING_BILL':
+            return self.post_bill(export_object, lineitems, general_mapping)
+        elif export_type == 'CREATING_EXPENSE_REPORT':
+            return self.post_expense_report(export_object, lineitems, general_mapping)
+
+        return self.post_journal_entry(export_object, lineitems, configuration, general_mapping)
+
     def get_bill(self, internal_id):
         """
         GET vendor bill from NetSuite
@@ -2379,6 +2993,131 @@ class NetSuiteConnector:
         expense_report = self.connection.expense_reports.get(internal_id)
         return expense_report
 
+    def post_attachment(self, external_id: str, attachment: Dict, folder: Dict) -> str:
+        """
+        Download a Fyle attachment and upload it to NetSuite, the file is held only during its upload
+        :param external_id: External id of the file, the Fyle expense id
+        :param attachment: Fyle attachment with a signed download url
+        :param folder: Reference of the folder to upload to
+        :return: url of the uploaded file
+        """
+        response = requests.get(attachment['download_url'])
+        response.raise_for_status()
+
+        self.connection.files.post({
+            'externalId': external_id,
+            'name': '{0}_{1}'.format(attachment['id'], attachment['name']),
+            'content': response.content,
+            'folder': folder
+        })
+
+        # The upsert response is a record reference, the url is read from the file record
+        return self.connection.files.get(externalId=external_id)['url']
+
+    def post_attachments(self, attachments: Dict[str, Dict], folder: Dict) -> Dict[str, str]:
+        """
+        Upload Fyle attachments to NetSuite, NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS at a time.
+        Each attachment is downloaded only while it is being uploaded and a failing upload doesn't stop the others
+        :param attachments: Fyle attachment by external id of the file
+        :param folder: Reference of the folder to upload to
+        :return: url of the uploaded file by external id
+        """
+        is_parallel = len(attachments) > 1 and settings.NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS > 1
+        worker = threading.local()
+
+        def upload(external_id: str) -> Optional[str]:
+            try:
+                netsuite_connection = self
+                if is_parallel:
+                    # Pooled connections are kept per thread, so each worker builds its connector once
+                    if not hasattr(worker, 'netsuite_connection'):
+                        worker.netsuite_connection = NetSuiteConnector(self.__netsuite_credentials, self.workspace_id)
+                    netsuite_connection = worker.netsuite_connection
+
+                return netsuite_connection.post_attachment(external_id, attachments[external_id], folder)
+            except Exception as exception:
+                logger.info('Error while uploading attachment %s for workspace %s - %s',
+                            external_id, self.workspace_id, exception)
+
+        external_ids = list(attachments.keys())
+        if is_parallel:
+            max_workers = min(settings.NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS, len(external_ids))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                urls = list(executor.map(upload, external_ids))
+        else:
+            urls = [upload(external_id) for external_id in external_ids]
+
+        return {external_id: url for external_id, url in zip(external_ids, urls) if url}
+
+    def get_transactions(self, record_type: str, internal_ids: List[str]) -> Dict[str, Dict]:
+        """
+        GET NetSuite transactions with getList, NETSUITE_GET_LIST_BATCH_SIZE transactions per request
+        :param record_type: Record type, e.g. vendorBill
+        :param internal_ids: Internal ids of the transactions
+        :return: transaction by internal id
+        """
+        ns_client = self.connection.client
+        batch_size = settings.NETSUITE_GET_LIST_BATCH_SIZE
+        transactions = {}
+
+        for index in range(0, len(internal_ids), batch_size):
+            base_refs = [
+                ns_client.RecordRef(type=record_type, internalId=str(internal_id))
+                for internal_id in internal_ids[index:index + batch_size]
+            ]
+            response = ns_client.request('getList', baseRef=base_refs).body.readResponseList
+
+            if not response['status']['isSuccess']:
+                status_detail = response['status']['statusDetail'][0]
+                raise NetSuiteRequestError(status_detail['message'], code=status_detail['code'])
+
+            for read_response in response['readResponse']:
+                if read_response['status']['isSuccess']:
+                    record = zeep.helpers.serialize_object(read_response['record'])
+                    transactions[record['internalId']] = record
+                else:
+                    logger.info('Unable to get %s, workspace_id - %s, error - %s',
+                        record_type, self.workspace_id, read_response['status']['statusDetail'])
+
+        return transactions
+
+    def get_transaction_statuses(self, record_type: str, internal_ids: List[str]) -> Dict[str, str]:
+        """
+        GET status of NetSuite transactions with getList
+        :param record_type: Record type, e.g. vendorBill
+        :param internal_ids: Internal ids of the transactions
+        :return: status by internal id
+        """
+        transactions = self.get_transactions(record_type, internal_ids)
+        return {internal_id: transaction['status'] for internal_id, transaction in transactions.items()}
+
+    def get_modified_transaction_statuses(self, api, last_modified_at: datetime) -> Dict[str, str]:
+        """
+        GET status of NetSuite transactions of the record type modified after the datetime
+        :param api: NetSuite SDK api of the transaction type, e.g. vendor_bills
+        :param last_modified_at: Last modified datetime
+        :return: status by internal id
+        """
+        ns_client = self.connection.client
+        basic_search = ns_client.basic_search_factory(
+            'Transaction',
+            recordType=ns_client.SearchStringField(searchValue=api.type_name, operator='contains'),
+            lastModifiedDate=ns_client.SearchDateField(searchValue=last_modified_at, operator='after')
+        )
+        paginated_search = PaginatedSearch(
+            client=ns_client,
+            type_name='Transaction',
+            basic_search=basic_search,
+            pageSize=20
+        )
+
+        statuses = {}
+        for records in api._paginated_search_generator(paginated_search=paginated_search):
+            for record in records:
+                statuses[record['internalId']] = record['status']
+
+        return statuses
+
 
     def construct_journal_entry_lineitems(self, journal_entry_lineitems: List[JournalEntryLineItem], general_mapping: GeneralMapping, org_id: str,
                                             credit=None, debit=None, attachment_links: Dict = None,
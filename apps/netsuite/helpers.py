@@ -1,13 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Dict, List
 import logging
+import time
 
 from django_q.models import OrmQ
 
+from django.conf import settings
+from django.db import connections
 from django.utils.module_loading import import_string
 
 from apps.mappings.constants import SYNC_METHODS
-from apps.workspaces.models import Configuration, Workspace, NetSuiteCredentials
+from apps.workspaces.models import Configuration, Workspace, NetSuiteCredentials, FeatureConfig
 from apps.netsuite.connector import NetSuiteConnector
+from apps.netsuite.connection_pool import account_slot
 from workers.helpers import RoutingKeyEnum, WorkerActionEnum, publish_to_rabbitmq
 
 from .tasks import schedule_vendor_payment_creation, schedule_netsuite_objects_status_sync, \
@@ -15,6 +21,37 @@ from .tasks import schedule_vendor_payment_creation, schedule_netsuite_objects_s
 
 logger = logging.getLogger(__name__)
 
+# Dimensions writing the same attribute type are synced one after the other in the same worker
+SHARED_ATTRIBUTE_TYPE_DIMENSIONS = {
+    'items': 'accounts',
+    'customers': 'projects'
+}
+
+
+class DimensionSyncResult:
+    """
+    Per dimension timings and failures of a dimension sync
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.failures: Dict[str, str] = {}
+
+    def add(self, dimension: str, duration: float, exception: Exception = None):
+        """
+        Record the outcome of a dimension sync
+        :param dimension: Dimension
+        :param duration: Time taken in seconds
+        :param exception: Exception raised by the sync, if any
+        """
+        self.timings[dimension] = duration
+        if exception:
+            self.failures[dimension] = str(exception)
+
+    @property
+    def synced_dimensions(self) -> List[str]:
+        return [dimension for dimension in self.timings if dimension not in self.failures]
+
 
 def sync_override_tax_items(netsuite_credentials: NetSuiteCredentials, workspace_id: int):
     try:
@@ -68,20 +105,73 @@ def check_interval_and_sync_dimension(workspace_id):
         workspace.destination_synced_at = datetime.now()
         workspace.save(update_fields=['destination_synced_at'])
 
-def sync_dimensions(ns_credentials: NetSuiteCredentials, workspace_id: int, dimensions: list = []) -> None:
-    netsuite_connection = import_string('apps.netsuite.connector.NetSuiteConnector')(ns_credentials, workspace_id)
+def __sync_dimension(netsuite_connection, dimension: str, result: DimensionSyncResult) -> None:
+    started_at = time.monotonic()
+    exception = None
+
+    try:
+        sync = getattr(netsuite_connection, 'sync_{}'.format(dimension))
+        sync()
+    except Exception as e:
+        exception = e
+        logger.info(exception)
+
+    result.add(dimension, time.monotonic() - started_at, exception)
+
+
+def __sync_dimension_group(ns_credentials: NetSuiteCredentials, workspace_id: int, dimensions: List[str], result: DimensionSyncResult) -> None:
+    """
+    Sync dimensions one after the other with a connector of the worker thread
+    """
+    try:
+        with account_slot(ns_credentials.ns_account_id):
+            netsuite_connection = import_string('apps.netsuite.connector.NetSuiteConnector')(ns_credentials, workspace_id)
+            for dimension in dimensions:
+                __sync_dimension(netsuite_connection, dimension, result)
+    except Exception as exception:
+        logger.info(exception)
+        for dimension in dimensions:
+            if dimension not in result.timings:
+                result.add(dimension, 0, exception)
+    finally:
+        connections.close_all()
+
+
+def __group_dimensions(dimensions: List[str]) -> List[List[str]]:
+    groups = {}
+    for dimension in dimensions:
+        groups.setdefault(SHARED_ATTRIBUTE_TYPE_DIMENSIONS.get(dimension, dimension), []).append(dimension)
+
+    return list(groups.values())
+
+
+def sync_dimensions(ns_credentials: NetSuiteCredentials, workspace_id: int, dimensions: list = []) -> DimensionSyncResult:
     if not dimensions:
         dimensions = [
             'expense_categories', 'locations', 'vendors', 'currencies', 'classifications',
             'departments', 'employees', 'accounts', 'custom_segments', 'projects', 'customers', 'tax_items', 'items'
         ]
 
-    for dimension in dimensions:
-        try:
-            sync = getattr(netsuite_connection, 'sync_{}'.format(dimension))
-            sync()
-        except Exception as exception:
-            logger.info(exception)
+    result = DimensionSyncResult()
+
+    if FeatureConfig.get_feature_config(workspace_id=workspace_id, key='parallel_dimension_sync'):
+        dimension_groups = __group_dimensions(dimensions)
+        max_workers = max(min(settings.NETSUITE_DIMENSION_SYNC_MAX_WORKERS, len(dimension_groups)), 1)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for dimension_group in dimension_groups:
+                executor.submit(__sync_dimension_group, ns_credentials, workspace_id, dimension_group, result)
+    else:
+        netsuite_connection = import_string('apps.netsuite.connector.NetSuiteConnector')(ns_credentials, workspace_id)
+        for dimension in dimensions:
+            __sync_dimension(netsuite_connection, dimension, result)
+
+    logger.info(
+        'Synced NetSuite dimensions for workspace %s, timings: %s, failures: %s',
+        workspace_id, result.timings, result.failures
+    )
+
+    return result
 
 
 def get_import_categories_settings(configurations: Configuration):
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.28 on 2026-10-17 21:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0057_featureconfig_incremental_dimension_sync'),
+        ('netsuite', '0029_remove_bill_is_attachment_upload_failed_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetSuiteDimensionSyncState',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('dimension', models.CharField(help_text='NetSuite dimension, e.g. accounts', max_length=255)),
+                ('last_modified_at', models.DateTimeField(help_text='Records modified after this datetime are fetched by the next incremental sync', null=True)),
+                ('last_full_sync_at', models.DateTimeField(help_text='Datetime of the last full sync', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Created at datetime')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Updated at datetime')),
+                ('workspace', models.ForeignKey(help_text='Reference to workspace', on_delete=django.db.models.deletion.PROTECT, to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'netsuite_dimension_sync_states',
+                'unique_together': {('workspace', 'dimension')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netsuite', '0030_netsuitedimensionsyncstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='netsuitedimensionsyncstate',
+            name='checkpoint',
+            field=models.JSONField(help_text='Search and last saved page of an unfinished sync', null=True),
+        ),
+    ]
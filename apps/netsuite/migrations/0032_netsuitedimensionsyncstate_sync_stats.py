@@ -0,0 +1,28 @@
+# Generated by Django 4.2.28 on 2026-10-17 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netsuite', '0031_netsuitedimensionsyncstate_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='netsuitedimensionsyncstate',
+            name='sync_duration',
+            field=models.FloatField(help_text='Seconds taken by the last sync', null=True),
+        ),
+        migrations.AddField(
+            model_name='netsuitedimensionsyncstate',
+            name='sync_error',
+            field=models.TextField(help_text='Error of the last sync, if it failed', null=True),
+        ),
+        migrations.AddField(
+            model_name='netsuitedimensionsyncstate',
+            name='synced_count',
+            field=models.IntegerField(help_text='Number of records saved by the last sync', null=True),
+        ),
+    ]
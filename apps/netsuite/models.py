@@ -1,10 +1,13 @@
 """
 NetSuite models
 """
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List
 
+from django.conf import settings
 from django.db import models
-from django.db.models import JSONField
+from django.utils import timezone
+from django.db.models import JSONField, Q
 
 from fyle_accounting_mappings.models import Mapping, MappingSetting, DestinationAttribute, CategoryMapping,\
     EmployeeMapping
@@ -36,11 +39,247 @@ def get_filtered_mapping(
     return Mapping.objects.filter(**filters).first()
 
 
-def get_department_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
-    department_setting: MappingSetting = MappingSetting.objects.filter(
-        workspace_id=expense_group.workspace_id,
-        destination_field='DEPARTMENT'
-    ).first()
+class MappingResolver:
+    """
+    Resolves the mappings used while creating export line items. When expenses are
+    passed, mapping settings, mappings, category and employee mappings of all their
+    source values are loaded upfront so every line is answered from memory. Lookups
+    outside the prefetched values fall back to a query and are cached.
+    """
+
+    def __init__(self, workspace_id: int, expenses: List[Expense] = None, description: Dict = None):
+        self.workspace_id = workspace_id
+
+        self.__mapping_settings = None
+        self.__expense_attributes = {}
+        self.__custom_segments = None
+        self.__mappings = {}
+        self.__category_mappings = {}
+        self.__employee_mappings = {}
+        self.__currencies = {}
+
+        if expenses:
+            self.__prefetch(expenses, description or {})
+
+    def __prefetch(self, expenses: List[Expense], description: Dict):
+        """
+        Load mappings of all source values present in the expenses
+        """
+        custom_source_fields = [
+            setting.source_field for setting in self.mapping_settings
+            if setting.source_field not in ('PROJECT', 'COST_CENTER')
+        ]
+        if custom_source_fields:
+            expense_attributes = ExpenseAttribute.objects.filter(
+                workspace_id=self.workspace_id, attribute_type__in=custom_source_fields
+            ).order_by('attribute_type', 'id').distinct('attribute_type')
+            self.__expense_attributes = {attribute.attribute_type: attribute for attribute in expense_attributes}
+            for source_field in custom_source_fields:
+                self.__expense_attributes.setdefault(source_field, None)
+
+        source_values = set(value for value in description.values() if isinstance(value, str))
+        source_ids = set()
+        for expense in expenses:
+            source_values.update([expense.project, expense.cost_center])
+            source_values.update(value for value in (expense.custom_properties or {}).values() if isinstance(value, str))
+            source_ids.update([expense.project_id, expense.tax_group_id, expense.corporate_card_id])
+        source_values.discard(None)
+        source_ids.discard(None)
+        source_ids = set(str(source_id) for source_id in source_ids)
+
+        mapping_types = set((setting.source_field, setting.destination_field) for setting in self.mapping_settings)
+        mapping_types.update([('TAX_GROUP', 'TAX_ITEM'), ('CORPORATE_CARD', 'CREDIT_CARD_ACCOUNT')])
+
+        mappings = Mapping.objects.filter(
+            Q(source__source_id__in=source_ids) | Q(source__value__in=source_values),
+            workspace_id=self.workspace_id,
+            source_type__in=[source_type for source_type, _ in mapping_types],
+            destination_type__in=[destination_type for _, destination_type in mapping_types]
+        ).select_related('source', 'destination').order_by('id')
+
+        for mapping in mappings:
+            self.__mappings.setdefault((mapping.source_type, mapping.destination_type, 'source_id', mapping.source.source_id), mapping)
+            self.__mappings.setdefault((mapping.source_type, mapping.destination_type, 'value', mapping.source.value), mapping)
+
+        for source_type, destination_type in mapping_types:
+            for source_id in source_ids:
+                self.__mappings.setdefault((source_type, destination_type, 'source_id', source_id), None)
+            for source_value in source_values:
+                self.__mappings.setdefault((source_type, destination_type, 'value', source_value), None)
+
+        categories = set()
+        for expense in expenses:
+            categories.add(expense.category)
+            categories.add('{0} / {1}'.format(expense.category, expense.sub_category))
+
+        category_mappings = CategoryMapping.objects.filter(
+            workspace_id=self.workspace_id, source_category__value__in=categories
+        ).select_related('source_category', 'destination_account', 'destination_expense_head').order_by('id')
+
+        for category_mapping in category_mappings:
+            category = category_mapping.source_category.value
+            display_name = category_mapping.destination_account.display_name if category_mapping.destination_account else None
+            self.__category_mappings.setdefault((category, None), category_mapping)
+            self.__category_mappings.setdefault((category, display_name), category_mapping)
+
+        for category in categories:
+            for display_name in (None, 'Item', 'Account'):
+                self.__category_mappings.setdefault((category, display_name), None)
+
+        employee_emails = set(expense.employee_email for expense in expenses)
+        if description.get('employee_email'):
+            employee_emails.add(description.get('employee_email'))
+
+        employee_mappings = EmployeeMapping.objects.filter(
+            workspace_id=self.workspace_id, source_employee__value__in=employee_emails
+        ).select_related(
+            'source_employee', 'destination_employee', 'destination_vendor', 'destination_card_account'
+        ).order_by('id')
+
+        for employee_mapping in employee_mappings:
+            self.__employee_mappings.setdefault(employee_mapping.source_employee.value, employee_mapping)
+
+        for employee_email in employee_emails:
+            self.__employee_mappings.setdefault(employee_email, None)
+
+        currencies = set(expense.currency for expense in expenses)
+        for currency in DestinationAttribute.objects.filter(
+            workspace_id=self.workspace_id, attribute_type='CURRENCY', value__in=currencies
+        ).order_by('id'):
+            self.__currencies.setdefault(currency.value, currency)
+
+        for currency in currencies:
+            self.__currencies.setdefault(currency, None)
+
+    @property
+    def mapping_settings(self) -> List[MappingSetting]:
+        """
+        Mapping settings of the workspace
+        """
+        if self.__mapping_settings is None:
+            self.__mapping_settings = list(MappingSetting.objects.filter(workspace_id=self.workspace_id).order_by('id'))
+
+        return self.__mapping_settings
+
+    def get_mapping_setting(self, destination_field: str) -> MappingSetting:
+        """
+        Get the mapping setting of a destination field
+        """
+        for setting in self.mapping_settings:
+            if setting.destination_field == destination_field:
+                return setting
+
+    def get_expense_attribute(self, attribute_type: str) -> ExpenseAttribute:
+        """
+        Get an expense attribute of the attribute type, used for its display name
+        """
+        if attribute_type not in self.__expense_attributes:
+            self.__expense_attributes[attribute_type] = ExpenseAttribute.objects.filter(
+                attribute_type=attribute_type, workspace_id=self.workspace_id
+            ).first()
+
+        return self.__expense_attributes[attribute_type]
+
+    def get_mapping(self, source_type: str, destination_type: str, source_value: str, source_id: str) -> Mapping:
+        """
+        Get the mapping of a source value, matched on source_id when present
+        """
+        key = (source_type, destination_type, 'source_id', str(source_id)) if source_id \
+            else (source_type, destination_type, 'value', source_value)
+
+        if key not in self.__mappings:
+            self.__mappings[key] = get_filtered_mapping(source_type, destination_type, self.workspace_id, source_value, source_id)
+
+        return self.__mappings[key]
+
+    def get_tax_group_mapping(self, tax_group_id: str) -> Mapping:
+        """
+        Get the tax item mapping of a tax group
+        """
+        key = ('TAX_GROUP', 'TAX_ITEM', 'source_id', str(tax_group_id) if tax_group_id is not None else None)
+
+        if key not in self.__mappings:
+            self.__mappings[key] = Mapping.objects.filter(
+                source_type='TAX_GROUP',
+                destination_type='TAX_ITEM',
+                source__source_id=tax_group_id,
+                workspace_id=self.workspace_id
+            ).first()
+
+        return self.__mappings[key]
+
+    def get_corporate_card_mapping(self, corporate_card_id: str) -> Mapping:
+        """
+        Get the credit card account mapping of a corporate card
+        """
+        key = ('CORPORATE_CARD', 'CREDIT_CARD_ACCOUNT', 'source_id', str(corporate_card_id) if corporate_card_id is not None else None)
+
+        if key not in self.__mappings:
+            self.__mappings[key] = Mapping.objects.filter(
+                source_type='CORPORATE_CARD',
+                destination_type='CREDIT_CARD_ACCOUNT',
+                source__source_id=corporate_card_id,
+                workspace_id=self.workspace_id
+            ).first()
+
+        return self.__mappings[key]
+
+    def get_custom_segment(self, name: str) -> 'CustomSegment':
+        """
+        Get the custom segment with the name
+        """
+        if self.__custom_segments is None:
+            self.__custom_segments = {}
+            for custom_segment in CustomSegment.objects.filter(workspace_id=self.workspace_id).order_by('id'):
+                self.__custom_segments.setdefault(custom_segment.name, custom_segment)
+
+        return self.__custom_segments.get(name)
+
+    def get_category_mapping(self, category: str, destination_display_name: str = None) -> CategoryMapping:
+        """
+        Get the category mapping of a category, optionally only to destination accounts with the display name
+        """
+        key = (category, destination_display_name)
+
+        if key not in self.__category_mappings:
+            filters = {
+                'source_category__value': category,
+                'workspace_id': self.workspace_id
+            }
+            if destination_display_name:
+                filters['destination_account__display_name'] = destination_display_name
+
+            self.__category_mappings[key] = CategoryMapping.objects.filter(**filters).first()
+
+        return self.__category_mappings[key]
+
+    def get_employee_mapping(self, employee_email: str) -> EmployeeMapping:
+        """
+        Get the employee mapping of an employee email
+        """
+        if employee_email not in self.__employee_mappings:
+            self.__employee_mappings[employee_email] = EmployeeMapping.objects.filter(
+                source_employee__value=employee_email,
+                workspace_id=self.workspace_id
+            ).first()
+
+        return self.__employee_mappings[employee_email]
+
+    def get_currency(self, currency: str) -> DestinationAttribute:
+        """
+        Get the NetSuite currency attribute of a currency code
+        """
+        if currency not in self.__currencies:
+            self.__currencies[currency] = DestinationAttribute.objects.filter(
+                value=currency, workspace_id=self.workspace_id, attribute_type='CURRENCY'
+            ).first()
+
+        return self.__currencies[currency]
+
+
+def get_department_id_or_none(expense_group: ExpenseGroup, lineitem: Expense, mapping_resolver: MappingResolver = None):
+    mapping_resolver = mapping_resolver or MappingResolver(expense_group.workspace_id)
+    department_setting: MappingSetting = mapping_resolver.get_mapping_setting('DEPARTMENT')
 
     department_id = None
     source_id = None
@@ -54,12 +293,12 @@ def get_department_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
             elif department_setting.source_field == 'COST_CENTER':
                 source_value = lineitem.cost_center
             else:
-                attribute = ExpenseAttribute.objects.filter(attribute_type=department_setting.source_field, workspace_id=expense_group.workspace_id).first()
+                attribute = mapping_resolver.get_expense_attribute(department_setting.source_field)
                 if attribute:
                     source_value = lineitem.custom_properties.get(attribute.display_name, None)
 
-        mapping: Mapping = get_filtered_mapping(
-            department_setting.source_field, 'DEPARTMENT', expense_group.workspace_id, source_value, source_id
+        mapping: Mapping = mapping_resolver.get_mapping(
+            department_setting.source_field, 'DEPARTMENT', source_value, source_id
         )
 
         if mapping:
@@ -67,11 +306,9 @@ def get_department_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
     return department_id
 
 
-def get_class_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
-    class_setting: MappingSetting = MappingSetting.objects.filter(
-        workspace_id=expense_group.workspace_id,
-        destination_field='CLASS'
-    ).first()
+def get_class_id_or_none(expense_group: ExpenseGroup, lineitem: Expense, mapping_resolver: MappingResolver = None):
+    mapping_resolver = mapping_resolver or MappingResolver(expense_group.workspace_id)
+    class_setting: MappingSetting = mapping_resolver.get_mapping_setting('CLASS')
 
     class_id = None
     source_id = None
@@ -85,14 +322,14 @@ def get_class_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
             elif class_setting.source_field == 'COST_CENTER':
                 source_value = lineitem.cost_center
             else:
-                attribute = ExpenseAttribute.objects.filter(attribute_type=class_setting.source_field, workspace_id=expense_group.workspace_id).first()
+                attribute = mapping_resolver.get_expense_attribute(class_setting.source_field)
                 if attribute:
                     source_value = lineitem.custom_properties.get(attribute.display_name, None)
         else:
             source_value = expense_group.description[class_setting.source_field.lower()]
 
-        mapping: Mapping = get_filtered_mapping(
-            class_setting.source_field, 'CLASS', expense_group.workspace_id, source_value, source_id
+        mapping: Mapping = mapping_resolver.get_mapping(
+            class_setting.source_field, 'CLASS', source_value, source_id
         )
 
         if mapping:
@@ -100,7 +337,10 @@ def get_class_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
     return class_id
 
 
-def get_tax_group_mapping(lineitem: Expense = None, workspace_id: int = None):
+def get_tax_group_mapping(lineitem: Expense = None, workspace_id: int = None, mapping_resolver: MappingResolver = None):
+    if mapping_resolver:
+        return mapping_resolver.get_tax_group_mapping(lineitem.tax_group_id)
+
     mapping: Mapping = Mapping.objects.filter(
         source_type='TAX_GROUP',
         destination_type='TAX_ITEM',
@@ -111,15 +351,15 @@ def get_tax_group_mapping(lineitem: Expense = None, workspace_id: int = None):
     return mapping
 
 
-def get_tax_item_id_or_none(expense_group: ExpenseGroup, general_mapping: GeneralMapping, lineitem: Expense = None):
+def get_tax_item_id_or_none(
+    expense_group: ExpenseGroup, general_mapping: GeneralMapping, lineitem: Expense = None, mapping_resolver: MappingResolver = None
+):
     tax_code = None
-    tax_setting: MappingSetting = MappingSetting.objects.filter(
-        workspace_id=expense_group.workspace_id,
-        destination_field='TAX_ITEM'
-    ).first()
+    mapping_resolver = mapping_resolver or MappingResolver(expense_group.workspace_id)
+    tax_setting: MappingSetting = mapping_resolver.get_mapping_setting('TAX_ITEM')
     
     if tax_setting:
-        mapping = get_tax_group_mapping(lineitem, expense_group.workspace_id)
+        mapping = get_tax_group_mapping(lineitem, expense_group.workspace_id, mapping_resolver)
 
         if mapping:
             tax_code = mapping.destination.destination_id
@@ -141,11 +381,9 @@ def get_tax_info(lineitem: Expense = None):
     return tax_code, tax_rate, tax_type
 
 
-def get_customer_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
-    project_setting: MappingSetting = MappingSetting.objects.filter(
-        workspace_id=expense_group.workspace_id,
-        destination_field='PROJECT'
-    ).first()
+def get_customer_id_or_none(expense_group: ExpenseGroup, lineitem: Expense, mapping_resolver: MappingResolver = None):
+    mapping_resolver = mapping_resolver or MappingResolver(expense_group.workspace_id)
+    project_setting: MappingSetting = mapping_resolver.get_mapping_setting('PROJECT')
 
     customer_id = None
     source_value = None
@@ -156,8 +394,8 @@ def get_customer_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
             source_value = lineitem.project
             source_id = lineitem.project_id
 
-        mapping: Mapping = get_filtered_mapping(
-            project_setting.source_field, 'PROJECT', expense_group.workspace_id, source_value, source_id
+        mapping: Mapping = mapping_resolver.get_mapping(
+            project_setting.source_field, 'PROJECT', source_value, source_id
         )
 
         if mapping:
@@ -165,11 +403,9 @@ def get_customer_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
     return customer_id
 
 
-def get_location_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
-    location_setting: MappingSetting = MappingSetting.objects.filter(
-        workspace_id=expense_group.workspace_id,
-        destination_field='LOCATION'
-    ).first()
+def get_location_id_or_none(expense_group: ExpenseGroup, lineitem: Expense, mapping_resolver: MappingResolver = None):
+    mapping_resolver = mapping_resolver or MappingResolver(expense_group.workspace_id)
+    location_setting: MappingSetting = mapping_resolver.get_mapping_setting('LOCATION')
 
     location_id = None
     source_id = None
@@ -183,14 +419,14 @@ def get_location_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
             elif location_setting.source_field == 'COST_CENTER':
                 source_value = lineitem.cost_center
             else:
-                attribute = ExpenseAttribute.objects.filter(attribute_type=location_setting.source_field, workspace_id=expense_group.workspace_id).first()
+                attribute = mapping_resolver.get_expense_attribute(location_setting.source_field)
                 if attribute:
                     source_value = lineitem.custom_properties.get(attribute.display_name, None)
         else:
             source_value = expense_group.description[location_setting.source_field.lower()]
 
-        mapping: Mapping = get_filtered_mapping(
-            location_setting.source_field, 'LOCATION', expense_group.workspace_id, source_value, source_id
+        mapping: Mapping = mapping_resolver.get_mapping(
+            location_setting.source_field, 'LOCATION', source_value, source_id
         )
 
         if mapping:
@@ -198,9 +434,10 @@ def get_location_id_or_none(expense_group: ExpenseGroup, lineitem: Expense):
     return location_id
 
 
-def get_custom_segments(expense_group: ExpenseGroup, lineitem: Expense):
+def get_custom_segments(expense_group: ExpenseGroup, lineitem: Expense, mapping_resolver: MappingResolver = None):
 
-    mapping_settings = MappingSetting.objects.filter(workspace_id=expense_group.workspace_id).all()
+    mapping_resolver = mapping_resolver or MappingResolver(expense_group.workspace_id)
+    mapping_settings = mapping_resolver.mapping_settings
 
     custom_segments = []
     source_id = None
@@ -217,24 +454,18 @@ def get_custom_segments(expense_group: ExpenseGroup, lineitem: Expense):
             elif setting.source_field == 'COST_CENTER':
                 source_value = lineitem.cost_center
             else:
-                attribute = ExpenseAttribute.objects.filter(
-                    attribute_type=setting.source_field,
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                attribute = mapping_resolver.get_expense_attribute(setting.source_field)
                 if attribute:
                     source_value = lineitem.custom_properties.get(attribute.display_name, None)
 
-            mapping: Mapping = get_filtered_mapping(
-               setting.source_field, setting.destination_field, expense_group.workspace_id, source_value, source_id
+            mapping: Mapping = mapping_resolver.get_mapping(
+               setting.source_field, setting.destination_field, source_value, source_id
             )
 
             if mapping:
                 # trim -CS from custom segment name
                 name = setting.destination_field.split('-')[0] if '-CS' in setting.destination_field else setting.destination_field
-                cus_list = CustomSegment.objects.filter(
-                    name=name,
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                cus_list = mapping_resolver.get_custom_segment(name)
                 value = mapping.destination.destination_id
                 custom_segments.append({
                     'scriptId': cus_list.script_id,
@@ -286,24 +517,20 @@ def get_expense_purpose(lineitem, category, configuration) -> str:
 
     return purpose
 
-def get_ccc_account_id(configuration: Configuration, general_mappings: GeneralMapping, expense: Expense, description: str):
+def get_ccc_account_id(
+    configuration: Configuration, general_mappings: GeneralMapping, expense: Expense, description: str,
+    mapping_resolver: MappingResolver = None
+):
+    mapping_resolver = mapping_resolver or MappingResolver(configuration.workspace_id)
     if configuration.map_fyle_cards_netsuite_account:
-        ccc_account = Mapping.objects.filter(
-            source_type='CORPORATE_CARD',
-            destination_type='CREDIT_CARD_ACCOUNT',
-            source__source_id=expense.corporate_card_id,
-            workspace_id=configuration.workspace_id
-        ).first()
+        ccc_account = mapping_resolver.get_corporate_card_mapping(expense.corporate_card_id)
 
         if ccc_account:
             ccc_account_id = ccc_account.destination.destination_id
         else:
             ccc_account_id = general_mappings.default_ccc_account_id
     else:
-        ccc_account_mapping: EmployeeMapping = EmployeeMapping.objects.filter(
-            source_employee__value=description.get('employee_email'),
-            workspace_id=configuration.workspace_id
-        ).first()
+        ccc_account_mapping: EmployeeMapping = mapping_resolver.get_employee_mapping(description.get('employee_email'))
         ccc_account_id = ccc_account_mapping.destination_card_account.destination_id \
             if ccc_account_mapping and ccc_account_mapping.destination_card_account \
             else general_mappings.default_ccc_account_id
@@ -321,23 +548,19 @@ def get_report_or_expense_number(expense_group: ExpenseGroup) -> str:
             else:
                 return expense.claim_number
             
-def get_category_mapping_and_detail_type(configuration: Configuration, category: str, workspace_id: int):
+def get_category_mapping_and_detail_type(
+    configuration: Configuration, category: str, workspace_id: int, mapping_resolver: MappingResolver = None
+):
+    mapping_resolver = mapping_resolver or MappingResolver(workspace_id)
+
     # get the item-mapping if import_items is true
     if configuration.import_items:
-        netsuite_item = CategoryMapping.objects.filter(
-            destination_account__display_name = 'Item',
-            source_category__value=category,
-            workspace_id=workspace_id
-        ).first()
+        netsuite_item = mapping_resolver.get_category_mapping(category, 'Item')
         if netsuite_item:
             return netsuite_item, 'ItemBasedExpenseLineDetail'
 
     # else get the account-mapping
-    netsuite_account = CategoryMapping.objects.filter(
-        destination_account__display_name = 'Account',
-        source_category__value=category,
-        workspace_id=workspace_id
-    ).first()
+    netsuite_account = mapping_resolver.get_category_mapping(category, 'Account')
 
     return netsuite_account, 'AccountBasedExpenseLineDetail'
 
@@ -403,6 +626,110 @@ class NetSuiteAttributesCount(models.Model):
         netsuite_count.save(update_fields=[field_name, 'updated_at'])
 
 
+class NetSuiteDimensionSyncState(models.Model):
+    """
+    Store incremental sync state of each NetSuite dimension for a workspace
+    """
+    id = models.AutoField(primary_key=True)
+    workspace = models.ForeignKey(Workspace, on_delete=models.PROTECT, help_text='Reference to workspace')
+    dimension = models.CharField(max_length=255, help_text='NetSuite dimension, e.g. accounts')
+    last_modified_at = models.DateTimeField(
+        null=True, help_text='Records modified after this datetime are fetched by the next incremental sync')
+    last_full_sync_at = models.DateTimeField(null=True, help_text='Datetime of the last full sync')
+    checkpoint = JSONField(null=True, help_text='Search and last saved page of an unfinished sync')
+    synced_count = models.IntegerField(null=True, help_text='Number of records saved by the last sync')
+    sync_duration = models.FloatField(null=True, help_text='Seconds taken by the last sync')
+    sync_error = models.TextField(null=True, help_text='Error of the last sync, if it failed')
+    created_at = models.DateTimeField(auto_now_add=True, help_text='Created at datetime')
+    updated_at = models.DateTimeField(auto_now=True, help_text='Updated at datetime')
+
+    class Meta:
+        db_table = 'netsuite_dimension_sync_states'
+        unique_together = ('workspace', 'dimension')
+
+    @staticmethod
+    def get_last_modified_at(workspace_id: int, dimension: str) -> datetime:
+        """
+        Get the datetime to fetch modified records from, none when a full sync is due
+        :param workspace_id: Workspace ID
+        :param dimension: NetSuite dimension
+        :return: last modified datetime or none
+        """
+        sync_state = NetSuiteDimensionSyncState.objects.filter(workspace_id=workspace_id, dimension=dimension).first()
+        if not sync_state or not sync_state.last_modified_at or not sync_state.last_full_sync_at:
+            return None
+
+        if sync_state.last_full_sync_at < timezone.now() - timedelta(days=settings.NETSUITE_FULL_SYNC_INTERVAL_DAYS):
+            return None
+
+        return sync_state.last_modified_at
+
+    @staticmethod
+    def update_sync_state(workspace_id: int, dimension: str, synced_at: datetime, is_full_sync: bool):
+        """
+        Move the watermark of a completed sync
+        :param workspace_id: Workspace ID
+        :param dimension: NetSuite dimension
+        :param synced_at: Datetime the sync started at
+        :param is_full_sync: Whether all records were fetched
+        """
+        defaults = {'last_modified_at': synced_at}
+        if is_full_sync:
+            defaults['last_full_sync_at'] = synced_at
+
+        NetSuiteDimensionSyncState.objects.update_or_create(
+            workspace_id=workspace_id,
+            dimension=dimension,
+            defaults=defaults
+        )
+
+    @staticmethod
+    def update_sync_stats(workspace_id: int, dimension: str, synced_count: int, sync_duration: float, sync_error: str = None):
+        """
+        Record the outcome of the last sync
+        :param workspace_id: Workspace ID
+        :param dimension: NetSuite dimension
+        :param synced_count: Number of records saved
+        :param sync_duration: Seconds taken
+        :param sync_error: Error, if the sync failed
+        """
+        NetSuiteDimensionSyncState.objects.update_or_create(
+            workspace_id=workspace_id,
+            dimension=dimension,
+            defaults={
+                'synced_count': synced_count,
+                'sync_duration': sync_duration,
+                'sync_error': sync_error
+            }
+        )
+
+    @staticmethod
+    def get_checkpoint(workspace_id: int, dimension: str) -> Dict:
+        """
+        Get the checkpoint of an unfinished sync
+        :param workspace_id: Workspace ID
+        :param dimension: NetSuite dimension
+        :return: checkpoint or none
+        """
+        return NetSuiteDimensionSyncState.objects.filter(
+            workspace_id=workspace_id, dimension=dimension
+        ).values_list('checkpoint', flat=True).first()
+
+    @staticmethod
+    def save_checkpoint(workspace_id: int, dimension: str, checkpoint: Dict = None):
+        """
+        Save the checkpoint of a sync, none once the sync is finished
+        :param workspace_id: Workspace ID
+        :param dimension: NetSuite dimension
+        :param checkpoint: Checkpoint
+        """
+        NetSuiteDimensionSyncState.objects.update_or_create(
+            workspace_id=workspace_id,
+            dimension=dimension,
+            defaults={'checkpoint': checkpoint}
+        )
+
+
 class Bill(models.Model):
     """
     NetSuite Vendor Bill
@@ -509,14 +836,20 @@ class BillLineitem(models.Model):
         db_table = 'bill_lineitems'
 
     @staticmethod
-    def create_bill_lineitems(expense_group: ExpenseGroup, configuration: Configuration):
+    def create_bill_lineitems(
+        expense_group: ExpenseGroup, configuration: Configuration, mapping_resolver: MappingResolver = None
+    ):
         """
         Create bill lineitems
         :param expense_group: expense group
         :param configuration: Workspace Configuration Settings
+        :param mapping_resolver: Mapping resolver, built for the expense group if not passed
         :return: lineitems objects
         """
         expenses = expense_group.expenses.all()
+        mapping_resolver = mapping_resolver or MappingResolver(
+            expense_group.workspace_id, expenses, expense_group.description
+        )
         bill = Bill.objects.get(expense_group=expense_group)
         general_mappings = GeneralMapping.objects.get(workspace_id=expense_group.workspace_id)
 
@@ -526,28 +859,22 @@ class BillLineitem(models.Model):
             category = lineitem.category if (lineitem.category == lineitem.sub_category or lineitem.sub_category == None) else '{0} / {1}'.format(
                 lineitem.category, lineitem.sub_category)
 
-            account, detail_type = get_category_mapping_and_detail_type(configuration, category, configuration.workspace_id)
+            account, detail_type = get_category_mapping_and_detail_type(configuration, category, configuration.workspace_id, mapping_resolver)
 
-            class_id = get_class_id_or_none(expense_group, lineitem)
+            class_id = get_class_id_or_none(expense_group, lineitem, mapping_resolver)
             if not class_id and expense_group.fund_source == 'CCC' and general_mappings.use_employee_class:
-                employee_mapping = EmployeeMapping.objects.filter(
-                    source_employee__value=expense_group.description.get('employee_email'),
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
                 if employee_mapping and employee_mapping.destination_employee:
                     class_id = employee_mapping.destination_employee.detail.get('class_id')
 
             if not class_id and general_mappings.class_id and general_mappings.class_level in ['TRANSACTION_LINE', 'ALL']:
                 class_id = general_mappings.class_id
 
-            department_id = get_department_id_or_none(expense_group, lineitem)
+            department_id = get_department_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not department_id and expense_group.fund_source == 'CCC' and general_mappings.use_employee_department and \
                 general_mappings.department_level in ('ALL', 'TRANSACTION_LINE'):
-                employee_mapping = EmployeeMapping.objects.filter(
-                    source_employee__value=expense_group.description.get('employee_email'),
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
                 if employee_mapping and employee_mapping.destination_employee:
                     if employee_mapping.destination_employee.detail.get('department_id'):
                         department_id = employee_mapping.destination_employee.detail.get('department_id')
@@ -556,14 +883,11 @@ class BillLineitem(models.Model):
                 if general_mappings.department_id and general_mappings.department_level in ['TRANSACTION_LINE', 'ALL']:
                     department_id = general_mappings.department_id
 
-            location_id = get_location_id_or_none(expense_group, lineitem)
+            location_id = get_location_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not location_id and expense_group.fund_source == 'CCC' and general_mappings.use_employee_location and\
                     general_mappings.location_level in ('ALL', 'TRANSACTION_LINE'):
-                employee_mapping = EmployeeMapping.objects.filter(
-                    source_employee__value=expense_group.description.get('employee_email'),
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
                 if employee_mapping and employee_mapping.destination_employee:
                     location_id = employee_mapping.destination_employee.detail.get('location_id')
 
@@ -571,9 +895,9 @@ class BillLineitem(models.Model):
                 general_mappings.location_level in ['TRANSACTION_LINE', 'ALL']:
                 location_id = general_mappings.location_id
 
-            custom_segments = get_custom_segments(expense_group, lineitem)
+            custom_segments = get_custom_segments(expense_group, lineitem, mapping_resolver)
 
-            customer_id = get_customer_id_or_none(expense_group, lineitem)
+            customer_id = get_customer_id_or_none(expense_group, lineitem, mapping_resolver)
 
             billable = lineitem.billable
             if customer_id:
@@ -596,7 +920,7 @@ class BillLineitem(models.Model):
                     'department_id': department_id,
                     'customer_id': customer_id,
                     'amount': lineitem.amount,
-                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings,lineitem),
+                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings, lineitem, mapping_resolver),
                     'tax_amount': lineitem.tax_amount,
                     'billable': billable,
                     'memo': get_expense_purpose(lineitem, category, configuration),
@@ -724,47 +1048,45 @@ class CreditCardChargeLineItem(models.Model):
         db_table = 'credit_card_charge_lineitems'
 
     @staticmethod
-    def create_credit_card_charge_lineitems(expense_group: ExpenseGroup, configuration: Configuration):
+    def create_credit_card_charge_lineitems(
+        expense_group: ExpenseGroup, configuration: Configuration, mapping_resolver: MappingResolver = None
+    ):
         """
         Create credit card charge lineitems
         :param expense_group: expense group
         :param configuration: Workspace Configuration Settings
+        :param mapping_resolver: Mapping resolver, built for the expense group if not passed
         :return: credit card charge lineitems objects
         """
+        expenses = expense_group.expenses.all()
+        mapping_resolver = mapping_resolver or MappingResolver(
+            expense_group.workspace_id, expenses, expense_group.description
+        )
         credit_card_charge = CreditCardCharge.objects.get(expense_group=expense_group)
         general_mappings = GeneralMapping.objects.get(workspace_id=expense_group.workspace_id)
 
         credit_card_charge_lineitem_objects = []
-        for lineitem in expense_group.expenses.all():
+        for lineitem in expenses:
 
             category = lineitem.category if (lineitem.category == lineitem.sub_category or lineitem.sub_category == None) else '{0} / {1}'.format(
                 lineitem.category, lineitem.sub_category)
 
-            account = CategoryMapping.objects.filter(
-                source_category__value=category,
-                workspace_id=expense_group.workspace_id
-            ).first()
+            account = mapping_resolver.get_category_mapping(category)
 
-            class_id = get_class_id_or_none(expense_group, lineitem)
+            class_id = get_class_id_or_none(expense_group, lineitem, mapping_resolver)
             if not class_id and expense_group.fund_source == 'CCC' and general_mappings.use_employee_class:
-                employee_mapping = EmployeeMapping.objects.filter(
-                    source_employee__value=expense_group.description.get('employee_email'),
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
                 if employee_mapping and employee_mapping.destination_employee:
                     class_id = employee_mapping.destination_employee.detail.get('class_id')
 
             if not class_id and general_mappings.class_id and general_mappings.class_level in ['TRANSACTION_LINE', 'ALL']:
                 class_id = general_mappings.class_id
 
-            department_id = get_department_id_or_none(expense_group, lineitem)
+            department_id = get_department_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not department_id and expense_group.fund_source == 'CCC' and general_mappings.use_employee_department and \
                 general_mappings.department_level in ('ALL', 'TRANSACTION_LINE'):
-                employee_mapping = EmployeeMapping.objects.filter(
-                    source_employee__value=expense_group.description.get('employee_email'),
-                    workspace_id=expense_group.workspace_id
-                ).first()
+                employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
                 if employee_mapping and employee_mapping.destination_employee:
                     if employee_mapping.destination_employee.detail.get('department_id'):
                         department_id = employee_mapping.destination_employee.detail.get('department_id')
@@ -773,14 +1095,11 @@ class CreditCardChargeLineItem(models.Model):
                 if general_mappings.department_id and general_mappings.department_level in ['TRANSACTION_LINE', 'ALL']:
                     department_id = general_mappings.department_id
 
-            location_id = get_location_id_or_none(expense_group, lineitem)
+            location_id = get_location_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not location_id and expense_group.fund_source == 'CCC' and general_mappings.use_employee_location and\
                         general_mappings.location_level in ('ALL', 'TRANSACTION_LINE'):
-                    employee_mapping = EmployeeMapping.objects.filter(
-                        source_employee__value=expense_group.description.get('employee_email'),
-                        workspace_id=expense_group.workspace_id
-                    ).first()
+                    employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
                     if employee_mapping and employee_mapping.destination_employee:
                         location_id = employee_mapping.destination_employee.detail.get('location_id')
 
@@ -788,9 +1107,9 @@ class CreditCardChargeLineItem(models.Model):
                 if general_mappings.location_id and general_mappings.location_level in ['TRANSACTION_LINE', 'ALL']:
                     location_id = general_mappings.location_id
 
-            custom_segments = get_custom_segments(expense_group, lineitem)
+            custom_segments = get_custom_segments(expense_group, lineitem, mapping_resolver)
 
-            customer_id = get_customer_id_or_none(expense_group, lineitem)
+            customer_id = get_customer_id_or_none(expense_group, lineitem, mapping_resolver)
 
             billable = lineitem.billable
             if customer_id:
@@ -810,7 +1129,7 @@ class CreditCardChargeLineItem(models.Model):
                     'department_id': department_id,
                     'customer_id': customer_id,
                     'amount': lineitem.amount,
-                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings,lineitem),
+                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings, lineitem, mapping_resolver),
                     'tax_amount': lineitem.tax_amount,
                     'billable': billable,
                     'memo': get_expense_purpose(lineitem, category, configuration),
@@ -953,14 +1272,20 @@ class ExpenseReportLineItem(models.Model):
         db_table = 'expense_report_lineitems'
 
     @staticmethod
-    def create_expense_report_lineitems(expense_group: ExpenseGroup, configuration: Configuration):
+    def create_expense_report_lineitems(
+        expense_group: ExpenseGroup, configuration: Configuration, mapping_resolver: MappingResolver = None
+    ):
         """
         Create expense report lineitems
         :param expense_group: expense group
         :param configuration: Workspace Configuration Settings
+        :param mapping_resolver: Mapping resolver, built for the expense group if not passed
         :return: lineitems objects
         """
         expenses = expense_group.expenses.all()
+        mapping_resolver = mapping_resolver or MappingResolver(
+            expense_group.workspace_id, expenses, expense_group.description
+        )
         expense_report = ExpenseReport.objects.get(expense_group=expense_group)
         general_mappings = GeneralMapping.objects.get(workspace_id=expense_group.workspace_id)
 
@@ -974,22 +1299,16 @@ class ExpenseReportLineItem(models.Model):
             category = lineitem.category if (lineitem.category == lineitem.sub_category or lineitem.sub_category == None) else '{0} / {1}'.format(
                 lineitem.category, lineitem.sub_category)
 
-            account = CategoryMapping.objects.filter(
-                source_category__value=category,
-                workspace_id=expense_group.workspace_id
-            ).first()
+            account = mapping_resolver.get_category_mapping(category)
 
-            entity = EmployeeMapping.objects.get(
-                source_employee__value=description.get('employee_email'),
-                workspace_id=expense_group.workspace_id
-            )
+            entity = mapping_resolver.get_employee_mapping(description.get('employee_email'))
+            if not entity:
+                raise EmployeeMapping.DoesNotExist('EmployeeMapping matching query does not exist.')
 
-            currency = DestinationAttribute.objects.filter(value=lineitem.currency,
-                                                           workspace_id=expense_group.workspace_id,
-                                                           attribute_type='CURRENCY').first()
+            currency = mapping_resolver.get_currency(lineitem.currency)
 
-            class_id = get_class_id_or_none(expense_group, lineitem)
-            department_id = get_department_id_or_none(expense_group, lineitem)
+            class_id = get_class_id_or_none(expense_group, lineitem, mapping_resolver)
+            department_id = get_department_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not class_id and general_mappings.use_employee_class and employee_field_mapping == 'EMPLOYEE':
                 class_id = entity.destination_employee.detail.get('class_id')
@@ -1007,7 +1326,7 @@ class ExpenseReportLineItem(models.Model):
                 if general_mappings.department_id and general_mappings.department_level in ['TRANSACTION_LINE', 'ALL']:
                     department_id = general_mappings.department_id
 
-            location_id = get_location_id_or_none(expense_group, lineitem)
+            location_id = get_location_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not location_id and general_mappings.use_employee_location and \
                 general_mappings.location_level in ('ALL', 'TRANSACTION_LINE') and \
@@ -1018,8 +1337,8 @@ class ExpenseReportLineItem(models.Model):
                 if general_mappings.location_id and general_mappings.location_level in ['TRANSACTION_LINE', 'ALL']:
                     location_id = general_mappings.location_id
 
-            customer_id = get_customer_id_or_none(expense_group, lineitem)
-            custom_segments = get_custom_segments(expense_group, lineitem)
+            customer_id = get_customer_id_or_none(expense_group, lineitem, mapping_resolver)
+            custom_segments = get_custom_segments(expense_group, lineitem, mapping_resolver)
 
             billable = lineitem.billable
             if customer_id:
@@ -1040,7 +1359,7 @@ class ExpenseReportLineItem(models.Model):
                     'location_id': location_id,
                     'department_id': department_id,
                     'currency': currency.destination_id if currency else '1',
-                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings,lineitem),
+                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings, lineitem, mapping_resolver),
                     'tax_amount': lineitem.tax_amount,
                     'transaction_date': get_transaction_date(expense_group),
                     'memo': get_expense_purpose(lineitem, category, configuration),
@@ -1155,14 +1474,20 @@ class JournalEntryLineItem(models.Model):
         db_table = 'journal_entry_lineitems'
 
     @staticmethod
-    def create_journal_entry_lineitems(expense_group: ExpenseGroup, configuration: Configuration):
+    def create_journal_entry_lineitems(
+        expense_group: ExpenseGroup, configuration: Configuration, mapping_resolver: MappingResolver = None
+    ):
         """
         Create Journal Entry Lineitems
         :param expense_group: expense group
         :param configuration: Workspace Configuration Settings
+        :param mapping_resolver: Mapping resolver, built for the expense group if not passed
         :return: lineitem objects
         """
         expenses = expense_group.expenses.all()
+        mapping_resolver = mapping_resolver or MappingResolver(
+            expense_group.workspace_id, expenses, expense_group.description
+        )
         journal_entry = JournalEntry.objects.get(expense_group=expense_group)
 
         general_mappings = GeneralMapping.objects.get(workspace_id=expense_group.workspace_id)
@@ -1181,10 +1506,7 @@ class JournalEntryLineItem(models.Model):
                 lineitem.category, lineitem.sub_category)
 
             entity_id = None
-            employee_mapping = EmployeeMapping.objects.filter(
-                source_employee__value=expense_group.description.get('employee_email'),
-                workspace_id=expense_group.workspace_id
-            ).first()
+            employee_mapping = mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
 
             if expense_group.fund_source == 'PERSONAL':
                 entity_id = employee_mapping.destination_employee.destination_id if employee_field_mapping == 'EMPLOYEE' \
@@ -1205,16 +1527,13 @@ class JournalEntryLineItem(models.Model):
                 else:
                     entity_id = employee_mapping.destination_employee.destination_id if employee_field_mapping == 'EMPLOYEE' \
                     else employee_mapping.destination_vendor.destination_id
-                debit_account_id = get_ccc_account_id(configuration, general_mappings, lineitem, description)
+                debit_account_id = get_ccc_account_id(configuration, general_mappings, lineitem, description, mapping_resolver)
 
-            account = CategoryMapping.objects.filter(
-                source_category__value=category,
-                workspace_id=expense_group.workspace_id
-            ).first()
+            account = mapping_resolver.get_category_mapping(category)
 
-            class_id = get_class_id_or_none(expense_group, lineitem)
-            department_id = get_department_id_or_none(expense_group, lineitem)
-            location_id = get_location_id_or_none(expense_group, lineitem)
+            class_id = get_class_id_or_none(expense_group, lineitem, mapping_resolver)
+            department_id = get_department_id_or_none(expense_group, lineitem, mapping_resolver)
+            location_id = get_location_id_or_none(expense_group, lineitem, mapping_resolver)
 
             if not class_id and general_mappings.use_employee_class and employee_field_mapping == 'EMPLOYEE' and employee_mapping and employee_mapping.destination_employee:
                 class_id = employee_mapping.destination_employee.detail.get('class_id')
@@ -1238,7 +1557,7 @@ class JournalEntryLineItem(models.Model):
             if not location_id and general_mappings.location_id:
                 location_id = general_mappings.location_id
 
-            custom_segments = get_custom_segments(expense_group, lineitem)
+            custom_segments = get_custom_segments(expense_group, lineitem, mapping_resolver)
 
             journal_entry_lineitem_object, _ = JournalEntryLineItem.objects.update_or_create(
                 journal_entry=journal_entry,
@@ -1252,7 +1571,7 @@ class JournalEntryLineItem(models.Model):
                     'class_id': class_id if class_id else None,
                     'entity_id': entity_id,
                     'amount': lineitem.amount,
-                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings,lineitem),
+                    'tax_item_id': get_tax_item_id_or_none(expense_group, general_mappings, lineitem, mapping_resolver),
                     'tax_amount': lineitem.tax_amount,
                     'memo': get_expense_purpose(lineitem, category, configuration),
                     'netsuite_custom_segments': custom_segments
@@ -1,9 +1,9 @@
 import logging
 from typing import List
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
+from django.conf import settings
 from django.db.models import Q
-from django_q.tasks import Chain
 
 from fyle_accounting_library.fyle_platform.enums import ExpenseImportSourceEnum
 from fyle_accounting_library.rabbitmq.data_class import Task
@@ -36,13 +36,47 @@ def __create_chain_and_run(workspace_id: int, chain_tasks: List[dict]) -> None:
 
 
 
-def validate_failing_export(is_auto_export: bool, interval_hours: int, error: Error, expense_group: ExpenseGroup):
+def __batch_chain_tasks(workspace_id: int, chain_tasks: List[Task], export_type: str) -> List[Task]:
+    """
+    Combine per expense group export tasks into batched export tasks for workspaces exporting in batches
+    :param workspace_id: workspace id
+    :param chain_tasks: List of chain tasks, one per expense group
+    :param export_type: Task log type of the exports
+    :return: List of chain tasks
+    """
+    if not FeatureConfig.get_feature_config(workspace_id=workspace_id, key='export_in_batches'):
+        return chain_tasks
+
+    batch_size = settings.NETSUITE_EXPORT_BATCH_SIZE
+    batched_chain_tasks = []
+
+    for index in range(0, len(chain_tasks), batch_size):
+        batch = chain_tasks[index:index + batch_size]
+        batched_chain_tasks.append(Task(
+            target='apps.netsuite.tasks.create_exports_in_batch',
+            args=[
+                export_type,
+                [task.args[0] for task in batch],
+                [task.args[1] for task in batch],
+                any(task.args[2] for task in batch),
+                batch[0].args[3]
+            ]
+        ))
+
+    return batched_chain_tasks
+
+
+def validate_failing_export(is_auto_export: bool, interval_hours: int, error: Error, expense_group: ExpenseGroup, mapping_error_expense_group_ids: set = None):
     """
     Validate failing export
     :param is_auto_export: Is auto export
     :param interval_hours: Interval hours
     :param error: Error
+    :param mapping_error_expense_group_ids: Preloaded ids of expense groups with unresolved mapping errors
     """
+    if mapping_error_expense_group_ids is not None:
+        return expense_group.id in mapping_error_expense_group_ids
+
     mapping_error = Error.objects.filter(
         workspace_id=expense_group.workspace_id,
         mapping_error_expense_group_ids__contains=[expense_group.id],
@@ -72,63 +106,175 @@ def handle_skipped_exports(expense_groups: List[ExpenseGroup], index: int, skip_
     return skip_export_count
 
 
-def schedule_bills_creation(workspace_id: int, expense_group_ids: List[str], is_auto_export: bool, fund_source: str, interval_hours: int, triggered_by: ExpenseImportSourceEnum):
+def __get_task_logs(workspace_id: int, expense_group_ids: List[int]) -> dict:
     """
-    Schedule bills creation
+    Get task logs of the expense groups
+    :param workspace_id: workspace id
     :param expense_group_ids: List of expense group ids
+    :return: task logs by expense group id
+    """
+    task_logs = TaskLog.objects.filter(workspace_id=workspace_id, expense_group_id__in=expense_group_ids)
+    return {task_log.expense_group_id: task_log for task_log in task_logs}
+
+
+def __get_first_expense_amounts(expense_group_ids: List[int]) -> dict:
+    """
+    Get the amount of the first expense of the expense groups
+    :param expense_group_ids: List of expense group ids
+    :return: amounts by expense group id
+    """
+    first_expense_amounts = {}
+    expense_group_expenses = ExpenseGroup.expenses.through.objects.filter(
+        expensegroup_id__in=expense_group_ids
+    ).order_by('expense_id').values_list('expensegroup_id', 'expense__amount')
+
+    for expense_group_id, amount in expense_group_expenses:
+        first_expense_amounts.setdefault(expense_group_id, amount)
+
+    return first_expense_amounts
+
+
+def __schedule_exports(
+    workspace_id: int,
+    expense_group_ids: List[str],
+    is_auto_export: bool,
+    interval_hours: int,
+    triggered_by: ExpenseImportSourceEnum,
+    expense_group_filters: dict,
+    task_log_type: str,
+    target: str,
+    refund_task_log_type: str = None,
+    export_in_batches: bool = True
+):
+    """
+    Enqueue task logs and run the export chain of the expense groups
+    Errors, mapping errors, task logs and first expense amounts are loaded once for all expense groups,
+    and task logs are created and updated in bulk
     :param workspace_id: workspace id
+    :param expense_group_ids: List of expense group ids
+    :param is_auto_export: Is auto export
+    :param interval_hours: Interval hours
+    :param triggered_by: Triggered by
+    :param expense_group_filters: Filters excluding already exported expense groups
+    :param task_log_type: Task log type of the exports
+    :param target: Export task
+    :param refund_task_log_type: Task log type of expense groups with a negative first expense
+    :param export_in_batches: Whether the exports can be batched
     :return: None
     """
-    if expense_group_ids:
-        logger.info('Preparing to queue expense groups %s of fund source %s for Bill', expense_group_ids, fund_source)
-        expense_groups = ExpenseGroup.objects.filter(
-            Q(tasklog__id__isnull=True) | ~Q(tasklog__status__in=['IN_PROGRESS', 'COMPLETE']),
-            workspace_id=workspace_id, id__in=expense_group_ids, bill__id__isnull=True, exported_at__isnull=True
-        ).all()
-
-        if not expense_groups:
-            return
-
-        errors = Error.objects.filter(workspace_id=workspace_id, is_resolved=False, expense_group_id__in=expense_group_ids).all()
-
-        chain_tasks = []
-        skip_export_count = 0
-
-        for index, expense_group in enumerate(expense_groups):
-            
-            error = errors.filter(workspace_id=workspace_id, expense_group=expense_group, is_resolved=False).first()
-            skip_export = validate_failing_export(is_auto_export, interval_hours, error, expense_group)
-            if skip_export:
-                skip_export_count = handle_skipped_exports(
-                    expense_groups=expense_groups, index=index, skip_export_count=skip_export_count,
-                    error=error, expense_group=expense_group, triggered_by=triggered_by
-                )
-                continue
-
-            task_log, _ = TaskLog.objects.get_or_create(
-                workspace_id=expense_group.workspace_id,
-                expense_group=expense_group,
-                defaults={
-                    'status': 'ENQUEUED',
-                    'type': 'CREATING_BILL',
-                    'triggered_by': triggered_by
-                }
+    expense_groups = ExpenseGroup.objects.filter(
+        Q(tasklog__id__isnull=True) | ~Q(tasklog__status__in=['IN_PROGRESS', 'COMPLETE']),
+        workspace_id=workspace_id, id__in=expense_group_ids, exported_at__isnull=True, **expense_group_filters
+    ).all()
+
+    if not expense_groups:
+        return
+
+    scheduled_expense_group_ids = [expense_group.id for expense_group in expense_groups]
+
+    errors = {}
+    for error in Error.objects.filter(
+        workspace_id=workspace_id, is_resolved=False, expense_group_id__in=expense_group_ids
+    ).order_by('id'):
+        errors.setdefault(error.expense_group_id, error)
+
+    mapping_error_expense_group_ids = set()
+    for group_ids in Error.objects.filter(
+        workspace_id=workspace_id, is_resolved=False, mapping_error_expense_group_ids__overlap=scheduled_expense_group_ids
+    ).values_list('mapping_error_expense_group_ids', flat=True):
+        mapping_error_expense_group_ids.update(group_ids)
+
+    first_expense_amounts = __get_first_expense_amounts(scheduled_expense_group_ids) if refund_task_log_type else {}
+
+    def get_task_log_type(expense_group: ExpenseGroup) -> str:
+        amount = first_expense_amounts.get(expense_group.id)
+        if refund_task_log_type and amount is not None and amount < 0:
+            return refund_task_log_type
+        return task_log_type
+
+    exportable_expense_groups = []
+    skip_export_count = 0
+
+    for index, expense_group in enumerate(expense_groups):
+        error = errors.get(expense_group.id)
+        skip_export = validate_failing_export(
+            is_auto_export, interval_hours, error, expense_group, mapping_error_expense_group_ids
+        )
+        if skip_export:
+            skip_export_count = handle_skipped_exports(
+                expense_groups=expense_groups, index=index, skip_export_count=skip_export_count,
+                error=error, expense_group=expense_group, triggered_by=triggered_by
             )
+            continue
+
+        exportable_expense_groups.append((index, expense_group))
+
+    if not exportable_expense_groups:
+        return
+
+    exportable_expense_group_ids = [expense_group.id for _, expense_group in exportable_expense_groups]
+    task_logs = __get_task_logs(workspace_id, exportable_expense_group_ids)
+
+    new_task_logs = [
+        TaskLog(
+            workspace_id=expense_group.workspace_id,
+            expense_group=expense_group,
+            status='ENQUEUED',
+            type=get_task_log_type(expense_group),
+            triggered_by=triggered_by
+        )
+        for _, expense_group in exportable_expense_groups if expense_group.id not in task_logs
+    ]
+
+    if new_task_logs:
+        # Task logs created concurrently for the same expense groups are picked up by the reload below
+        TaskLog.objects.bulk_create(new_task_logs, ignore_conflicts=True)
+        task_logs = __get_task_logs(workspace_id, exportable_expense_group_ids)
+
+    updated_task_logs = []
+    chain_tasks = []
+    total_count = len(expense_groups)
+
+    for index, expense_group in exportable_expense_groups:
+        task_log = task_logs[expense_group.id]
 
-            if task_log.status not in ['IN_PROGRESS', 'ENQUEUED', 'COMPLETE']:
-                task_log.type = 'CREATING_BILL'
-                task_log.status = 'ENQUEUED'
-                if triggered_by and task_log.triggered_by != triggered_by:
-                    task_log.triggered_by = triggered_by
-                task_log.save()
+        if task_log.status not in ['IN_PROGRESS', 'ENQUEUED', 'COMPLETE']:
+            task_log.type = get_task_log_type(expense_group)
+            task_log.status = 'ENQUEUED'
+            if triggered_by and task_log.triggered_by != triggered_by:
+                task_log.triggered_by = triggered_by
+            task_log.updated_at = datetime.now(tz=timezone.utc)
+            updated_task_logs.append(task_log)
 
-            chain_tasks.append(Task(
-                target='apps.netsuite.tasks.create_bill',
-                args=[expense_group.id, task_log.id, (expense_groups.count() == index + 1), is_auto_export]
-            ))
+        chain_tasks.append(Task(
+            target=target,
+            args=[expense_group.id, task_log.id, (total_count == index + 1), is_auto_export]
+        ))
 
-        if len(chain_tasks) > 0:
-            __create_chain_and_run(workspace_id, chain_tasks)
+    if updated_task_logs:
+        TaskLog.objects.bulk_update(updated_task_logs, ['type', 'status', 'triggered_by', 'updated_at'], batch_size=1000)
+
+    if export_in_batches:
+        chain_tasks = __batch_chain_tasks(workspace_id, chain_tasks, task_log_type)
+
+    __create_chain_and_run(workspace_id, chain_tasks)
+
+
+def schedule_bills_creation(workspace_id: int, expense_group_ids: List[str], is_auto_export: bool, fund_source: str, interval_hours: int, triggered_by: ExpenseImportSourceEnum):
+    """
+    Schedule bills creation
+    :param expense_group_ids: List of expense group ids
+    :param workspace_id: workspace id
+    :return: None
+    """
+    if expense_group_ids:
+        logger.info('Preparing to queue expense groups %s of fund source %s for Bill', expense_group_ids, fund_source)
+        __schedule_exports(
+            workspace_id, expense_group_ids, is_auto_export, interval_hours, triggered_by,
+            expense_group_filters={'bill__id__isnull': True},
+            task_log_type='CREATING_BILL',
+            target='apps.netsuite.tasks.create_bill'
+        )
 
 
 def schedule_credit_card_charge_creation(workspace_id: int, expense_group_ids: List[str], is_auto_export: bool, fund_source: str, interval_hours: int, triggered_by: ExpenseImportSourceEnum):
@@ -140,60 +286,14 @@ def schedule_credit_card_charge_creation(workspace_id: int, expense_group_ids: L
     """
     if expense_group_ids:
         logger.info('Preparing to queue expense groups %s of fund source %s for Credit Card Charge', expense_group_ids, fund_source)
-        expense_groups = ExpenseGroup.objects.filter(
-            Q(tasklog__id__isnull=True) | ~Q(tasklog__status__in=['IN_PROGRESS', 'COMPLETE']),
-            workspace_id=workspace_id, id__in=expense_group_ids,
-            creditcardcharge__id__isnull=True, exported_at__isnull=True
-        ).all()
-
-        if not expense_groups:
-            return
-
-        errors = Error.objects.filter(workspace_id=workspace_id, is_resolved=False, expense_group_id__in=expense_group_ids).all()
-
-        chain_tasks = []
-        skip_export_count = 0
-
-        for index, expense_group in enumerate(expense_groups):
-            
-            error = errors.filter(workspace_id=workspace_id, expense_group=expense_group, is_resolved=False).first()
-            skip_export = validate_failing_export(is_auto_export, interval_hours, error, expense_group)
-            if skip_export:
-                skip_export_count = handle_skipped_exports(
-                    expense_groups=expense_groups, index=index, skip_export_count=skip_export_count,
-                    error=error, expense_group=expense_group, triggered_by=triggered_by
-                )
-                continue
-
-            expense_amount = expense_group.expenses.first().amount
-            export_type = 'CREATING_CREDIT_CARD_CHARGE'
-            if expense_amount < 0:
-                export_type = 'CREATING_CREDIT_CARD_REFUND'
-
-            task_log, _ = TaskLog.objects.get_or_create(
-                workspace_id=expense_group.workspace_id,
-                expense_group=expense_group,
-                defaults={
-                    'status': 'ENQUEUED',
-                    'type': export_type,
-                    'triggered_by': triggered_by
-                }
-            )
-
-            if task_log.status not in ['IN_PROGRESS', 'ENQUEUED', 'COMPLETE']:
-                task_log.type = export_type
-                task_log.status = 'ENQUEUED'
-                if triggered_by and task_log.triggered_by != triggered_by:
-                    task_log.triggered_by = triggered_by
-                task_log.save()
-            
-            chain_tasks.append(Task(
-                target='apps.netsuite.tasks.create_credit_card_charge',
-                args=[expense_group.id, task_log.id, (expense_groups.count() == index + 1), is_auto_export]
-            ))
-
-        if len(chain_tasks) > 0:
-            __create_chain_and_run(workspace_id, chain_tasks)
+        __schedule_exports(
+            workspace_id, expense_group_ids, is_auto_export, interval_hours, triggered_by,
+            expense_group_filters={'creditcardcharge__id__isnull': True},
+            task_log_type='CREATING_CREDIT_CARD_CHARGE',
+            target='apps.netsuite.tasks.create_credit_card_charge',
+            refund_task_log_type='CREATING_CREDIT_CARD_REFUND',
+            export_in_batches=False
+        )
 
 
 def schedule_expense_reports_creation(workspace_id: int, expense_group_ids: List[str], is_auto_export: bool, fund_source: str, interval_hours: int, triggered_by: ExpenseImportSourceEnum):
@@ -205,55 +305,12 @@ def schedule_expense_reports_creation(workspace_id: int, expense_group_ids: List
     """
     if expense_group_ids:
         logger.info('Preparing to queue expense groups %s of fund source %s for Expense Report', expense_group_ids, fund_source)
-        expense_groups = ExpenseGroup.objects.filter(
-            Q(tasklog__id__isnull=True) | ~Q(tasklog__status__in=['IN_PROGRESS', 'COMPLETE']),
-            workspace_id=workspace_id, id__in=expense_group_ids,
-            expensereport__id__isnull=True, exported_at__isnull=True
-        ).all()
-
-        if not expense_groups:
-            return
-
-        errors = Error.objects.filter(workspace_id=workspace_id, is_resolved=False, expense_group_id__in=expense_group_ids).all()
-
-        chain_tasks = []
-        skip_export_count = 0
-
-        for index, expense_group in enumerate(expense_groups):
-
-            error = errors.filter(workspace_id=workspace_id, expense_group=expense_group, is_resolved=False).first()
-            skip_export = validate_failing_export(is_auto_export, interval_hours, error, expense_group)
-            if skip_export:
-                skip_export_count = handle_skipped_exports(
-                    expense_groups=expense_groups, index=index, skip_export_count=skip_export_count,
-                    error=error, expense_group=expense_group, triggered_by=triggered_by
-                )
-                continue
-
-            task_log, _ = TaskLog.objects.get_or_create(
-                workspace_id=expense_group.workspace_id,
-                expense_group=expense_group,
-                defaults={
-                    'status': 'ENQUEUED',
-                    'type': 'CREATING_EXPENSE_REPORT',
-                    'triggered_by': triggered_by
-                }
-            )
-
-            if task_log.status not in ['IN_PROGRESS', 'ENQUEUED', 'COMPLETE']:
-                task_log.type = 'CREATING_EXPENSE_REPORT'
-                task_log.status = 'ENQUEUED'
-                if triggered_by and task_log.triggered_by != triggered_by:
-                    task_log.triggered_by = triggered_by
-                task_log.save()
-            
-            chain_tasks.append(Task(
-                target='apps.netsuite.tasks.create_expense_report',
-                args=[expense_group.id, task_log.id, (expense_groups.count() == index + 1), is_auto_export]
-            ))
-
-        if len(chain_tasks) > 0:
-            __create_chain_and_run(workspace_id, chain_tasks)
+        __schedule_exports(
+            workspace_id, expense_group_ids, is_auto_export, interval_hours, triggered_by,
+            expense_group_filters={'expensereport__id__isnull': True},
+            task_log_type='CREATING_EXPENSE_REPORT',
+            target='apps.netsuite.tasks.create_expense_report'
+        )
 
 
 def schedule_journal_entry_creation(workspace_id: int, expense_group_ids: List[str], is_auto_export: bool, fund_source: str, interval_hours: int, triggered_by: ExpenseImportSourceEnum):
@@ -265,51 +322,9 @@ def schedule_journal_entry_creation(workspace_id: int, expense_group_ids: List[s
     """
     if expense_group_ids:
         logger.info('Preparing to queue expense groups %s of fund source %s Journal Entry', expense_group_ids, fund_source)
-        expense_groups = ExpenseGroup.objects.filter(
-            Q(tasklog__id__isnull=True) | ~Q(tasklog__status__in=['IN_PROGRESS', 'COMPLETE']),
-            workspace_id=workspace_id, id__in=expense_group_ids, journalentry__id__isnull=True, exported_at__isnull=True
-        ).all()
-
-        if not expense_groups:
-            return
-
-        errors = Error.objects.filter(workspace_id=workspace_id, is_resolved=False, expense_group_id__in=expense_group_ids).all()
-
-        chain_tasks = []
-        skip_export_count = 0
-
-        for index, expense_group in enumerate(expense_groups):
-
-            error = errors.filter(workspace_id=workspace_id, expense_group=expense_group, is_resolved=False).first()
-            skip_export = validate_failing_export(is_auto_export, interval_hours, error, expense_group)
-            if skip_export:
-                skip_export_count = handle_skipped_exports(
-                    expense_groups=expense_groups, index=index, skip_export_count=skip_export_count,
-                    error=error, expense_group=expense_group, triggered_by=triggered_by
-                )
-                continue
-            
-            task_log, _ = TaskLog.objects.get_or_create(
-                workspace_id=expense_group.workspace_id,
-                expense_group=expense_group,
-                defaults={
-                    'status': 'ENQUEUED',
-                    'type': 'CREATING_JOURNAL_ENTRY',
-                    'triggered_by': triggered_by
-                }
-            )
-
-            if task_log.status not in ['IN_PROGRESS', 'ENQUEUED', 'COMPLETE']:
-                task_log.type = 'CREATING_JOURNAL_ENTRY'
-                task_log.status = 'ENQUEUED'
-                if triggered_by and task_log.triggered_by != triggered_by:
-                    task_log.triggered_by = triggered_by
-                task_log.save()
-            
-            chain_tasks.append(Task(
-                target='apps.netsuite.tasks.create_journal_entry',
-                args=[expense_group.id, task_log.id, (expense_groups.count() == index + 1), is_auto_export]
-            ))
-
-        if len(chain_tasks) > 0:
-            __create_chain_and_run(workspace_id, chain_tasks)
+        __schedule_exports(
+            workspace_id, expense_group_ids, is_auto_export, interval_hours, triggered_by,
+            expense_group_filters={'journalentry__id__isnull': True},
+            task_log_type='CREATING_JOURNAL_ENTRY',
+            target='apps.netsuite.tasks.create_journal_entry'
+        )
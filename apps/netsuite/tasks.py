@@ -1,13 +1,15 @@
 import logging
 import traceback
 import itertools
-from typing import List
-import base64
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from dateutil.relativedelta import relativedelta
 from django.utils import timezone as django_timezone
 
 from django.db import transaction
+from django.db.models import Count, Q
+from django.contrib.postgres.aggregates import BoolAnd
+from django.conf import settings
 
 from django.utils.module_loading import import_string
 from apps.fyle.helpers import get_filter_credit_expenses
@@ -30,10 +32,10 @@ from fyle_netsuite_api.exceptions import BulkError
 from apps.fyle.models import ExpenseGroup, Expense, ExpenseGroupSettings
 from apps.mappings.models import GeneralMapping, SubsidiaryMapping
 from apps.tasks.models import TaskLog, Error
-from apps.workspaces.models import NetSuiteCredentials, FyleCredential, Configuration, Workspace
+from apps.workspaces.models import NetSuiteCredentials, FyleCredential, Configuration, Workspace, FeatureConfig
 
 from .models import Bill, BillLineitem, ExpenseReport, ExpenseReportLineItem, JournalEntry, JournalEntryLineItem, \
-    VendorPayment, VendorPaymentLineitem, CreditCardCharge, CreditCardChargeLineItem
+    VendorPayment, VendorPaymentLineitem, CreditCardCharge, CreditCardChargeLineItem, NetSuiteDimensionSyncState
 from apps.fyle.actions import update_expenses_in_progress, update_complete_expenses, post_accounting_export_summary
 from .connector import NetSuiteConnector
 from apps.netsuite.actions import update_last_export_details
@@ -44,6 +46,12 @@ logger.level = logging.INFO
 netsuite_paid_state = 'Paid In Full'
 netsuite_error_message = 'NetSuite System Error'
 
+# Sync states holding the watermark of the paid status polls
+STATUS_SYNC_DIMENSIONS = {
+    'vendorBill': 'vendor_bill_status',
+    'expenseReport': 'expense_report_status'
+}
+
 TASK_TYPE_CONSTRUCT_LINE_FUNC_MAP = {
     'CREATING_EXPENSE_REPORT': 'construct_expense_report_lineitems',
     'CREATING_BILL': 'construct_bill_lineitems',
@@ -90,69 +98,85 @@ def update_expense_and_post_summary(in_progress_expenses: List[Expense], workspa
     post_accounting_export_summary(workspace_id=workspace_id, expense_ids=[expense.id for expense in in_progress_expenses], fund_source=fund_source)
 
 
-def load_attachments(netsuite_connection: NetSuiteConnector, expense: Expense, expense_group: ExpenseGroup, task_log: TaskLog):
+def get_expense_attachments(platform: PlatformConnector, expenses: List[Expense]) -> Dict[str, Dict]:
     """
-    Get attachments from Fyle
+    Get attachments of the expenses from Fyle, FYLE_FILE_URLS_BATCH_SIZE file urls per call.
+    Only signed download urls are generated, files are downloaded by the upload workers
+    :param platform: Platform connector
+    :param expenses: Fyle expenses
+    :return: attachment by expense id
+    """
+    expense_ids_by_file_id = {}
+    for expense in expenses:
+        for file_id in expense.file_ids or []:
+            # Split expenses share the receipt of the expense they were split from
+            expense_ids_by_file_id.setdefault(file_id, []).append(expense.expense_id)
+
+    file_ids = list(expense_ids_by_file_id)
+    batch_size = settings.FYLE_FILE_URLS_BATCH_SIZE
+
+    expense_attachments = {}
+    for index in range(0, len(file_ids), batch_size):
+        # platform.files.bulk_generate_file_urls downloads every file, so the urls are generated with the connection
+        attachments = platform.files.connection.bulk_generate_file_urls(
+            payload={'data': [{'id': file_id} for file_id in file_ids[index:index + batch_size]]}
+        )['data']
+
+        for attachment in attachments:
+            # Filter HTML attachments and grab the 1st attachment since we can upload only 1 attachment per expense
+            if attachment['content_type'] == 'text/html':
+                continue
+
+            for expense_id in expense_ids_by_file_id.get(attachment['id'], []):
+                expense_attachments.setdefault(expense_id, attachment)
+
+    return expense_attachments
+
+
+def load_expense_attachments(netsuite_connection: NetSuiteConnector, expenses: List[Expense], expense_group: ExpenseGroup, task_log: TaskLog) -> Dict[str, str]:
+    """
+    Get attachments of the expenses from Fyle and upload them to NetSuite
     :param netsuite_connection: NetSuite Connection
-    :param expense: Fyle expense
+    :param expenses: Fyle expenses
     :param expense_group: Integration Expense group
     :param task_log: TaskLog instance
+    :return: receipt url by expense id
     """
     workspace_id = expense_group.workspace_id
     workspace = expense_group.workspace
 
     try:
         fyle_credentials = FyleCredential.objects.get(workspace_id=workspace_id)
-        file_ids = expense.file_ids
         platform = PlatformConnector(fyle_credentials)
 
-        files_list = []
-        attachments = []
-        receipt_url = None
+        expenses = [expense for expense in expenses if expense.file_ids]
+        if not expenses:
+            return {}
 
-        if file_ids and len(file_ids):
-            logger.info('Creating attachment folder for workspace %s', workspace.id)
-            folder = netsuite_connection.connection.folders.post({
-                "externalId": workspace.fyle_org_id,
-                "name": 'Fyle Attachments - {0}'.format(workspace.name)
-            })
-            logger.info('Attachment folder created successfully for workspace %s', workspace.id)
-
-            for file_id in file_ids:
-                files_list.append({'id': file_id})
-
-            logger.info('Generating file urls for workspace %s', workspace.id)
-            attachments = platform.files.bulk_generate_file_urls(files_list)
-            logger.info('File urls generated successfully for workspace %s', workspace.id)
-
-            # Filter HTML attachments
-            attachments = list(filter(lambda attachment: attachment['content_type'] != 'text/html', attachments))
-
-            if attachments:
-                for attachment in attachments:
-                    attachment_name = '{0}_{1}'.format(attachment['id'], attachment['name'])
-                    logger.info('Uploading attachment %s for workspace %s', attachment_name, workspace.id)
-
-                    netsuite_connection.connection.files.post({
-                        "externalId": expense.expense_id,
-                        "name": attachment_name,
-                        'content': base64.b64decode(attachment['download_url']),
-                        "folder": {
-                            "name": None,
-                            "internalId": folder['internalId'],
-                            "externalId": folder['externalId'],
-                            "type": "folder"
-                        }
-                    })
-                    logger.info('Attachment %s uploaded successfully for workspace %s', attachment_name, workspace.id)
-                    break
+        logger.info('Creating attachment folder for workspace %s', workspace.id)
+        folder = netsuite_connection.connection.folders.post({
+            "externalId": workspace.fyle_org_id,
+            "name": 'Fyle Attachments - {0}'.format(workspace.name)
+        })
+        logger.info('Attachment folder created successfully for workspace %s', workspace.id)
 
-                logger.info('Getting file url for expense %s', expense.expense_id)
-                file = netsuite_connection.connection.files.get(externalId=expense.expense_id)
-                receipt_url = file['url']
-                logger.info('File url fetched successfully for expense %s', expense.expense_id)
+        logger.info('Generating file urls for workspace %s', workspace.id)
+        attachments = get_expense_attachments(platform, expenses)
+        logger.info('File urls generated successfully for workspace %s', workspace.id)
 
-        return receipt_url
+        receipt_urls = netsuite_connection.post_attachments(attachments, {
+            "name": None,
+            "internalId": folder['internalId'],
+            "externalId": folder['externalId'],
+            "type": "folder"
+        })
+        logger.info('Uploaded %s of %s attachments for workspace %s', len(receipt_urls), len(attachments), workspace.id)
+
+        if len(receipt_urls) < len(attachments):
+            task_log.is_attachment_upload_failed = True
+            task_log.save()
+
+        return receipt_urls
 
     except InvalidTokenError:
         logger.info('Invalid Fyle refresh token for workspace %s', workspace_id)
@@ -163,11 +187,24 @@ def load_attachments(netsuite_connection: NetSuiteConnector, expense: Expense, e
         error = traceback.format_exc()
         logger.info(
             'Attachment failed for expense group id %s / workspace id %s Error: %s',
-            expense.expense_id, workspace_id, {'error': error}
+            expense_group.id, workspace_id, {'error': error}
         )
         task_log.is_attachment_upload_failed = True
         task_log.save()
 
+    return {}
+
+
+def load_attachments(netsuite_connection: NetSuiteConnector, expense: Expense, expense_group: ExpenseGroup, task_log: TaskLog):
+    """
+    Get attachments from Fyle
+    :param netsuite_connection: NetSuite Connection
+    :param expense: Fyle expense
+    :param expense_group: Integration Expense group
+    :param task_log: TaskLog instance
+    """
+    return load_expense_attachments(netsuite_connection, [expense], expense_group, task_log).get(expense.expense_id)
+
 
 def get_or_create_credit_card_vendor(expense_group: ExpenseGroup, merchant: str, auto_create_merchants: bool):
     """
@@ -388,43 +425,19 @@ def upload_attachments_and_update_export(expense_ids: List[int], task_log_id: in
 
         platform = PlatformConnector(fyle_credentials=fyle_credentials)
 
-        expense_id_receipt_url_map = {}
         expenses = Expense.objects.filter(id__in=expense_ids, workspace_id=workspace_id).all()
+        attachments = get_expense_attachments(platform, expenses)
 
-        for expense in expenses:
-            if expense.file_ids and len(expense.file_ids):
-                files_list = []
-                attachments = []
-
-                file_ids = expense.file_ids
-
-                for file_id in file_ids:
-                    files_list.append({'id': file_id})
-
-                attachments = platform.files.bulk_generate_file_urls(files_list)
-
-                # Filter HTML attachments
-                attachments = list(filter(lambda attachment: attachment['content_type'] != 'text/html', attachments))
-
-                # Grabbing 1st attachment since we can upload only 1 attachment per expense
-                attachment =  attachments[0] if len(attachments) else None
-
-                if attachment:
-                    netsuite_connection.connection.files.post({
-                        'externalId': expense.expense_id,
-                        'name': '{0}_{1}'.format(attachment['id'], attachment['name']),
-                        'content': base64.b64decode(attachment['download_url']),
-                        'folder': {
-                            'name': None,
-                            'internalId': None,
-                            'externalId': workspace.fyle_org_id,
-                            'type': 'folder'
-                        }
-                    })
+        expense_id_receipt_url_map = netsuite_connection.post_attachments(attachments, {
+            'name': None,
+            'internalId': None,
+            'externalId': workspace.fyle_org_id,
+            'type': 'folder'
+        })
 
-                    file = netsuite_connection.connection.files.get(externalId=expense.expense_id)
-                    receipt_url = file['url']
-                    expense_id_receipt_url_map[expense.expense_id] = receipt_url
+        if len(expense_id_receipt_url_map) < len(attachments):
+            task_log.is_attachment_upload_failed = True
+            task_log.save()
 
         construct_payload_and_update_export(expense_id_receipt_url_map, task_log, workspace, fyle_credentials.cluster_domain, netsuite_connection)
 
@@ -469,6 +482,51 @@ def resolve_errors_for_exported_expense_group(expense_group, workspace_id=None):
         Error.objects.filter(workspace_id=expense_group.workspace_id, expense_group=expense_group, is_resolved=False).update(is_resolved=True, updated_at=datetime.now(timezone.utc))
 
 
+EXPORT_LINEITEM_MODELS = [
+    (Bill, BillLineitem, 'bill'),
+    (CreditCardCharge, CreditCardChargeLineItem, 'credit_card_charge'),
+    (ExpenseReport, ExpenseReportLineItem, 'expense_report'),
+    (JournalEntry, JournalEntryLineItem, 'journal_entry')
+]
+
+
+def __discard_unposted_export(export_object, lineitems: List) -> None:
+    """
+    Delete export objects that NetSuite did not accept, so that the expense group can be exported again
+
+    Export objects are committed before the NetSuite call so that no transaction is held open
+    during the request, which means a failed request has to clean them up explicitly
+    :param export_object: Bill, CreditCardCharge, ExpenseReport or JournalEntry
+    :param lineitems: Line items of the export
+    """
+    with transaction.atomic():
+        for lineitem in lineitems:
+            lineitem.delete()
+        export_object.delete()
+
+
+def discard_interrupted_exports(expense_group_ids: List[int]) -> None:
+    """
+    Delete export objects left behind by exports that were interrupted between creating
+    the export objects and saving the NetSuite response, called before an expense group's
+    export objects are rebuilt
+
+    Bills, expense reports and journal entries are upserted on their external id, so posting
+    them again on the next export updates the record instead of creating a duplicate
+    :param expense_group_ids: Expense group ids
+    """
+    with transaction.atomic():
+        for export_model, lineitem_model, export_field in EXPORT_LINEITEM_MODELS:
+            export_objects = export_model.objects.filter(
+                expense_group_id__in=expense_group_ids, expense_group__exported_at__isnull=True
+            )
+            lineitem_model.objects.filter(**{'{}__in'.format(export_field): export_objects}).delete()
+            deleted_count, _ = export_objects.delete()
+
+            if deleted_count:
+                logger.info('Discarded %s interrupted %s exports', deleted_count, export_model.__name__)
+
+
 @handle_netsuite_exceptions(payment=False)
 def create_bill(expense_group_id: int, task_log_id: int, last_export: bool, is_auto_export: bool):
     caller_info = get_caller_info()
@@ -522,13 +580,20 @@ def create_bill(expense_group_id: int, task_log_id: int, last_export: bool, is_a
     logger.info('Validated Expense Group %s successfully', expense_group.id)
 
     with transaction.atomic():
+        discard_interrupted_exports([expense_group.id])
         bill_object = Bill.create_bill(expense_group)
 
         bill_lineitems_objects = BillLineitem.create_bill_lineitems(expense_group, configuration)
 
+    try:
         created_bill = netsuite_connection.post_bill(bill_object, bill_lineitems_objects, general_mappings)
-        logger.info('Created Bill with Expense Group %s successfully', expense_group.id)
+    except Exception:
+        __discard_unposted_export(bill_object, bill_lineitems_objects)
+        raise
+
+    logger.info('Created Bill with Expense Group %s successfully', expense_group.id)
 
+    with transaction.atomic():
         task_log.detail = created_bill
         task_log.bill = bill_object
         task_log.status = 'COMPLETE'
@@ -617,35 +682,39 @@ def create_credit_card_charge(expense_group_id: int, task_log_id: int, last_expo
     worker_logger.info('Validated Expense Group %s successfully', expense_group.id)
 
     with transaction.atomic():
+        discard_interrupted_exports([expense_group.id])
         credit_card_charge_object = CreditCardCharge.create_credit_card_charge(expense_group)
 
         credit_card_charge_lineitems_objects = CreditCardChargeLineItem.create_credit_card_charge_lineitems(
             expense_group, configuration
         )
-        attachment_links = {}
 
-        expense = expense_group.expenses.first()
-        refund = False
-        if expense.amount < 0:
-            refund = True
+    attachment_links = {}
 
-        if configuration.is_attachment_upload_enabled:
-            for expense in expense_group.expenses.all():
-                attachment_link = load_attachments(netsuite_connection, expense, expense_group, task_log)
+    expense = expense_group.expenses.first()
+    refund = False
+    if expense.amount < 0:
+        refund = True
 
-                if attachment_link:
-                    attachment_links[expense.expense_id] = attachment_link
+    try:
+        if configuration.is_attachment_upload_enabled:
+            attachment_links = load_expense_attachments(netsuite_connection, expense_group.expenses.all(), expense_group, task_log)
 
         created_credit_card_charge = netsuite_connection.post_credit_card_charge(
             credit_card_charge_object, credit_card_charge_lineitems_objects, general_mappings, attachment_links, refund
         )
-        worker_logger.info('Created Credit Card Charge with Expense Group %s successfully', expense_group.id)
+    except Exception:
+        __discard_unposted_export(credit_card_charge_object, credit_card_charge_lineitems_objects)
+        raise
 
-        if refund:
-            created_credit_card_charge['type'] = 'chargeCardRefund'
-        else:
-            created_credit_card_charge['type'] = 'chargeCard'
+    worker_logger.info('Created Credit Card Charge with Expense Group %s successfully', expense_group.id)
+
+    if refund:
+        created_credit_card_charge['type'] = 'chargeCardRefund'
+    else:
+        created_credit_card_charge['type'] = 'chargeCard'
 
+    with transaction.atomic():
         task_log.detail = created_credit_card_charge
         task_log.credit_card_charge = credit_card_charge_object
         task_log.status = 'COMPLETE'
@@ -719,17 +788,24 @@ def create_expense_report(expense_group_id: int, task_log_id: int, last_export:
     worker_logger.info('Validated Expense Group %s successfully', expense_group.id)
 
     with transaction.atomic():
+        discard_interrupted_exports([expense_group.id])
         expense_report_object = ExpenseReport.create_expense_report(expense_group)
 
         expense_report_lineitems_objects = ExpenseReportLineItem.create_expense_report_lineitems(
             expense_group, configuration
         )
 
+    try:
         created_expense_report = netsuite_connection.post_expense_report(
             expense_report_object, expense_report_lineitems_objects, general_mapping
         )
-        worker_logger.info('Created Expense Report with Expense Group %s successfully', expense_group.id)
+    except Exception:
+        __discard_unposted_export(expense_report_object, expense_report_lineitems_objects)
+        raise
 
+    worker_logger.info('Created Expense Report with Expense Group %s successfully', expense_group.id)
+
+    with transaction.atomic():
         task_log.detail = created_expense_report
         task_log.expense_report = expense_report_object
         task_log.status = 'COMPLETE'
@@ -811,17 +887,24 @@ def create_journal_entry(expense_group_id: int, task_log_id: int, last_export: b
     worker_logger.info('Validated Expense Group %s successfully', expense_group.id)
 
     with transaction.atomic():
+        discard_interrupted_exports([expense_group.id])
         journal_entry_object = JournalEntry.create_journal_entry(expense_group)
 
         journal_entry_lineitems_objects = JournalEntryLineItem.create_journal_entry_lineitems(
             expense_group, configuration
         )
 
+    try:
         created_journal_entry = netsuite_connection.post_journal_entry(
             journal_entry_object, journal_entry_lineitems_objects, configuration, general_mapping
         )
-        worker_logger.info('Created Journal Entry with Expense Group %s successfully', expense_group.id)
+    except Exception:
+        __discard_unposted_export(journal_entry_object, journal_entry_lineitems_objects)
+        raise
 
+    worker_logger.info('Created Journal Entry with Expense Group %s successfully', expense_group.id)
+
+    with transaction.atomic():
         task_log.detail = created_journal_entry
         task_log.journal_entry = journal_entry_object
         task_log.status = 'COMPLETE'
@@ -857,6 +940,225 @@ def create_journal_entry(expense_group_id: int, task_log_id: int, last_export: b
         publish_to_rabbitmq(payload=payload, routing_key=RoutingKeyEnum.UTILITY.value)
 
 
+BATCH_EXPORT_CREATE_FUNC_MAP = {
+    'CREATING_BILL': (Bill.create_bill, BillLineitem.create_bill_lineitems),
+    'CREATING_EXPENSE_REPORT': (ExpenseReport.create_expense_report, ExpenseReportLineItem.create_expense_report_lineitems),
+    'CREATING_JOURNAL_ENTRY': (JournalEntry.create_journal_entry, JournalEntryLineItem.create_journal_entry_lineitems)
+}
+
+
+def prepare_batched_export(expense_group_id: int, task_log_id: int, is_auto_export: bool, export_type: str) -> Optional[dict]:
+    """
+    Validate an expense group and create its export objects for a batched export. Failures are
+    kept on the prepared export and handled with the NetSuite response by complete_batched_export
+    :param expense_group_id: Expense group id
+    :param task_log_id: Task log id
+    :param is_auto_export: Is auto export
+    :param export_type: Task log type of the export
+    :return: prepared export, None if the export is skipped
+    """
+    worker_logger = get_logger()
+    try:
+        with transaction.atomic():
+            task_log = TaskLog.objects.select_for_update().get(id=task_log_id)
+            expense_group = ExpenseGroup.objects.get(id=expense_group_id, workspace_id=task_log.workspace_id)
+            worker_logger.info('Preparing batched %s for Expense Group %s, current state is %s, triggered by %s', export_type, expense_group.id, task_log.status, task_log.triggered_by)
+
+            if task_log.status not in ['IN_PROGRESS', 'COMPLETE']:
+                task_log.status = 'IN_PROGRESS'
+                task_log.save()
+            else:
+                worker_logger.info('Task log %s is already in %s state, workspace id %s, so skipping the task', task_log_id, task_log.status, task_log.workspace_id)
+                return None
+    except TaskLog.DoesNotExist:
+        worker_logger.info('Task log %s no longer exists, skipping batched export', task_log_id)
+        return None
+
+    prepared_export = {
+        'task_log': task_log,
+        'expense_group': expense_group,
+        'export_object': None,
+        'lineitems': None,
+        'error': None,
+        'result': None
+    }
+
+    # Don't include expenses with previous export state as ERROR and it's an auto import/export run
+    if not (is_auto_export and expense_group.expenses.first().previous_export_state == 'ERROR'):
+        try:
+            update_expense_and_post_summary(list(expense_group.expenses.all()), expense_group.workspace_id, expense_group.fund_source)
+        except Exception as e:
+            logger.error('Error while updating expenses for expense_group_id: %s and posting accounting export summary %s', expense_group.id, e)
+
+    try:
+        configuration = Configuration.objects.get(workspace_id=expense_group.workspace_id)
+        general_mapping = GeneralMapping.objects.filter(workspace_id=expense_group.workspace_id).first()
+
+        netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(expense_group.workspace_id)
+        netsuite_connection = NetSuiteConnector(netsuite_credentials, expense_group.workspace_id)
+
+        if configuration.auto_map_employees and configuration.auto_create_destination_entity and (
+            export_type != 'CREATING_BILL' or expense_group.fund_source == 'PERSONAL'
+            or (general_mapping and general_mapping.use_employee_department and expense_group.fund_source == 'CCC')
+        ):
+            create_or_update_employee_mapping(
+                expense_group, netsuite_connection, configuration.auto_map_employees,
+                configuration.employee_field_mapping)
+
+        __validate_expense_group(expense_group, configuration)
+        worker_logger.info('Validated Expense Group %s successfully', expense_group.id)
+
+        create_export_object, create_lineitems = BATCH_EXPORT_CREATE_FUNC_MAP[export_type]
+        with transaction.atomic():
+            discard_interrupted_exports([expense_group.id])
+            prepared_export['export_object'] = create_export_object(expense_group)
+            prepared_export['lineitems'] = create_lineitems(expense_group, configuration)
+    except Exception as exception:
+        prepared_export['error'] = exception
+
+    return prepared_export
+
+
+def is_retried_by_single_export(exception: NetSuiteRequestError, configuration: Configuration) -> bool:
+    """
+    Check if posting the export on its own fixes the error, the single record path moves the
+    transaction date into the open accounting period and drops gross amounts NetSuite doesn't allow
+    :param exception: Record level error of the batch
+    :param configuration: Workspace configuration
+    :return: whether the export should be posted on its own
+    """
+    message = 'An error occured in a upsert request: The transaction date you specified is not within the date range of your accounting period.'
+    if configuration.change_accounting_period and exception.message == message:
+        return True
+
+    return 'You do not have permissions to set a value for element expense.grossamt' in str(exception)
+
+
+@handle_netsuite_exceptions(payment=False)
+def complete_batched_export(expense_group_id: int, task_log_id: int, last_export: bool, is_auto_export: bool, export_type: str, prepared_export: dict):
+    """
+    Save the NetSuite response of a batched export on the task log and expense group
+    :param expense_group_id: Expense group id
+    :param task_log_id: Task log id
+    :param last_export: Is last export
+    :param is_auto_export: Is auto export
+    :param export_type: Task log type of the export
+    :param prepared_export: Export prepared by prepare_batched_export, with the created record ref,
+        the exception raised for this record or None if NetSuite did not respond for it as result
+    """
+    if prepared_export['error']:
+        raise prepared_export['error']
+
+    worker_logger = get_logger()
+    task_log = prepared_export['task_log']
+    expense_group = prepared_export['expense_group']
+    export_object = prepared_export['export_object']
+    lineitems = prepared_export['lineitems']
+    result = prepared_export['result']
+
+    configuration = Configuration.objects.get(workspace_id=expense_group.workspace_id)
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(expense_group.workspace_id)
+
+    if not result or (isinstance(result, NetSuiteRequestError) and is_retried_by_single_export(result, configuration)):
+        netsuite_connection = NetSuiteConnector(netsuite_credentials, expense_group.workspace_id)
+        general_mapping = GeneralMapping.objects.filter(workspace_id=expense_group.workspace_id).first()
+        try:
+            result = netsuite_connection.post_export(export_type, export_object, lineitems, configuration, general_mapping)
+        except Exception:
+            __discard_unposted_export(export_object, lineitems)
+            raise
+    elif isinstance(result, Exception):
+        __discard_unposted_export(export_object, lineitems)
+        raise result
+
+    worker_logger.info('Created %s with Expense Group %s successfully', export_type, expense_group.id)
+
+    with transaction.atomic():
+        task_log.detail = result
+        setattr(task_log, TASK_TYPE_EXPORT_COL_MAP[export_type], export_object)
+        task_log.status = 'COMPLETE'
+
+        task_log.save()
+
+        expense_group.exported_at = datetime.now()
+        expense_group.response_logs = result
+        expense_group.export_url = generate_netsuite_export_url(response_logs=result, netsuite_credentials=netsuite_credentials)
+        expense_group.save()
+        resolve_errors_for_exported_expense_group(expense_group)
+
+    try:
+        update_complete_expenses(expense_group.expenses.all(), expense_group.export_url)
+        post_accounting_export_summary(workspace_id=expense_group.workspace_id, expense_ids=[expense.id for expense in expense_group.expenses.all()], fund_source=expense_group.fund_source)
+    except Exception as e:
+        logger.error('Error while updating expenses for expense_group_id: %s and posting accounting export summary %s', expense_group.id, e)
+
+    if configuration.is_attachment_upload_enabled:
+        payload = {
+            'workspace_id': expense_group.workspace_id,
+            'action': WorkerActionEnum.UPLOAD_ATTACHMENTS.value,
+            'data': {
+                'expense_ids': list(expense_group.expenses.values_list('id', flat=True)),
+                'task_log_id': task_log.id,
+                'workspace_id': expense_group.workspace_id
+            }
+        }
+        publish_to_rabbitmq(payload=payload, routing_key=RoutingKeyEnum.UTILITY.value)
+
+
+def create_exports_in_batch(export_type: str, expense_group_ids: List[int], task_log_ids: List[int], last_export: bool, is_auto_export: bool):
+    """
+    Export bills, expense reports or journal entries of many expense groups with a single upsertList request
+    :param export_type: Task log type of the exports
+    :param expense_group_ids: Expense group ids
+    :param task_log_ids: Task log ids, in the same order as expense_group_ids
+    :param last_export: Is this batch the last of the export run
+    :param is_auto_export: Is auto export
+    """
+    workspace_id = ExpenseGroup.objects.filter(id=expense_group_ids[0]).values_list('workspace_id', flat=True).first()
+    task_logs = TaskLog.objects.in_bulk(task_log_ids)
+
+    prepared_exports = []
+    for expense_group_id, task_log_id in zip(expense_group_ids, task_log_ids):
+        if task_log_id not in task_logs:
+            logger.info('Task log %s no longer exists, skipping batched export', task_log_id)
+            continue
+
+        prepared_export = prepare_batched_export(expense_group_id, task_log_id, is_auto_export, export_type)
+        if prepared_export:
+            prepared_exports.append(prepared_export)
+
+    exports_to_post = [prepared_export for prepared_export in prepared_exports if not prepared_export['error']]
+    if exports_to_post:
+        logger.info('Posting %s %s in batch for workspace_id %s', len(exports_to_post), export_type, workspace_id)
+
+        try:
+            configuration = Configuration.objects.get(workspace_id=workspace_id)
+            general_mapping = GeneralMapping.objects.filter(workspace_id=workspace_id).first()
+            netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id)
+            netsuite_connection = NetSuiteConnector(netsuite_credentials, workspace_id)
+
+            results = netsuite_connection.post_exports_in_batch(
+                export_type,
+                [(prepared_export['export_object'], prepared_export['lineitems']) for prepared_export in exports_to_post],
+                configuration,
+                general_mapping
+            )
+        except Exception as exception:
+            results = [exception] * len(exports_to_post)
+
+        for prepared_export, result in zip(exports_to_post, results):
+            prepared_export['result'] = result
+
+    for prepared_export in prepared_exports:
+        complete_batched_export(
+            prepared_export['expense_group'].id, prepared_export['task_log'].id, False, is_auto_export,
+            export_type, prepared_export
+        )
+
+    if last_export:
+        update_last_export_details(workspace_id)
+
+
 def __validate_general_mapping(expense_group: ExpenseGroup, configuration: Configuration) -> List[BulkError]:
     bulk_errors = []
     general_mapping = None
@@ -1168,27 +1470,71 @@ def __validate_expense_group(expense_group: ExpenseGroup, configuration: Configu
         raise BulkError('Mappings are missing', bulk_errors)
 
 
-def check_expenses_reimbursement_status(expenses, workspace_id, platform, filter_credit_expenses):
+def get_id_filters(ids: List, chunk_size: int = 10) -> Iterator[str]:
+    """
+    Get Fyle platform filters matching the ids, chunk_size ids per filter to keep the query short
+    :param ids: Fyle object ids
+    :param chunk_size: Number of ids per filter
+    :return: generator of in / eq filters
+    """
+    for index in range(0, len(ids), chunk_size):
+        partitioned_list = ids[index:index + chunk_size]
 
-    if expenses.first().paid_on_fyle:
-        return True
+        yield 'in.{}'.format(tuple(partitioned_list)).replace('\'', '"') \
+            if len(partitioned_list) > 1 else 'eq.{}'.format(partitioned_list[0])
 
-    report_id = expenses.first().report_id
 
-    expenses = platform.expenses.get(
-        source_account_type=['PERSONAL_CASH_ACCOUNT'],
-        filter_credit_expenses=filter_credit_expenses,
-        report_id=report_id
-    )
+def get_paid_report_ids(report_ids: List, platform: PlatformConnector, filter_credit_expenses: bool) -> List[str]:
+    """
+    Get ids of the reports paid on Fyle, 10 reports per request
+    :param report_ids: Fyle report ids
+    :param platform: Platform connector
+    :param filter_credit_expenses: Ignore credit expenses
+    :return: ids of the paid reports
+    """
+    paid_report_ids = set()
+    for report_id_filter in get_id_filters(report_ids):
+        query_params = {
+            'report_id': report_id_filter,
+            'source_account->type': 'eq.PERSONAL_CASH_ACCOUNT',
+            'is_reimbursable': 'eq.true',
+            'state': 'eq.PAID'
+        }
 
-    is_paid = False
-    if expenses:
-        is_paid = expenses[0]['state'] == 'PAID'
+        if filter_credit_expenses:
+            query_params['amount'] = 'gt.0'
 
-    if is_paid:
-        Expense.objects.filter(workspace_id=workspace_id, report_id=report_id, paid_on_fyle=False).update(paid_on_fyle=True, updated_at=datetime.now(timezone.utc))
+        expenses = platform.expenses.connection.list_all(query_params)
 
-    return is_paid
+        for expenses_generator in expenses:
+            paid_report_ids.update(expense['report_id'] for expense in expenses_generator['data'])
+
+    return list(paid_report_ids)
+
+
+def get_netsuite_objects(internal_ids: List, record_type: str, get_netsuite_object: Callable,
+                         netsuite_connection: NetSuiteConnector, bulk_status_polling: bool) -> Dict[str, Dict]:
+    """
+    Get bills or expense reports from NetSuite
+    :param internal_ids: NetSuite internal ids
+    :param record_type: NetSuite record type, e.g. vendorBill
+    :param get_netsuite_object: Gets a single NetSuite object by internal id
+    :param netsuite_connection: NetSuite connection
+    :param bulk_status_polling: Get all objects with getList
+    :return: NetSuite object by internal id
+    """
+    if bulk_status_polling:
+        return netsuite_connection.get_transactions(record_type, internal_ids)
+
+    netsuite_entries = {}
+    for internal_id in internal_ids:
+        # When the record is deleted, netsuite sdk would throw an exception RCRD_DSNT_EXIST
+        try:
+            netsuite_entries[str(internal_id)] = get_netsuite_object(internal_id)
+        except Exception:
+            logger.info('Unable to get NetSuite object %s, record_type - %s', internal_id, record_type)
+
+    return netsuite_entries
 
 
 def create_netsuite_payment_objects(netsuite_objects, object_type, workspace_id):
@@ -1216,23 +1562,53 @@ def create_netsuite_payment_objects(netsuite_objects, object_type, workspace_id)
         logger.info('Invalid credentials, workspace_id - %s', workspace_id)
         return
 
+    netsuite_objects = list(netsuite_objects)
+    task_logs = TaskLog.objects.filter(
+        expense_group_id__in=[netsuite_object.expense_group_id for netsuite_object in netsuite_objects], status='COMPLETE'
+    )
+    internal_ids = {task_log.expense_group_id: task_log.detail['internalId'] for task_log in task_logs}
+
+    # Reimbursement status is checked once per report, for all the reports not yet marked paid on Fyle
+    report_ids = {}
+    unpaid_report_ids = set()
+    for netsuite_object in netsuite_objects:
+        expenses = netsuite_object.expense_group.expenses.all()
+        if not expenses:
+            continue
+
+        first_expense = min(expenses, key=lambda expense: expense.id)
+        report_ids[netsuite_object.id] = first_expense.report_id
+        if not first_expense.paid_on_fyle:
+            unpaid_report_ids.add(first_expense.report_id)
+
+    paid_report_ids = get_paid_report_ids(sorted(unpaid_report_ids), platform, filter_credit_expenses) if unpaid_report_ids else []
+    if paid_report_ids:
+        Expense.objects.filter(workspace_id=workspace_id, report_id__in=paid_report_ids, paid_on_fyle=False).update(
+            paid_on_fyle=True, updated_at=datetime.now(timezone.utc)
+        )
+
+    if object_type == 'BILL':
+        netsuite_entries = get_netsuite_objects(
+            list(internal_ids.values()), 'vendorBill', netsuite_connection.get_bill, netsuite_connection,
+            FeatureConfig.get_feature_config(workspace_id, 'bulk_status_polling')
+        )
+    else:
+        netsuite_entries = get_netsuite_objects(
+            list(internal_ids.values()), 'expenseReport', netsuite_connection.get_expense_report, netsuite_connection,
+            FeatureConfig.get_feature_config(workspace_id, 'bulk_status_polling')
+        )
+
     for netsuite_object in netsuite_objects:
         entity_id = netsuite_object.entity_id
 
-        expense_group_reimbursement_status = check_expenses_reimbursement_status(
-            netsuite_object.expense_group.expenses.all(), workspace_id=workspace_id, platform=platform, filter_credit_expenses=filter_credit_expenses)
+        if netsuite_object.id not in report_ids or netsuite_object.expense_group_id not in internal_ids:
+            continue
 
-        netsuite_object_task_log = TaskLog.objects.get(
-            expense_group=netsuite_object.expense_group, status='COMPLETE')
+        report_id = report_ids[netsuite_object.id]
+        expense_group_reimbursement_status = report_id not in unpaid_report_ids or report_id in paid_report_ids
 
-        # When the record is deleted, netsuite sdk would throw an exception RCRD_DSNT_EXIST
-        try:
-            if object_type == 'BILL':
-                netsuite_entry = netsuite_connection.get_bill(netsuite_object_task_log.detail['internalId'])
-            else:
-                netsuite_entry = netsuite_connection.get_expense_report(netsuite_object_task_log.detail['internalId'])
-        except Exception:
-            netsuite_entry = None
+        internal_id = internal_ids[netsuite_object.expense_group_id]
+        netsuite_entry = netsuite_entries.get(str(internal_id))
 
         if netsuite_entry and netsuite_entry['status'] != netsuite_paid_state and expense_group_reimbursement_status:
             if entity_id not in netsuite_payment_objects:
@@ -1244,9 +1620,10 @@ def create_netsuite_payment_objects(netsuite_objects, object_type, workspace_id)
                         object_type.lower(), netsuite_object.expense_group.description['employee_email']
                     ),
                     'unique_id': '{0}-{1}'.format(netsuite_object.external_id, netsuite_object.id),
+                    'first_object': netsuite_entry,
                     'line': [
                         {
-                            'internal_id': netsuite_object_task_log.detail['internalId'],
+                            'internal_id': internal_id,
                             'entity_id': entity_id,
                             'expense_group': netsuite_object.expense_group,
                         }
@@ -1255,7 +1632,7 @@ def create_netsuite_payment_objects(netsuite_objects, object_type, workspace_id)
             else:
                 netsuite_payment_objects[entity_id]['line'].append(
                     {
-                        'internal_id': netsuite_object_task_log.detail['internalId'],
+                        'internal_id': internal_id,
                         'entity_id': entity_id,
                         'expense_group': netsuite_object.expense_group,
                     }
@@ -1288,11 +1665,14 @@ def process_vendor_payment(entity_object, workspace_id, object_type):
             
         netsuite_connection = NetSuiteConnector(netsuite_credentials, workspace_id)
 
-        first_object_id = vendor_payment_lineitems[0].doc_id
-        if object_type == 'BILL':
-            first_object = netsuite_connection.get_bill(first_object_id)
-        else:
-            first_object = netsuite_connection.get_expense_report(first_object_id)
+        # The first object is already fetched while building the payment objects
+        first_object = entity_object.get('first_object')
+        if not first_object:
+            first_object_id = vendor_payment_lineitems[0].doc_id
+            if object_type == 'BILL':
+                first_object = netsuite_connection.get_bill(first_object_id)
+            else:
+                first_object = netsuite_connection.get_expense_report(first_object_id)
         created_vendor_payment = netsuite_connection.post_vendor_payment(
             vendor_payment_object, vendor_payment_lineitems, first_object
         )
@@ -1301,15 +1681,12 @@ def process_vendor_payment(entity_object, workspace_id, object_type):
         expense_group_ids = [line['expense_group'].id for line in lines]
 
         if object_type == 'BILL':
-            paid_objects = Bill.objects.filter(expense_group_id__in=expense_group_ids).all()
+            paid_objects = Bill.objects.filter(expense_group_id__in=expense_group_ids)
 
         else:
-            paid_objects = ExpenseReport.objects.filter(expense_group_id__in=expense_group_ids).all()
+            paid_objects = ExpenseReport.objects.filter(expense_group_id__in=expense_group_ids)
 
-        for paid_object in paid_objects:
-            paid_object.payment_synced = True
-            paid_object.paid_on_netsuite = True
-            paid_object.save()
+        paid_objects.update(payment_synced=True, paid_on_netsuite=True, updated_at=django_timezone.now())
 
         task_log.detail = created_vendor_payment
         task_log.vendor_payment = vendor_payment_object
@@ -1379,12 +1756,12 @@ def run_create_vendor_payment(workspace_id):
         bills = Bill.objects.filter(
             payment_synced=False, expense_group__workspace_id=workspace_id,
             expense_group__fund_source='PERSONAL', expense_group__exported_at__isnull=False, is_retired=False
-        ).all()
+        ).select_related('expense_group').prefetch_related('expense_group__expenses')
 
         expense_reports = ExpenseReport.objects.filter(
             payment_synced=False, expense_group__workspace_id=workspace_id,
             expense_group__fund_source='PERSONAL', expense_group__exported_at__isnull=False, is_retired=False
-        ).all()
+        ).select_related('expense_group').prefetch_related('expense_group__expenses')
 
         if bills:
             bill_entity_map = create_netsuite_payment_objects(bills, 'BILL', workspace_id)
@@ -1452,9 +1829,9 @@ def get_all_internal_ids(netsuite_objects):
 
     expense_group_ids = [netsuite_object.expense_group_id for netsuite_object in netsuite_objects]
 
-    task_logs = TaskLog.objects.filter(expense_group_id__in=expense_group_ids).all()
+    task_logs = TaskLog.objects.filter(expense_group_id__in=expense_group_ids).select_related('expense_group')
     for task_log in task_logs:
-        netsuite_objects_details[task_log.expense_group.id] = {
+        netsuite_objects_details[task_log.expense_group_id] = {
             'expense_group': task_log.expense_group,
             'internal_id': task_log.detail['internalId']
         }
@@ -1462,6 +1839,81 @@ def get_all_internal_ids(netsuite_objects):
     return netsuite_objects_details
 
 
+def get_netsuite_object_statuses(internal_ids: List, record_type: str, get_netsuite_object: Callable,
+                                 netsuite_connection: NetSuiteConnector, bulk_status_polling: bool) -> Dict[str, str]:
+    """
+    Get status of the bills or expense reports on NetSuite
+    :param internal_ids: NetSuite internal ids
+    :param record_type: NetSuite record type, e.g. vendorBill
+    :param get_netsuite_object: Gets a single NetSuite object by internal id
+    :param netsuite_connection: NetSuite connection
+    :param bulk_status_polling: Poll status of all objects with getList
+    :return: status by internal id
+    """
+    if bulk_status_polling:
+        return netsuite_connection.get_transaction_statuses(record_type, internal_ids)
+
+    statuses = {}
+    for internal_id in internal_ids:
+        try:
+            statuses[str(internal_id)] = get_netsuite_object(internal_id)['status']
+        except NetSuiteRequestError as exception:
+            logger.info({'error': exception})
+
+    return statuses
+
+
+def get_paid_netsuite_object_ids(workspace_id: int, netsuite_objects, record_type: str, get_netsuite_object: Callable,
+                                 netsuite_connection: NetSuiteConnector, netsuite_api) -> Tuple[List[int], Optional[Dict]]:
+    """
+    Get ids of the bills or expense reports paid in full on NetSuite. With incremental status sync,
+    only transactions modified since the last poll are searched, and every object is checked
+    again once a full sync is due. The sync state is returned for the caller to save along
+    with the paid objects, so that the watermark doesn't move past statuses that weren't saved
+    :param workspace_id: Workspace Id
+    :param netsuite_objects: Bills or expense reports
+    :param record_type: NetSuite record type, e.g. vendorBill
+    :param get_netsuite_object: Gets a single NetSuite object by internal id
+    :param netsuite_connection: NetSuite connection
+    :param netsuite_api: NetSuite SDK api of the record type
+    :return: ids of the paid objects and the sync state, none without incremental status sync
+    """
+    internal_ids = get_all_internal_ids(netsuite_objects)
+    netsuite_object_internal_ids = {
+        netsuite_object.id: internal_ids[netsuite_object.expense_group_id]['internal_id']
+        for netsuite_object in netsuite_objects
+    }
+
+    is_incremental_status_sync = FeatureConfig.get_feature_config(workspace_id, 'incremental_status_sync')
+    dimension = STATUS_SYNC_DIMENSIONS[record_type]
+    synced_at = django_timezone.now()
+    last_modified_at = NetSuiteDimensionSyncState.get_last_modified_at(workspace_id, dimension) \
+        if is_incremental_status_sync else None
+
+    try:
+        if last_modified_at:
+            statuses = netsuite_connection.get_modified_transaction_statuses(netsuite_api, last_modified_at)
+        else:
+            statuses = get_netsuite_object_statuses(
+                list(netsuite_object_internal_ids.values()), record_type, get_netsuite_object, netsuite_connection,
+                FeatureConfig.get_feature_config(workspace_id, 'bulk_status_polling')
+            )
+    except NetSuiteRequestError as exception:
+        logger.info({'error': exception})
+        return [], None
+
+    sync_state = {
+        'dimension': dimension,
+        'synced_at': synced_at,
+        'is_full_sync': not last_modified_at
+    } if is_incremental_status_sync else None
+
+    return [
+        netsuite_object_id for netsuite_object_id, internal_id in netsuite_object_internal_ids.items()
+        if statuses.get(str(internal_id)) == netsuite_paid_state
+    ], sync_state
+
+
 def check_netsuite_object_status(workspace_id):
     """
     Trigger run_check_netsuite_object_status via RabbitMQ
@@ -1502,44 +1954,39 @@ def run_check_netsuite_object_status(workspace_id, trigger_reimbursements: bool
     ).all()
 
     if bills:
-        internal_ids = get_all_internal_ids(bills)
-        for bill in bills:
-            try:
-                bill_object = netsuite_connection.get_bill(internal_ids[bill.expense_group.id]['internal_id'])
-                if bill_object['status'] == netsuite_paid_state:
-                    line_items = BillLineitem.objects.filter(bill_id=bill.id)
-                    for line_item in line_items:
-                        expense = line_item.expense
-                        expense.paid_on_netsuite = True
-                        expense.save()
-
-                    bill.paid_on_netsuite = True
-                    bill.payment_synced = True
-                    bill.save()
-            except NetSuiteRequestError as exception:
-                logger.info({'error': exception})
-                pass
+        paid_bill_ids, sync_state = get_paid_netsuite_object_ids(
+            workspace_id, bills, 'vendorBill', netsuite_connection.get_bill,
+            netsuite_connection, netsuite_connection.connection.vendor_bills
+        )
+
+        with transaction.atomic():
+            if paid_bill_ids:
+                Expense.objects.filter(
+                    id__in=BillLineitem.objects.filter(bill_id__in=paid_bill_ids).values('expense_id')
+                ).update(paid_on_netsuite=True, updated_at=django_timezone.now())
+                Bill.objects.filter(id__in=paid_bill_ids).update(
+                    paid_on_netsuite=True, payment_synced=True, updated_at=django_timezone.now()
+                )
+            if sync_state:
+                NetSuiteDimensionSyncState.update_sync_state(workspace_id, **sync_state)
 
     if expense_reports:
-        internal_ids = get_all_internal_ids(expense_reports)
-
-        for expense_report in expense_reports:
-            try:
-                expense_report_object = netsuite_connection.get_expense_report(
-                    internal_ids[expense_report.expense_group.id]['internal_id'])
-                if expense_report_object['status'] == netsuite_paid_state:
-                    line_items = ExpenseReportLineItem.objects.filter(expense_report_id=expense_report.id)
-                    for line_item in line_items:
-                        expense = line_item.expense
-                        expense.paid_on_netsuite = True
-                        expense.save()
-
-                    expense_report.paid_on_netsuite = True
-                    expense_report.payment_synced = True
-                    expense_report.save()
-            except NetSuiteRequestError as exception:
-                logger.info({'error': exception})
-                pass
+        paid_expense_report_ids, sync_state = get_paid_netsuite_object_ids(
+            workspace_id, expense_reports, 'expenseReport', netsuite_connection.get_expense_report,
+            netsuite_connection, netsuite_connection.connection.expense_reports
+        )
+
+        with transaction.atomic():
+            if paid_expense_report_ids:
+                Expense.objects.filter(
+                    id__in=ExpenseReportLineItem.objects.filter(
+                        expense_report_id__in=paid_expense_report_ids).values('expense_id')
+                ).update(paid_on_netsuite=True, updated_at=django_timezone.now())
+                ExpenseReport.objects.filter(id__in=paid_expense_report_ids).update(
+                    paid_on_netsuite=True, payment_synced=True, updated_at=django_timezone.now()
+                )
+            if sync_state:
+                NetSuiteDimensionSyncState.update_sync_state(workspace_id, **sync_state)
 
     if trigger_reimbursements:
         payload = {
@@ -1575,16 +2022,8 @@ def schedule_netsuite_objects_status_sync(sync_netsuite_to_fyle_payments, worksp
 
 
 def get_valid_reimbursement_ids(reimbursement_ids: List, platform: PlatformConnector) -> List[str]:
-    chunk_size = 10
-    count_of_reimbursements = len(reimbursement_ids)
-
     valid_reimbursement_ids = []
-    for index in range(0, count_of_reimbursements, chunk_size):
-        partitioned_list = reimbursement_ids[index:index + chunk_size]
-
-        id_filter = 'in.{}'.format(tuple(partitioned_list)).replace('\'', '"') \
-            if len(partitioned_list) > 1 else 'eq.{}'.format(partitioned_list[0])
-
+    for id_filter in get_id_filters(reimbursement_ids):
         query_params = {
             'id': id_filter,
             'is_paid': 'eq.false'
@@ -1620,24 +2059,24 @@ def run_process_reimbursements(workspace_id):
         fyle_credentials = FyleCredential.objects.get(workspace_id=workspace_id)
         platform = PlatformConnector(fyle_credentials=fyle_credentials)
 
-        reports_to_be_marked = set()
-        payloads = []
-
-        report_ids = Expense.objects.filter(fund_source='PERSONAL', paid_on_fyle=False, workspace_id=workspace_id).values_list('report_id').distinct()
-        for report_id in report_ids:
-            report_id = report_id[0]
-            expenses = Expense.objects.filter(fund_source='PERSONAL', report_id=report_id, workspace_id=workspace_id).all()
-            paid_expenses = expenses.filter(paid_on_netsuite=True)
-
-            all_expense_paid = False
-            if len(expenses):
-                all_expense_paid = len(expenses) == len(paid_expenses)
-
-            if all_expense_paid:
-                payloads.append({'id': report_id, 'paid_notify_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')})
-                reports_to_be_marked.add(report_id)
+        # Reports with an expense not yet marked paid on Fyle, whose expenses are all paid on NetSuite
+        report_ids = list(Expense.objects.filter(
+            fund_source='PERSONAL', workspace_id=workspace_id, report_id__isnull=False
+        ).values('report_id').annotate(
+            unpaid_on_fyle_count=Count('id', filter=Q(paid_on_fyle=False)),
+            all_paid_on_netsuite=BoolAnd('paid_on_netsuite')
+        ).filter(
+            unpaid_on_fyle_count__gt=0, all_paid_on_netsuite=True
+        ).order_by('report_id').values_list('report_id', flat=True))
+
+        batch_size = settings.FYLE_MARK_PAID_BATCH_SIZE
+        for index in range(0, len(report_ids), batch_size):
+            paid_notify_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            payloads = [
+                {'id': report_id, 'paid_notify_at': paid_notify_at} for report_id in report_ids[index:index + batch_size]
+            ]
+            reports_to_be_marked = {payload['id'] for payload in payloads}
 
-        if payloads:
             mark_paid_on_fyle(platform, payloads, reports_to_be_marked, workspace_id)
     except (InvalidTokenError, InternalServerError) as e:
         logger.info('Invalid Fyle refresh token or internal server error for workspace %s: %s', workspace_id, str(e))
@@ -1647,39 +2086,43 @@ def run_process_reimbursements(workspace_id):
         logger.error('Full traceback: %s', traceback.format_exc())
 
 
-def mark_paid_on_fyle(platform, payloads:dict, reports_to_be_marked, workspace_id, retry_num=10):
-    try:
-        logger.info('Marking reports paid on fyle for report ids - %s', reports_to_be_marked)
-        logger.info('Payloads- %s', payloads)
-        platform.reports.bulk_mark_as_paid(payloads)
-        Expense.objects.filter(report_id__in=list(reports_to_be_marked), workspace_id=workspace_id, paid_on_fyle=False).update(paid_on_fyle=True, updated_at=datetime.now(timezone.utc))
-    except Exception as e:
-        error = traceback.format_exc()
-        target_messages = ['Report is not in APPROVED or PAYMENT_PROCESSING State', 'Permission denied to perform this action.']
-        error_response = e.response
-        to_remove = set()
+def mark_paid_on_fyle(platform, payloads: List[dict], reports_to_be_marked: set, workspace_id, retry_num=10):
+    """
+    Mark reports paid on Fyle, dropping the reports Fyle rejects and retrying the rest up to
+    retry_num times, along with any other failure
+    :param platform: Platform connector
+    :param payloads: Payloads of the reports
+    :param reports_to_be_marked: Report ids
+    :param workspace_id: Workspace Id
+    :param retry_num: Number of retries
+    """
+    target_messages = ['Report is not in APPROVED or PAYMENT_PROCESSING State', 'Permission denied to perform this action.']
+
+    while payloads:
+        try:
+            logger.info('Marking reports paid on fyle for report ids - %s', reports_to_be_marked)
+            logger.info('Payloads- %s', payloads)
+            platform.reports.bulk_mark_as_paid(payloads)
+            Expense.objects.filter(report_id__in=list(reports_to_be_marked), workspace_id=workspace_id, paid_on_fyle=False).update(paid_on_fyle=True, updated_at=datetime.now(timezone.utc))
+            return
+        except Exception as e:
+            logger.exception({'error': traceback.format_exc()})
 
-        for item in error_response.get('data', []):
-            if item.get('message') in target_messages:
-                Expense.objects.filter(report_id=item['key'], workspace_id=workspace_id, paid_on_fyle=False).update(paid_on_fyle=True, updated_at=datetime.now(timezone.utc))
-                to_remove.add(item['key'])
+            error_response = getattr(e, 'response', None)
+            error_items = error_response.get('data', []) if isinstance(error_response, dict) else []
+            to_remove = {item['key'] for item in error_items if item.get('message') in target_messages}
 
-        for report_id in to_remove:
-            payloads = [payload for payload in payloads if payload['id'] != report_id]
-            reports_to_be_marked.remove(report_id)
+            if to_remove:
+                Expense.objects.filter(report_id__in=list(to_remove), workspace_id=workspace_id, paid_on_fyle=False).update(paid_on_fyle=True, updated_at=datetime.now(timezone.utc))
+                payloads = [payload for payload in payloads if payload['id'] not in to_remove]
+                reports_to_be_marked.difference_update(to_remove)
+
+            if retry_num <= 0 or not payloads:
+                logger.info('Retry limit reached or no payloads left. Failed to process payloads - %s:', reports_to_be_marked)
+                return
 
-        if retry_num > 0 and payloads:
             retry_num -= 1
             logger.info('Retrying to mark reports paid on fyle, retry_num=%d', retry_num)
-            mark_paid_on_fyle(platform, payloads, reports_to_be_marked, workspace_id, retry_num)
-
-        else:
-            logger.info('Retry limit reached or no payloads left. Failed to process payloads - %s:', reports_to_be_marked)
-
-        error = {
-            'error': error
-        }
-        logger.exception(error)
 
 
 def schedule_reimbursements_sync(sync_netsuite_to_fyle_payments, workspace_id):
@@ -8,3 +8,10 @@ class CacheKeyEnum(str, Enum):
     FYLE_SYNC_DIMENSIONS = "sync_dimensions_{workspace_id}"
     NETSUITE_SYNC_DIMENSIONS = "sync_netsuite_dimensions_{workspace_id}"
     FEATURE_CONFIG_SKIP_POSTING_GROSS_AMOUNT = "skip_posting_gross_amount_{workspace_id}"
+    FEATURE_CONFIG_EXPORT_IN_BATCHES = "export_in_batches_{workspace_id}"
+    FEATURE_CONFIG_STREAM_EXPENSE_IMPORT = "stream_expense_import_{workspace_id}"
+    FEATURE_CONFIG_PARALLEL_DIMENSION_SYNC = "parallel_dimension_sync_{workspace_id}"
+    FEATURE_CONFIG_INCREMENTAL_DIMENSION_SYNC = "incremental_dimension_sync_{workspace_id}"
+    FEATURE_CONFIG_BULK_STATUS_POLLING = "bulk_status_polling_{workspace_id}"
+    FEATURE_CONFIG_INCREMENTAL_STATUS_SYNC = "incremental_status_sync_{workspace_id}"
+    NETSUITE_ATTRIBUTE_COUNT = "netsuite_attribute_count_{workspace_id}_{attribute_type}"
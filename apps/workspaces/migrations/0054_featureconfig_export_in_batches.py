@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0053_featureconfig_skip_posting_gross_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureconfig',
+            name='export_in_batches',
+            field=models.BooleanField(default=False, help_text='Export expense groups in batches via upsertList'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0054_featureconfig_export_in_batches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureconfig',
+            name='stream_expense_import',
+            field=models.BooleanField(default=False, help_text='Import Fyle expenses page by page'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0055_featureconfig_stream_expense_import'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureconfig',
+            name='parallel_dimension_sync',
+            field=models.BooleanField(default=False, help_text='Sync NetSuite dimensions concurrently'),
+        ),
+    ]
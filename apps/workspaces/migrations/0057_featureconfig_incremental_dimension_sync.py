@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0056_featureconfig_parallel_dimension_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureconfig',
+            name='incremental_dimension_sync',
+            field=models.BooleanField(default=False, help_text='Sync only NetSuite records modified since the last sync'),
+        ),
+    ]
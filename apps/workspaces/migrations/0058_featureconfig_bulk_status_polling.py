@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0057_featureconfig_incremental_dimension_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureconfig',
+            name='bulk_status_polling',
+            field=models.BooleanField(default=False, help_text='Poll NetSuite payment status with getList'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0058_featureconfig_bulk_status_polling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureconfig',
+            name='incremental_status_sync',
+            field=models.BooleanField(default=False, help_text='Poll only NetSuite transactions modified since the last poll'),
+        ),
+    ]
@@ -241,6 +241,12 @@ class FeatureConfig(models.Model):
     export_via_rabbitmq = models.BooleanField(default=False, help_text='Enable export via rabbitmq')
     fyle_webhook_sync_enabled = models.BooleanField(default=True, help_text='Enable fyle attribute webhook sync')
     skip_posting_gross_amount = models.BooleanField(default=False, help_text='Skip posting gross amount')
+    export_in_batches = models.BooleanField(default=False, help_text='Export expense groups in batches via upsertList')
+    stream_expense_import = models.BooleanField(default=False, help_text='Import Fyle expenses page by page')
+    parallel_dimension_sync = models.BooleanField(default=False, help_text='Sync NetSuite dimensions concurrently')
+    incremental_dimension_sync = models.BooleanField(default=False, help_text='Sync only NetSuite records modified since the last sync')
+    bulk_status_polling = models.BooleanField(default=False, help_text='Poll NetSuite payment status with getList')
+    incremental_status_sync = models.BooleanField(default=False, help_text='Poll only NetSuite transactions modified since the last poll')
     created_at = models.DateTimeField(auto_now_add=True, help_text='Created at datetime')
     updated_at = models.DateTimeField(auto_now=True, help_text='Updated at datetime')
 
@@ -249,7 +255,13 @@ class FeatureConfig(models.Model):
         cache_key_map = {
             'export_via_rabbitmq': CacheKeyEnum.FEATURE_CONFIG_EXPORT_VIA_RABBITMQ,
             'fyle_webhook_sync_enabled': CacheKeyEnum.FEATURE_CONFIG_FYLE_WEBHOOK_SYNC_ENABLED,
-            'skip_posting_gross_amount': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_SKIP_POSTING_GROSS_AMOUNT
+            'skip_posting_gross_amount': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_SKIP_POSTING_GROSS_AMOUNT,
+            'export_in_batches': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_EXPORT_IN_BATCHES,
+            'stream_expense_import': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_STREAM_EXPENSE_IMPORT,
+            'parallel_dimension_sync': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_PARALLEL_DIMENSION_SYNC,
+            'incremental_dimension_sync': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_INCREMENTAL_DIMENSION_SYNC,
+            'bulk_status_polling': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_BULK_STATUS_POLLING,
+            'incremental_status_sync': NetSuiteFeatureConfigCacheKeyEnum.FEATURE_CONFIG_INCREMENTAL_STATUS_SYNC
         }
         cache_key_enum = cache_key_map.get(key)
         return cache_key_enum.value.format(workspace_id=workspace_id)
@@ -298,6 +298,23 @@ ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY')
 E2E_TESTS_CLIENT_SECRET = os.environ.get('E2E_TESTS_CLIENT_SECRET')
 INTEGRATIONS_SETTINGS_API = os.environ.get('INTEGRATIONS_SETTINGS_API')
 NETSUITE_INTEGRATION_APP_URL = os.environ.get('NETSUITE_INTEGRATION_APP_URL')
+NETSUITE_CONNECTION_POOL_ENABLED = os.environ.get('NETSUITE_CONNECTION_POOL_ENABLED', 'True') == 'True'
+NETSUITE_CONNECTION_POOL_IDLE_TIMEOUT = int(os.environ.get('NETSUITE_CONNECTION_POOL_IDLE_TIMEOUT', 900))
+NETSUITE_CONNECTION_POOL_MAX_SIZE = int(os.environ.get('NETSUITE_CONNECTION_POOL_MAX_SIZE', 50))
+NETSUITE_EXPORT_BATCH_SIZE = int(os.environ.get('NETSUITE_EXPORT_BATCH_SIZE', 50))
+ACCOUNTING_EXPORT_SUMMARY_BATCH_SIZE = int(os.environ.get('ACCOUNTING_EXPORT_SUMMARY_BATCH_SIZE', 20))
+NETSUITE_DIMENSION_SYNC_MAX_WORKERS = int(os.environ.get('NETSUITE_DIMENSION_SYNC_MAX_WORKERS', 4))
+NETSUITE_ACCOUNT_CONCURRENCY_LIMIT = int(os.environ.get('NETSUITE_ACCOUNT_CONCURRENCY_LIMIT', 4))
+NETSUITE_ACCOUNT_SLOT_TTL = int(os.environ.get('NETSUITE_ACCOUNT_SLOT_TTL', 1800))
+NETSUITE_ACCOUNT_SLOT_WAIT_TIMEOUT = int(os.environ.get('NETSUITE_ACCOUNT_SLOT_WAIT_TIMEOUT', 300))
+NETSUITE_FULL_SYNC_INTERVAL_DAYS = int(os.environ.get('NETSUITE_FULL_SYNC_INTERVAL_DAYS', 7))
+NETSUITE_ATTRIBUTE_COUNT_CACHE_TTL = int(os.environ.get('NETSUITE_ATTRIBUTE_COUNT_CACHE_TTL', 21600))
+NETSUITE_SEARCH_ID_TTL = int(os.environ.get('NETSUITE_SEARCH_ID_TTL', 900))
+NETSUITE_GET_LIST_BATCH_SIZE = int(os.environ.get('NETSUITE_GET_LIST_BATCH_SIZE', 500))
+FYLE_MARK_PAID_BATCH_SIZE = int(os.environ.get('FYLE_MARK_PAID_BATCH_SIZE', 50))
+NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS = int(os.environ.get('NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS', 4))
+FYLE_FILE_URLS_BATCH_SIZE = int(os.environ.get('FYLE_FILE_URLS_BATCH_SIZE', 20))
+EXPENSE_GROUPING_BATCH_SIZE = int(os.environ.get('EXPENSE_GROUPING_BATCH_SIZE', 100))
 
 CACHE_EXPIRY = 3600
 
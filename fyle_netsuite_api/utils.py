@@ -4,6 +4,7 @@ import logging
 from collections import OrderedDict
 from apps.workspaces.models import NetSuiteCredentials
 from apps.workspaces.tasks import patch_integration_settings
+from apps.netsuite.connection_pool import netsuite_connection_pool
 
 logger = logging.getLogger(__name__)
 logger.level = logging.INFO
@@ -68,3 +69,4 @@ def invalidate_netsuite_credentials(workspace_id, netsuite_credentials=None):
             patch_integration_settings(workspace_id, is_token_expired=True)
         netsuite_credentials.is_expired = True
         netsuite_credentials.save()
+        netsuite_connection_pool.invalidate(netsuite_credentials.id)
@@ -1,5 +1,6 @@
 import json
 from os import path
+from types import SimpleNamespace
 
 def dict_compare_keys(d1, d2, key_path=''):
     """
@@ -34,3 +35,18 @@ def get_response_dict(filename):
     mock_json = open(filepath, 'r').read()
     mock_dict = json.loads(mock_json)
     return mock_dict
+
+
+def get_search_results(pages_by_type):
+    """
+    Side effect of NetSuiteConnector.get_search_results_generator returning
+    the search results of the pages of the record type
+    """
+    def get_search_results_generator(api, search, search_id=None, page_index=0):
+        pages = pages_by_type.get(api.type_name, [])
+        return [
+            SimpleNamespace(searchId='search-{}'.format(api.type_name), pageIndex=index, totalPages=len(pages), records=records)
+            for index, records in enumerate(pages, 1)
+        ][page_index:]
+
+    return get_search_results_generator
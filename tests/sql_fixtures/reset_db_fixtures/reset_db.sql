@@ -475,6 +475,12 @@ BEGIN
     GET DIAGNOSTICS rcount = ROW_COUNT;
     RAISE NOTICE 'Deleted % netsuite_attributes_count', rcount;
 
+    DELETE
+    FROM netsuite_dimension_sync_states ndss
+    WHERE ndss.workspace_id = _workspace_id;
+    GET DIAGNOSTICS rcount = ROW_COUNT;
+    RAISE NOTICE 'Deleted % netsuite_dimension_sync_states', rcount;
+
     DELETE
     FROM django_q_schedule dqs
     WHERE dqs.args = _workspace_id::varchar(255);
@@ -2683,7 +2689,13 @@ CREATE TABLE public.feature_configs (
     created_at timestamp with time zone NOT NULL,
     updated_at timestamp with time zone NOT NULL,
     workspace_id integer NOT NULL,
-    skip_posting_gross_amount boolean NOT NULL
+    skip_posting_gross_amount boolean NOT NULL,
+    export_in_batches boolean NOT NULL,
+    stream_expense_import boolean NOT NULL,
+    parallel_dimension_sync boolean NOT NULL,
+    incremental_dimension_sync boolean NOT NULL,
+    bulk_status_polling boolean NOT NULL,
+    incremental_status_sync boolean NOT NULL
 );
 
 
@@ -3207,6 +3219,41 @@ ALTER TABLE public.netsuite_attributes_count ALTER COLUMN id ADD GENERATED BY DE
 );
 
 
+--
+-- Name: netsuite_dimension_sync_states; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.netsuite_dimension_sync_states (
+    id integer NOT NULL,
+    dimension character varying(255) NOT NULL,
+    last_modified_at timestamp with time zone,
+    last_full_sync_at timestamp with time zone,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    workspace_id integer NOT NULL,
+    checkpoint jsonb,
+    sync_duration double precision,
+    sync_error text,
+    synced_count integer
+);
+
+
+ALTER TABLE public.netsuite_dimension_sync_states OWNER TO postgres;
+
+--
+-- Name: netsuite_dimension_sync_states_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+ALTER TABLE public.netsuite_dimension_sync_states ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (
+    SEQUENCE NAME public.netsuite_dimension_sync_states_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+
 --
 -- Name: netsuite_credentials; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -9721,6 +9768,15 @@ COPY public.django_migrations (id, app, name, applied) FROM stdin;
 256	tasks	0018_tasklog_stuck_export_re_attempt_count	2026-02-02 13:37:07.282489+00
 257	internal	0015_auto_generated_sql	2026-02-18 11:04:54.592119+00
 258	workspaces	0053_featureconfig_skip_posting_gross_amount	2026-02-18 11:04:54.602262+00
+259	workspaces	0054_featureconfig_export_in_batches	2026-10-17 09:12:41.318204+00
+260	workspaces	0055_featureconfig_stream_expense_import	2026-10-17 10:04:12.518730+00
+261	workspaces	0056_featureconfig_parallel_dimension_sync	2026-10-17 20:12:03.114520+00
+262	workspaces	0057_featureconfig_incremental_dimension_sync	2026-10-17 21:03:11.482310+00
+263	netsuite	0030_netsuitedimensionsyncstate	2026-10-17 21:03:11.913027+00
+264	netsuite	0031_netsuitedimensionsyncstate_checkpoint	2026-10-17 21:41:27.302118+00
+265	netsuite	0032_netsuitedimensionsyncstate_sync_stats	2026-10-17 22:06:48.715402+00
+266	workspaces	0058_featureconfig_bulk_status_polling	2026-10-17 22:42:05.271904+00
+267	workspaces	0059_featureconfig_incremental_status_sync	2026-10-17 23:09:17.604183+00
 \.
 
 
@@ -13387,10 +13443,10 @@ COPY public.failed_events (id, routing_key, payload, created_at, updated_at, err
 -- Data for Name: feature_configs; Type: TABLE DATA; Schema: public; Owner: postgres
 --
 
-COPY public.feature_configs (id, export_via_rabbitmq, fyle_webhook_sync_enabled, created_at, updated_at, workspace_id, skip_posting_gross_amount) FROM stdin;
-1	f	t	2025-10-27 18:05:08.532618+00	2025-10-27 18:05:08.532618+00	1	f
-2	f	t	2025-10-27 18:05:08.532618+00	2025-10-27 18:05:08.532618+00	2	f
-3	f	t	2025-10-27 18:05:08.532618+00	2025-10-27 18:05:08.532618+00	49	f
+COPY public.feature_configs (id, export_via_rabbitmq, fyle_webhook_sync_enabled, created_at, updated_at, workspace_id, skip_posting_gross_amount, export_in_batches, stream_expense_import, parallel_dimension_sync, incremental_dimension_sync, bulk_status_polling, incremental_status_sync) FROM stdin;
+1	f	t	2025-10-27 18:05:08.532618+00	2025-10-27 18:05:08.532618+00	1	f	f	f	f	f	f	f
+2	f	t	2025-10-27 18:05:08.532618+00	2025-10-27 18:05:08.532618+00	2	f	f	f	f	f	f	f
+3	f	t	2025-10-27 18:05:08.532618+00	2025-10-27 18:05:08.532618+00	49	f	f	f	f	f	f	f
 \.
 
 
@@ -13502,6 +13558,14 @@ COPY public.netsuite_attributes_count (id, accounts_count, expense_categories_co
 \.
 
 
+--
+-- Data for Name: netsuite_dimension_sync_states; Type: TABLE DATA; Schema: public; Owner: postgres
+--
+
+COPY public.netsuite_dimension_sync_states (id, dimension, last_modified_at, last_full_sync_at, created_at, updated_at, workspace_id, checkpoint, sync_duration, sync_error, synced_count) FROM stdin;
+\.
+
+
 --
 -- Data for Name: netsuite_credentials; Type: TABLE DATA; Schema: public; Owner: postgres
 --
@@ -13685,7 +13749,7 @@ SELECT pg_catalog.setval('public.django_content_type_id_seq', 51, true);
 -- Name: django_migrations_id_seq; Type: SEQUENCE SET; Schema: public; Owner: postgres
 --
 
-SELECT pg_catalog.setval('public.django_migrations_id_seq', 258, true);
+SELECT pg_catalog.setval('public.django_migrations_id_seq', 267, true);
 
 
 --
@@ -13877,6 +13941,13 @@ SELECT pg_catalog.setval('public.last_export_details_id_seq', 26, true);
 SELECT pg_catalog.setval('public.netsuite_attributes_count_id_seq', 3, true);
 
 
+--
+-- Name: netsuite_dimension_sync_states_id_seq; Type: SEQUENCE SET; Schema: public; Owner: postgres
+--
+
+SELECT pg_catalog.setval('public.netsuite_dimension_sync_states_id_seq', 1, false);
+
+
 --
 -- Name: reimbursements_id_seq; Type: SEQUENCE SET; Schema: public; Owner: postgres
 --
@@ -14576,6 +14647,22 @@ ALTER TABLE ONLY public.netsuite_attributes_count
     ADD CONSTRAINT netsuite_attributes_count_workspace_id_key UNIQUE (workspace_id);
 
 
+--
+-- Name: netsuite_dimension_sync_states netsuite_dimension_sync_states_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.netsuite_dimension_sync_states
+    ADD CONSTRAINT netsuite_dimension_sync_states_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: netsuite_dimension_sync_states netsuite_dimension_sync__workspace_id_dimension_38f41323_uniq; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.netsuite_dimension_sync_states
+    ADD CONSTRAINT netsuite_dimension_sync__workspace_id_dimension_38f41323_uniq UNIQUE (workspace_id, dimension);
+
+
 --
 -- Name: reimbursements reimbursements_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -15119,6 +15206,13 @@ CREATE INDEX mapping_settings_expense_field_id_e9afc6c2 ON public.mapping_settin
 CREATE INDEX netsuite_attributes_count_updated_at_bfe333ef ON public.netsuite_attributes_count USING btree (updated_at);
 
 
+--
+-- Name: netsuite_dimension_sync_states_workspace_id_4653d619; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX netsuite_dimension_sync_states_workspace_id_4653d619 ON public.netsuite_dimension_sync_states USING btree (workspace_id);
+
+
 --
 -- Name: reimbursements_workspace_id_084805e4; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -15730,6 +15824,14 @@ ALTER TABLE ONLY public.netsuite_attributes_count
     ADD CONSTRAINT netsuite_attributes__workspace_id_af7c948a_fk_workspace FOREIGN KEY (workspace_id) REFERENCES public.workspaces(id) DEFERRABLE INITIALLY DEFERRED;
 
 
+--
+-- Name: netsuite_dimension_sync_states netsuite_dimension_s_workspace_id_4653d619_fk_workspace; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.netsuite_dimension_sync_states
+    ADD CONSTRAINT netsuite_dimension_s_workspace_id_4653d619_fk_workspace FOREIGN KEY (workspace_id) REFERENCES public.workspaces(id) DEFERRABLE INITIALLY DEFERRED;
+
+
 --
 -- Name: netsuite_credentials netsuite_credentials_workspace_id_ea4544bd_fk_workspaces_id; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
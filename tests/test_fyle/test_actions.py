@@ -14,7 +14,8 @@ from apps.fyle.actions import (
     mark_accounting_export_summary_as_synced,
     update_complete_expenses,
     bulk_post_accounting_export_summary,
-    update_failed_expenses
+    update_failed_expenses,
+    post_accounting_export_summary
 )
 from apps.fyle.helpers import get_updated_accounting_export_summary
 
@@ -176,6 +177,32 @@ def test_mark_accounting_export_summary_as_synced(db):
     for expense in expenses:
         assert expense.accounting_export_summary['synced'] == True
 
+def test_post_accounting_export_summary_in_batches(db):
+    expenses = Expense.objects.filter(workspace_id=1)
+    for expense in expenses:
+        expense.accounting_export_summary = get_updated_accounting_export_summary(
+            expense.expense_id,
+            'SKIPPED',
+            None,
+            '{}/main/export_log'.format(settings.NETSUITE_INTEGRATION_APP_URL),
+            False
+        )
+        expense.save()
+
+    expense_count = expenses.count()
+
+    with mock.patch('fyle.platform.apis.v1.admin.Expenses.post_bulk_accounting_export_summary') as mock_call:
+        post_accounting_export_summary(1, batch_size=2)
+
+    assert mock_call.call_count == (expense_count + 1) // 2
+    assert all(len(call.args[0]) <= 2 for call in mock_call.call_args_list)
+    assert sum(len(call.args[0]) for call in mock_call.call_args_list) == expense_count
+
+    for expense in Expense.objects.filter(workspace_id=1):
+        assert expense.accounting_export_summary['synced'] == True
+        assert expense.previous_export_state == 'SKIPPED'
+
+
 def test_bulk_post_accounting_export_summary(db):
     fyle_credentails = FyleCredential.objects.get(workspace_id=1)
     platform = PlatformConnector(fyle_credentails)
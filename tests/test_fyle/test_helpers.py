@@ -789,3 +789,43 @@ def test_assert_valid_request():
     with pytest.raises(ValidationError) as exc_info:
         assert_valid_request(workspace_id=1, fyle_org_id='invalid_org_id')
     assert 'Workspace not found' in str(exc_info.value)
+
+
+def test_get_expenses_query_params():
+    settled_at = datetime(2024, 1, 1, 10, 30)
+
+    query_params = get_expenses_query_params(['PERSONAL_CASH_ACCOUNT'], 'PAYMENT_PROCESSING', settled_at=settled_at)
+    assert query_params == {
+        'order': 'created_at.asc,id.asc',
+        'source_account->type': 'eq.PERSONAL_CASH_ACCOUNT',
+        'state': 'in.("PAYMENT_PROCESSING", "PAID")',
+        'last_settled_at': 'gte.2024-01-01T10:30:00.000Z'
+    }
+
+    query_params = get_expenses_query_params(['PERSONAL_CORPORATE_CREDIT_CARD_ACCOUNT'], 'APPROVED', approved_at=settled_at)
+    assert query_params['state'] == 'in.("APPROVED", "PAYMENT_PROCESSING", "PAID")'
+    assert query_params['report_last_approved_at'] == 'gte.2024-01-01T10:30:00.000Z'
+
+    query_params = get_expenses_query_params(['PERSONAL_CORPORATE_CREDIT_CARD_ACCOUNT'], 'PAID')
+    assert query_params['state'] == 'eq.PAID'
+    assert 'report_last_paid_at' not in query_params
+
+
+def test_get_expenses_in_pages(mocker, db):
+    list_all = mocker.patch(
+        'fyle.platform.apis.v1.admin.Expenses.list_all',
+        return_value=[{'data': [{'id': 'txPersonal', 'is_reimbursable': False, 'source_account': {'type': 'PERSONAL_CASH_ACCOUNT'}}]}]
+    )
+    construct_expense_object = mocker.patch(
+        'fyle_integrations_platform_connector.apis.Expenses.construct_expense_object',
+        return_value=[]
+    )
+
+    fyle_credentials = FyleCredential.objects.get(workspace_id=1)
+    platform = PlatformConnector(fyle_credentials)
+
+    pages = list(get_expenses_in_pages(platform, ['PERSONAL_CASH_ACCOUNT'], 'PAID'))
+
+    assert pages == [[]]
+    assert list_all.call_args.args[0]['state'] == 'eq.PAID'
+    construct_expense_object.assert_called_once_with([], 1)
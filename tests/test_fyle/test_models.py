@@ -1,14 +1,17 @@
+import copy
 import json
+from types import SimpleNamespace
 from urllib import response
 from unittest import mock
 from django.urls import reverse
 import pytest
 from apps.fyle.models import Expense, ExpenseGroup, Reimbursement, get_default_expense_group_fields, get_default_expense_state, \
-    ExpenseGroupSettings, _group_expenses, get_default_ccc_expense_state
+    ExpenseGroupSettings, _group_expenses, get_default_ccc_expense_state, filter_expense_groups
 from apps.workspaces.models import Configuration, Workspace
 from apps.tasks.models import TaskLog
 from apps.fyle.tasks import create_expense_groups
 from tests.test_fyle.fixtures import data
+from fyle_accounting_library.fyle_platform.enums import ExpenseImportSourceEnum
 
 
 @pytest.mark.django_db()
@@ -28,6 +31,26 @@ def test_create_expense(create_temp_workspace):
     assert expense.fund_source == 'PERSONAL'
 
 
+def test_create_expense_objects_upsert(create_temp_workspace, django_assert_max_num_queries):
+    expenses = copy.deepcopy(data['expenses'])
+
+    with django_assert_max_num_queries(3):
+        expense_objects = Expense.create_expense_objects(expenses, 1, imported_from=ExpenseImportSourceEnum.DASHBOARD_SYNC)
+
+    assert [expense.expense_id for expense in expense_objects] == [expense['id'] for expense in expenses]
+    assert all(expense.imported_from == ExpenseImportSourceEnum.DASHBOARD_SYNC for expense in expense_objects)
+
+    expense_group = ExpenseGroup.objects.create(workspace_id=1, fund_source='PERSONAL', description={})
+    expense_group.expenses.add(expense_objects[0])
+
+    expenses[1]['purpose'] = 'updated purpose'
+    expense_objects = Expense.create_expense_objects(expenses, 1, imported_from=ExpenseImportSourceEnum.WEBHOOK)
+
+    assert [expense.expense_id for expense in expense_objects] == [expenses[1]['id']]
+    assert expense_objects[0].purpose == 'updated purpose'
+    assert expense_objects[0].imported_from == ExpenseImportSourceEnum.DASHBOARD_SYNC
+
+
 def test_default_fields():
     expense_group_field = get_default_expense_group_fields()
     expense_state = get_default_expense_state()
@@ -104,6 +127,63 @@ def test_create_expense_groups_by_report_id_fund_source(db):
     assert len(expense_groups) == 2
 
 
+def test_create_expense_groups_by_report_id_fund_source_in_bulk(db, django_assert_max_num_queries):
+    expenses = data['expenses']
+
+    expense_objects = Expense.create_expense_objects(expenses, 49)
+    configuration = Configuration.objects.get(workspace_id=49)
+    existing_expense_group_ids = list(ExpenseGroup.objects.values_list('id', flat=True))
+
+    with django_assert_max_num_queries(3):
+        ExpenseGroup.create_expense_groups_by_report_id_fund_source(expense_objects, configuration, 49)
+
+    expense_groups = ExpenseGroup.objects.exclude(id__in=existing_expense_group_ids)
+
+    assert sum(expense_group.expenses.count() for expense_group in expense_groups) == len(expense_objects)
+    for expense_group in expense_groups:
+        first_expense = expense_group.expenses.order_by('id').first()
+        assert expense_group.employee_name == first_expense.employee_name
+        assert expense_group.description['report_id'] == first_expense.report_id
+
+
+def test_filter_expense_groups_scales_linearly():
+    attribute_reads = []
+
+    class CountedExpense(SimpleNamespace):
+        def __getattribute__(self, name):
+            if not name.startswith('__'):
+                attribute_reads.append(name)
+            return super().__getattribute__(name)
+
+    def build_expense_groups(count):
+        expenses = [
+            CountedExpense(id=expense_id, amount=-10 if expense_id % 4 == 0 else 5, spent_at=expense_id % 3)
+            for expense_id in range(count)
+        ]
+        expense_groups = [
+            {'expense_ids': [expense_id for expense_id in range(index, min(index + 5, count))]}
+            for index in range(0, count, 5)
+        ]
+        return expense_groups, expenses
+
+    expense_groups, expenses = build_expense_groups(8)
+    filtered_expense_groups, skipped_expense_ids = filter_expense_groups(
+        expense_groups, expenses, ['report_id', 'spent_at'], 'EXPENSE REPORT', None
+    )
+    assert skipped_expense_ids == [0, 4]
+    assert [expense_group['expense_ids'] for expense_group in filtered_expense_groups] == [[1, 2, 3], [5, 6, 7]]
+
+    expense_groups, expenses = build_expense_groups(5000)
+    attribute_reads.clear()
+    filtered_expense_groups, _ = filter_expense_groups(
+        expense_groups, expenses, ['report_id', 'spent_at'], 'EXPENSE REPORT', None
+    )
+
+    assert len(filtered_expense_groups) == 1000
+    # each expense is read a fixed number of times, a scan of all expenses per group would read 1000x as often
+    assert len(attribute_reads) <= 10 * len(expenses)
+
+
 def test_create_reimbursement(db):
 
     reimbursements = data['reimbursements']
@@ -1,6 +1,7 @@
 import hashlib
 import pytest
 import json
+from copy import deepcopy
 from datetime import datetime, timezone
 from django.db.models import Q
 from fyle_accounting_library.fyle_platform.enums import ExpenseImportSourceEnum
@@ -27,7 +28,7 @@ from apps.fyle.tasks import (
     _handle_expense_ejected_from_report,
     handle_category_changes_for_expense
 )
-from apps.workspaces.models import Configuration, FyleCredential, Workspace
+from apps.workspaces.models import Configuration, FeatureConfig, FyleCredential, Workspace
 from .fixtures import data
 from django.urls import reverse
 from rest_framework.exceptions import ValidationError
@@ -38,6 +39,7 @@ from apps.fyle.actions import mark_expenses_as_skipped
 from fyle.platform.exceptions import InvalidTokenError, InternalServerError
 from apps.fyle.models import ExpenseFilter
 from apps.fyle.tasks import group_expenses_and_save
+from apps.fyle import tasks as fyle_tasks
 
 
 @pytest.mark.django_db()
@@ -98,6 +100,87 @@ def test_create_expense_group(mocker, add_fyle_credentials):
         assert mock_call.call_count == 2
 
 
+@pytest.mark.django_db()
+def test_create_expense_group_streaming(mocker, add_fyle_credentials):
+    task_log, _ = TaskLog.objects.update_or_create(
+        workspace_id=1,
+        type='FETCHING_EXPENSES',
+        defaults={
+            'status': 'IN_PROGRESS'
+        }
+    )
+
+    expense_group_settings = ExpenseGroupSettings.objects.get(workspace_id=1)
+    expense_group_settings.import_card_credits = True
+    expense_group_settings.save()
+
+    FeatureConfig.objects.filter(workspace_id=1).update(stream_expense_import=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='stream_expense_import')
+
+    def failing_pages():
+        yield data['expenses'][:1]
+        raise InternalServerError('Error')
+
+    get_expenses_in_pages = mocker.patch('apps.fyle.tasks.get_expenses_in_pages')
+    get_expenses_in_pages.side_effect = [failing_pages()]
+
+    last_synced_at = Workspace.objects.get(id=1).last_synced_at
+    expense_group_count = ExpenseGroup.objects.filter(workspace_id=1).count()
+    expenses_count = Expense.objects.filter(org_id='or79Cob97KSh').count()
+
+    create_expense_groups(1, ['PERSONAL', 'CCC'], task_log, ExpenseImportSourceEnum.DASHBOARD_SYNC)
+
+    assert Expense.objects.filter(org_id='or79Cob97KSh').count() == expenses_count + 1
+    assert ExpenseGroup.objects.filter(workspace_id=1).count() == expense_group_count
+    assert Workspace.objects.get(id=1).last_synced_at == last_synced_at
+    assert TaskLog.objects.get(id=task_log.id).status == 'FAILED'
+
+    get_expenses_in_pages.side_effect = [iter([data['expenses'][:1], data['expenses'][1:]]), iter([])]
+
+    create_expense_groups(1, ['PERSONAL', 'CCC'], task_log, ExpenseImportSourceEnum.DASHBOARD_SYNC)
+
+    assert Expense.objects.filter(org_id='or79Cob97KSh').count() == expenses_count + 2
+    assert ExpenseGroup.objects.filter(workspace_id=1).count() == expense_group_count + 2
+    assert Workspace.objects.get(id=1).last_synced_at != last_synced_at
+    assert TaskLog.objects.get(id=task_log.id).status == 'COMPLETE'
+
+
+@pytest.mark.django_db()
+def test_create_expense_group_streaming_in_employee_batches(mocker, add_fyle_credentials, settings):
+    settings.EXPENSE_GROUPING_BATCH_SIZE = 1
+
+    task_log, _ = TaskLog.objects.update_or_create(
+        workspace_id=1,
+        type='FETCHING_EXPENSES',
+        defaults={
+            'status': 'IN_PROGRESS'
+        }
+    )
+
+    expense_group_settings = ExpenseGroupSettings.objects.get(workspace_id=1)
+    expense_group_settings.import_card_credits = True
+    expense_group_settings.save()
+
+    FeatureConfig.objects.filter(workspace_id=1).update(stream_expense_import=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='stream_expense_import')
+
+    expenses = deepcopy(data['expenses'])
+    expenses[1]['employee_email'] = 'aryastark@fyle.in'
+
+    get_expenses_in_pages = mocker.patch('apps.fyle.tasks.get_expenses_in_pages')
+    get_expenses_in_pages.side_effect = [iter([expenses]), iter([])]
+    group_expense_objects_and_save = mocker.spy(fyle_tasks, 'group_expense_objects_and_save')
+
+    expense_group_count = ExpenseGroup.objects.filter(workspace_id=1).count()
+
+    create_expense_groups(1, ['PERSONAL', 'CCC'], task_log, ExpenseImportSourceEnum.DASHBOARD_SYNC)
+
+    assert group_expense_objects_and_save.call_count == 2
+    assert [len(call.args[0]) for call in group_expense_objects_and_save.call_args_list] == [1, 1]
+    assert ExpenseGroup.objects.filter(workspace_id=1).count() == expense_group_count + 2
+    assert TaskLog.objects.get(id=task_log.id).status == 'COMPLETE'
+
+
 @pytest.mark.django_db()
 def test_create_expense_group_skipped_flow(mocker, api_client, add_fyle_credentials, access_token):
     #adding the expense-filter
@@ -52,6 +52,37 @@ def test_stuck_export_found_and_reexported(
     mock_export.assert_called_once()
 
 
+def test_stuck_export_queued_in_batch_is_skipped(
+    db, mocker, create_workspace_for_stuck_export, create_expense_group_with_expenses
+):
+    workspace = create_workspace_for_stuck_export
+    expense_group = create_expense_group_with_expenses
+
+    stuck_time = datetime.now(tz=timezone.utc) - timedelta(minutes=90)
+    task_log = TaskLog.objects.create(
+        workspace_id=workspace.id,
+        expense_group_id=expense_group.id,
+        type='CREATING_BILL',
+        status='ENQUEUED',
+        stuck_export_re_attempt_count=0
+    )
+    TaskLog.objects.filter(id=task_log.id).update(updated_at=stuck_time)
+
+    mock_export = mocker.patch('apps.internal.tasks.export_to_netsuite')
+    mocker.patch('apps.internal.tasks.update_failed_expenses')
+    mocker.patch('apps.internal.tasks.post_accounting_export_summary')
+    mocker.patch('apps.internal.tasks.OrmQ.objects.all', return_value=[
+        mock.Mock(task={'chain': [
+            ['apps.netsuite.tasks.create_exports_in_batch', ['CREATING_BILL', [expense_group.id], [task_log.id], True, False], {}]
+        ]})
+    ])
+    mocker.patch('apps.internal.tasks.Schedule.objects.filter', return_value=mock.Mock(filter=mock.Mock(return_value=mock.Mock(first=mock.Mock(return_value=None)))))
+
+    re_export_stuck_exports()
+
+    mock_export.assert_not_called()
+
+
 def test_max_attempts_limit_excludes_task(
     db, mocker, create_workspace_for_stuck_export, create_expense_group_with_expenses
 ):
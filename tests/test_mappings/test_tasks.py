@@ -14,6 +14,7 @@ from apps.mappings.tasks import *
 from apps.mappings.models import GeneralMapping
 from tests.test_netsuite.fixtures import data as netsuite_data
 from tests.test_fyle.fixtures import data as fyle_data
+from tests.helper import get_search_results
 from fyle.platform.exceptions import (
     WrongParamsError,
     InvalidTokenError as FyleInvalidTokenError,
@@ -99,8 +100,8 @@ def test_async_auto_map_employees(mocker, db):
     )
 
     mocker.patch(
-        'netsuitesdk.api.vendors.Vendors.get_records_generator',
-        return_value=netsuite_data['get_all_vendors']    
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Vendor': netsuite_data['get_all_vendors'], 'Employee': netsuite_data['get_all_employees']})
     )
 
     mocker.patch(
@@ -108,10 +109,6 @@ def test_async_auto_map_employees(mocker, db):
         return_value=fyle_data['get_all_employees']
     )
 
-    mocker.patch(
-        'netsuitesdk.api.employees.Employees.get_all_generator',
-        return_value=netsuite_data['get_all_employees']    
-    )
     mocker.patch(
         'netsuitesdk.api.employees.Employees.get',
         return_value=netsuite_data['get_all_employees'][0][0]
@@ -144,8 +141,8 @@ def test_schedule_auto_map_employees(mocker, db):
     )
 
     mocker.patch(
-        'netsuitesdk.api.employees.Employees.get_all_generator',
-        return_value=netsuite_data['get_all_employees']    
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Employee': netsuite_data['get_all_employees']})
     )
 
     mocker.patch(
@@ -286,8 +283,8 @@ def test_auto_create_netsuite_employees_on_fyle(db, mocker):
         return_value=6
     )
     mocker.patch(
-        'netsuitesdk.api.employees.Employees.get_all_generator',
-        return_value=netsuite_data['get_all_employees']    
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Employee': netsuite_data['get_all_employees']})
     )
     mocker.patch(
         'netsuitesdk.api.employees.Employees.get',
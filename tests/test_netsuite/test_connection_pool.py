@@ -0,0 +1,72 @@
+from django.core.cache import cache
+
+from apps.netsuite.connection_pool import NetSuiteConnectionPool, netsuite_connection_pool, ACCOUNT_SLOT_CACHE_KEY, \
+    account_slot, acquire_account_slot, get_slot_owner, holds_account_slot
+from apps.netsuite.connector import NetSuiteConnector
+from apps.workspaces.models import NetSuiteCredentials
+from fyle_netsuite_api.utils import invalidate_netsuite_credentials
+
+
+def test_get_connection_reuses_connection(db):
+    pool = NetSuiteConnectionPool(idle_timeout=900, max_size=10)
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+
+    connection = pool.get_connection(netsuite_credentials)
+    assert pool.get_connection(netsuite_credentials) is connection
+    assert pool.get_connection(netsuite_credentials, page_size=100) is not connection
+    assert len(pool) == 2
+
+    netsuite_credentials.save()
+    assert pool.get_connection(netsuite_credentials) is not connection
+
+
+def test_get_connection_evicts_idle_connections(db, mocker):
+    mocker.patch('apps.netsuite.connection_pool.time.monotonic', side_effect=[0, 1000, 1001, 1002])
+    pool = NetSuiteConnectionPool(idle_timeout=900, max_size=10)
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+
+    connection = pool.get_connection(netsuite_credentials)
+    assert pool.get_connection(netsuite_credentials) is not connection
+    assert len(pool) == 1
+
+    pool = NetSuiteConnectionPool(idle_timeout=900, max_size=1)
+    pool.get_connection(netsuite_credentials)
+    pool.get_connection(netsuite_credentials, page_size=100)
+    assert len(pool) == 1
+
+
+def test_invalidate_netsuite_credentials_clears_pool(db, mocker):
+    mocker.patch('fyle_netsuite_api.utils.patch_integration_settings')
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+    assert NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1).connection is netsuite_connection.connection
+    assert netsuite_connection_pool.has_connections(netsuite_credentials.id)
+
+    invalidate_netsuite_credentials(1, netsuite_credentials)
+
+    assert not netsuite_connection_pool.has_connections(netsuite_credentials.id)
+
+
+def test_account_slot_is_shared_through_cache(db, mocker, settings):
+    settings.NETSUITE_ACCOUNT_CONCURRENCY_LIMIT = 1
+    settings.NETSUITE_ACCOUNT_SLOT_WAIT_TIMEOUT = 0
+    slot_key = ACCOUNT_SLOT_CACHE_KEY.format(ns_account_id='TSTDRV2089588', slot=0)
+
+    # Slot held by a worker in another process
+    cache.set(slot_key, 'another-worker', 60)
+    assert acquire_account_slot('TSTDRV2089588') is None
+
+    with account_slot('TSTDRV2089588'):
+        assert holds_account_slot('TSTDRV2089588')
+    assert cache.get(slot_key) == 'another-worker'
+
+    settings.NETSUITE_ACCOUNT_SLOT_WAIT_TIMEOUT = 5
+    sleep = mocker.patch('apps.netsuite.connection_pool.time.sleep', side_effect=lambda _: cache.delete(slot_key))
+
+    with account_slot('TSTDRV2089588'):
+        assert cache.get(slot_key) == get_slot_owner()
+
+    assert sleep.call_count == 1
+    assert cache.get(slot_key) is None
+    assert not holds_account_slot('TSTDRV2089588')
@@ -1,15 +1,22 @@
 import pytest
+import threading
 from copy import deepcopy
-from datetime import datetime
+from types import SimpleNamespace
+from datetime import datetime, timedelta
 from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from apps.fyle.models import ExpenseGroup
 from fyle_accounting_mappings.models import DestinationAttribute, ExpenseAttribute, Mapping, CategoryMapping
-from apps.netsuite.connector import NetSuiteConnector, NetSuiteCredentials
+from apps.netsuite.connector import NetSuiteConnector, NetSuiteCredentials, SyncContext
+from apps.netsuite.connection_pool import ACCOUNT_SLOT_CACHE_KEY, account_slot, get_slot_owner, netsuite_connection_pool
+from apps.netsuite.models import CustomSegment, NetSuiteAttributesCount, NetSuiteDimensionSyncState
 from apps.workspaces.models import Configuration, Workspace, FeatureConfig
 from apps.mappings.models import GeneralMapping
 from netsuitesdk import NetSuiteRequestError
-from tests.helper import dict_compare_keys
+from zeep import xsd
+from tests.helper import dict_compare_keys, get_search_results
 from .fixtures import data
 import logging
 
@@ -398,14 +405,65 @@ def test_get_expense_report(mocker, db):
     expense_report = netsuite_connection.get_expense_report(85327)
     assert dict_compare_keys(expense_report, data['get_expense_report_response'][0]) == [], 'get expense report returns diff in keys'
 
+
+def test_get_transaction_statuses(mocker, db, settings):
+    settings.NETSUITE_GET_LIST_BATCH_SIZE = 2
+    request = mocker.patch('netsuitesdk.internal.client.NetSuiteClient.request')
+    request.return_value.body.readResponseList = {
+        'status': {'isSuccess': True},
+        'readResponse': [
+            {'status': {'isSuccess': True}, 'record': {'internalId': '238', 'status': 'Paid In Full'}},
+            {'status': {'isSuccess': False, 'statusDetail': [{'code': 'RCRD_DSNT_EXIST'}]}, 'record': None}
+        ]
+    }
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    statuses = netsuite_connection.get_transaction_statuses('vendorBill', [238, 239, 240])
+
+    assert statuses == {'238': 'Paid In Full'}
+    assert request.call_count == 2
+    assert len(request.call_args_list[0].kwargs['baseRef']) == 2
+
+def test_post_attachments(mocker, db, settings):
+    settings.NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS = 2
+
+    def post_file(data):
+        if data['externalId'] == 'txfailed':
+            raise NetSuiteRequestError('An unexpected error occurred', code='UNEXPECTED_ERROR')
+        return {'internalId': '1', 'externalId': data['externalId'], 'type': 'file', 'name': data['name']}
+
+    post = mocker.patch('netsuitesdk.api.files.Files.post', side_effect=post_file)
+    get = mocker.patch('netsuitesdk.api.files.Files.get', return_value={'url': 'https://aaa.bbb.cc/x232sds'})
+
+    download = mocker.patch('apps.netsuite.connector.requests.get', return_value=mocker.MagicMock(content=b'receipt'))
+
+    attachment = {'id': 'fi1', 'name': 'receipt.pdf', 'download_url': 'https://aaa.bbb.cc/fi1'}
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+    get_connection = mocker.spy(netsuite_connection_pool, 'get_connection')
+
+    receipt_urls = netsuite_connection.post_attachments(
+        {'tx1': attachment, 'tx2': attachment, 'txfailed': attachment},
+        {'name': None, 'internalId': None, 'externalId': 'or79Cob97KSh', 'type': 'folder'}
+    )
+
+    assert receipt_urls == {'tx1': 'https://aaa.bbb.cc/x232sds', 'tx2': 'https://aaa.bbb.cc/x232sds'}
+    assert post.call_count == 3
+    assert post.call_args_list[0].args[0]['content'] == b'receipt'
+    assert get.call_count == 2
+    download.assert_called_with('https://aaa.bbb.cc/fi1')
+    # one connector per worker thread, not per upload
+    assert get_connection.call_count <= settings.NETSUITE_ATTACHMENT_UPLOAD_MAX_WORKERS
+
 def test_sync_vendors(mocker, db):
     mocker.patch(
         'netsuitesdk.api.vendors.Vendors.count',
         return_value=0
     )
     mocker.patch(
-        'netsuitesdk.api.vendors.Vendors.get_records_generator',
-        return_value=data['get_all_vendors']   
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Vendor': data['get_all_vendors']})
     )
     netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
     netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
@@ -419,6 +477,91 @@ def test_sync_vendors(mocker, db):
     assert new_vendors_count == 7
 
 
+def get_vendor_search_results(search_id):
+    vendors = data['get_all_vendors'][0]
+    return [
+        SimpleNamespace(searchId=search_id, totalRecords=len(vendors), totalPages=2, pageIndex=1, records=vendors[:2]),
+        SimpleNamespace(searchId=search_id, totalRecords=len(vendors), totalPages=2, pageIndex=2, records=vendors[2:])
+    ]
+
+
+def interrupt_vendors_sync(mocker):
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.count',
+        return_value=0
+    )
+    mocker.patch('apps.netsuite.connector.NetSuiteConnector.get_search_record')
+    search = mocker.patch(
+        'netsuitesdk.internal.client.NetSuiteClient.search',
+        return_value=get_vendor_search_results('search-1')[0]
+    )
+    search_more_with_id = mocker.patch(
+        'netsuitesdk.internal.client.NetSuiteClient.searchMoreWithId',
+        side_effect=TimeoutError('Task timed out after 20 minutes')
+    )
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    with pytest.raises(TimeoutError):
+        netsuite_connection.sync_vendors()
+
+    checkpoint = NetSuiteDimensionSyncState.get_checkpoint(workspace_id=1, dimension='vendors')
+    assert checkpoint['search_id'] == 'search-1'
+    assert checkpoint['page_index'] == 1
+    assert checkpoint['search']['last_modified_date'] is not None
+
+    return netsuite_connection, search, search_more_with_id
+
+
+def test_sync_vendors_resumes_from_checkpoint(mocker, db):
+    netsuite_connection, search, search_more_with_id = interrupt_vendors_sync(mocker)
+    search_more_with_id.side_effect = None
+    search_more_with_id.return_value = get_vendor_search_results('search-1')[1]
+
+    netsuite_connection.sync_vendors()
+
+    assert search.call_count == 1
+    search_more_with_id.assert_called_with(searchId='search-1', pageIndex=2)
+    assert NetSuiteDimensionSyncState.get_checkpoint(workspace_id=1, dimension='vendors') is None
+    assert DestinationAttribute.objects.filter(workspace_id=1, attribute_type='VENDOR').count() == 7
+
+
+def test_sync_vendors_restarts_expired_checkpoint(mocker, db):
+    netsuite_connection, search, search_more_with_id = interrupt_vendors_sync(mocker)
+
+    checkpoint = NetSuiteDimensionSyncState.get_checkpoint(workspace_id=1, dimension='vendors')
+    checkpoint['saved_at'] = (timezone.now() - timedelta(seconds=settings.NETSUITE_SEARCH_ID_TTL + 1)).isoformat()
+    NetSuiteDimensionSyncState.save_checkpoint(workspace_id=1, dimension='vendors', checkpoint=checkpoint)
+
+    search.return_value = get_vendor_search_results('search-2')[0]
+    search_more_with_id.side_effect = None
+    search_more_with_id.return_value = get_vendor_search_results('search-2')[1]
+
+    netsuite_connection.sync_vendors()
+
+    assert search.call_count == 2
+    search_more_with_id.assert_called_with(searchId='search-2', pageIndex=2)
+    assert NetSuiteDimensionSyncState.get_checkpoint(workspace_id=1, dimension='vendors') is None
+    assert DestinationAttribute.objects.filter(workspace_id=1, attribute_type='VENDOR').count() == 7
+
+
+def test_sync_vendors_restarts_invalid_search_id(mocker, db):
+    netsuite_connection, search, search_more_with_id = interrupt_vendors_sync(mocker)
+
+    search.return_value = get_vendor_search_results('search-2')[0]
+    search_more_with_id.side_effect = [
+        NetSuiteRequestError('Invalid search id', code='INVALID_SEARCH_ID'),
+        get_vendor_search_results('search-2')[1]
+    ]
+
+    netsuite_connection.sync_vendors()
+
+    assert search.call_count == 2
+    search_more_with_id.assert_called_with(searchId='search-2', pageIndex=2)
+    assert NetSuiteDimensionSyncState.get_checkpoint(workspace_id=1, dimension='vendors') is None
+    assert DestinationAttribute.objects.filter(workspace_id=1, attribute_type='VENDOR').count() == 7
+
+
 def test_sync_projects(mocker, db):
     mocker.patch(
         'netsuitesdk.api.projects.Projects.get_all_generator',
@@ -441,14 +584,39 @@ def test_sync_projects(mocker, db):
     new_project_count = DestinationAttribute.objects.filter(workspace_id=1, attribute_type='PROJECT').count()
     assert new_project_count == 1087
 
+def test_sync_context(db, django_assert_num_queries):
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    sync_context = SyncContext(workspace_id=1)
+    destination_ids = sync_context.get_destination_ids('PROJECT', 'Project')
+
+    assert destination_ids == set(DestinationAttribute.objects.filter(
+        workspace_id=1, attribute_type='PROJECT', display_name='Project'
+    ).values_list('destination_id', flat=True))
+
+    for attribute_type in ['ACCOUNT', 'PROJECT', 'DEPARTMENT', 'LOCATION', 'CLASS', 'EMPLOYEE']:
+        assert netsuite_connection.is_import_enabled(attribute_type, sync_context) == netsuite_connection.is_import_enabled(attribute_type)
+        assert netsuite_connection.get_attribute_disable_callback_path(attribute_type, sync_context) == \
+            netsuite_connection.get_attribute_disable_callback_path(attribute_type)
+
+    sync_context.add_destination_ids('PROJECT', 'Project', [{'destination_id': 'new_project'}])
+
+    with django_assert_num_queries(0):
+        for attribute_type in ['ACCOUNT', 'PROJECT', 'DEPARTMENT', 'LOCATION', 'CLASS', 'EMPLOYEE']:
+            netsuite_connection.is_import_enabled(attribute_type, sync_context)
+            netsuite_connection.get_attribute_disable_callback_path(attribute_type, sync_context)
+        assert 'new_project' in sync_context.get_destination_ids('PROJECT', 'Project')
+
+
 def test_sync_employees(mocker, db):
     mocker.patch(
         'netsuitesdk.api.employees.Employees.count',
         return_value=6
     )
     mocker.patch(
-        'netsuitesdk.api.employees.Employees.get_all_generator',
-        return_value=data['get_all_employees']    
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Employee': data['get_all_employees']})
     )
     mocker.patch(
         'netsuitesdk.api.employees.Employees.get',
@@ -466,6 +634,42 @@ def test_sync_employees(mocker, db):
     new_employee_count = DestinationAttribute.objects.filter(workspace_id=1, attribute_type='EMPLOYEE').count()
     assert new_employee_count == 13
 
+def test_sync_employees_resolves_supervisors_in_bulk(mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.employees.Employees.count',
+        return_value=6
+    )
+    mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Employee': data['get_all_employees']})
+    )
+    employee_get = mocker.patch('netsuitesdk.api.employees.Employees.get')
+    get_employee_emails = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_employee_emails',
+        side_effect=lambda internal_ids: {internal_id: 'supervisor{}@fyle.in'.format(internal_id) for internal_id in internal_ids}
+    )
+
+    configuration = Configuration.objects.get(workspace_id=1)
+    configuration.import_netsuite_employees = True
+    configuration.save()
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    netsuite_connection.sync_employees()
+
+    employee_get.assert_not_called()
+    assert get_employee_emails.call_count <= len(data['get_all_employees'])
+
+    employee_ids_with_supervisor = [
+        employee['internalId'] for employees in data['get_all_employees'] for employee in employees if employee['supervisor']
+    ]
+    attributes = DestinationAttribute.objects.filter(
+        workspace_id=1, attribute_type='EMPLOYEE', destination_id__in=employee_ids_with_supervisor
+    )
+    assert any(attribute.detail.get('approver_emails') for attribute in attributes)
+
+
 @pytest.mark.django_db()
 def test_sync_accounts(mocker, db):
     mocker.patch(
@@ -487,6 +691,76 @@ def test_sync_accounts(mocker, db):
     new_account_counts = DestinationAttribute.objects.filter(attribute_type='ACCOUNT', workspace_id=1).count()
     assert new_account_counts == 124
 
+def test_sync_accounts_incrementally(mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.accounts.Accounts.count',
+        return_value=5
+    )
+    get_all_generator = mocker.patch(
+        'netsuitesdk.api.accounts.Accounts.get_all_generator',
+        return_value=data['get_all_accounts']
+    )
+    get_modified_records_generator = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_modified_records_generator',
+        return_value=data['get_all_accounts']
+    )
+    FeatureConfig.objects.filter(workspace_id=1).update(incremental_dimension_sync=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='incremental_dimension_sync')
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    netsuite_connection.sync_accounts()
+
+    assert get_all_generator.call_count == 1
+    assert get_modified_records_generator.call_count == 0
+
+    sync_state = NetSuiteDimensionSyncState.objects.get(workspace_id=1, dimension='accounts')
+    assert sync_state.last_full_sync_at == sync_state.last_modified_at
+    last_full_sync_at = sync_state.last_full_sync_at
+
+    netsuite_connection.sync_accounts()
+
+    assert get_all_generator.call_count == 1
+    get_modified_records_generator.assert_called_once_with(netsuite_connection.connection.accounts, last_full_sync_at)
+
+    sync_state.refresh_from_db()
+    assert sync_state.last_full_sync_at == last_full_sync_at
+    assert sync_state.last_modified_at > last_full_sync_at
+
+    sync_state.last_full_sync_at = timezone.now() - timedelta(days=8)
+    sync_state.save()
+
+    netsuite_connection.sync_accounts()
+
+    assert get_all_generator.call_count == 2
+
+    FeatureConfig.objects.filter(workspace_id=1).update(incremental_dimension_sync=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='incremental_dimension_sync')
+
+
+def test_sync_accounts_uses_cached_attribute_count(mocker, db):
+    count = mocker.patch(
+        'netsuitesdk.api.accounts.Accounts.count',
+        return_value=5
+    )
+    mocker.patch(
+        'netsuitesdk.api.accounts.Accounts.get_all_generator',
+        return_value=data['get_all_accounts']
+    )
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    netsuite_connection.sync_accounts()
+    netsuite_connection.sync_accounts()
+
+    assert count.call_count == 1
+
+    active_accounts_count = sum(1 for accounts in data['get_all_accounts'] for account in accounts if not account['isInactive'])
+    assert NetSuiteAttributesCount.objects.get(workspace_id=1).accounts_count == active_accounts_count
+    assert netsuite_connection.get_attribute_count('accounts', netsuite_connection.connection.accounts) == active_accounts_count
+
+
 @pytest.mark.django_db()
 def test_sync_items(mocker, db):
     mocker.patch('netsuitesdk.api.items.Items.count', return_value=3)
@@ -592,6 +866,95 @@ def test_sync_custom_segments(mocker, db):
     assert custom_segment == 5
 
 
+def test_sync_custom_segments_isolates_failures(mocker, db):
+    CustomSegment.objects.bulk_create([
+        CustomSegment(name='Broken List', segment_type='CUSTOM_LIST', script_id='custcol_broken', internal_id='1', workspace_id=49),
+        CustomSegment(name='Production Line', segment_type='CUSTOM_SEGMENT', script_id='custcol_line', internal_id='2', workspace_id=49)
+    ])
+
+    def sync_custom_segment(custom_segment):
+        if custom_segment.internal_id == '1':
+            raise NetSuiteRequestError('Custom list not found')
+        return 5
+
+    sync = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.sync_custom_segment',
+        side_effect=sync_custom_segment
+    )
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=49)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=49)
+
+    with pytest.raises(NetSuiteRequestError):
+        netsuite_connection.sync_custom_segments()
+
+    assert sync.call_count == 2
+
+    broken_list = NetSuiteDimensionSyncState.objects.get(workspace_id=49, dimension='custom_segment_broken_list')
+    assert broken_list.synced_count is None
+    assert 'Custom list not found' in broken_list.sync_error
+
+    production_line = NetSuiteDimensionSyncState.objects.get(workspace_id=49, dimension='custom_segment_production_line')
+    assert production_line.synced_count == 5
+    assert production_line.sync_error is None
+    assert production_line.sync_duration >= 0
+
+
+def test_sync_custom_segments_within_account_slot(mocker, db):
+    CustomSegment.objects.bulk_create([
+        CustomSegment(name='Favourite List', segment_type='CUSTOM_LIST', script_id='custcol_list', internal_id='1', workspace_id=49),
+        CustomSegment(name='Production Line', segment_type='CUSTOM_SEGMENT', script_id='custcol_line', internal_id='2', workspace_id=49)
+    ])
+    FeatureConfig.objects.filter(workspace_id=49).update(parallel_dimension_sync=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=49, key='parallel_dimension_sync')
+
+    synced_threads = []
+
+    def sync_custom_segment(custom_segment):
+        synced_threads.append(threading.get_ident())
+        return 5
+
+    mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.sync_custom_segment',
+        side_effect=sync_custom_segment
+    )
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=49)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=49)
+
+    with account_slot(netsuite_credentials.ns_account_id):
+        netsuite_connection.sync_custom_segments()
+
+    assert synced_threads == [threading.get_ident()] * 2
+
+    FeatureConfig.objects.filter(workspace_id=49).update(parallel_dimension_sync=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=49, key='parallel_dimension_sync')
+
+
+def test_sync_custom_segments_holds_shared_account_slot(mocker, db):
+    CustomSegment.objects.bulk_create([
+        CustomSegment(name='Favourite List', segment_type='CUSTOM_LIST', script_id='custcol_list', internal_id='1', workspace_id=49),
+        CustomSegment(name='Production Line', segment_type='CUSTOM_SEGMENT', script_id='custcol_line', internal_id='2', workspace_id=49)
+    ])
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=49)
+    slot_owners = []
+
+    def sync_custom_segment(custom_segment):
+        slot_owners.append(cache.get(ACCOUNT_SLOT_CACHE_KEY.format(ns_account_id=netsuite_credentials.ns_account_id, slot=0)))
+        return 5
+
+    mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.sync_custom_segment',
+        side_effect=sync_custom_segment
+    )
+
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=49)
+    netsuite_connection.sync_custom_segments()
+
+    assert slot_owners == [get_slot_owner()] * 2
+    assert cache.get(ACCOUNT_SLOT_CACHE_KEY.format(ns_account_id=netsuite_credentials.ns_account_id, slot=0)) is None
+
+
 def test_sync_subsidiaries(mocker, db):
     mocker.patch(
         'netsuitesdk.api.subsidiaries.Subsidiaries.get_all_generator',
@@ -608,6 +971,25 @@ def test_sync_subsidiaries(mocker, db):
     subsidiaries = DestinationAttribute.objects.filter(attribute_type='SUBSIDIARY', workspace_id=49).count()
     assert subsidiaries == 8
 
+
+def test_sync_subsidiaries_writes_each_record_once(mocker, db):
+    subsidiaries = data['get_all_subsidiaries'][0]
+    mocker.patch(
+        'netsuitesdk.api.subsidiaries.Subsidiaries.get_all_generator',
+        return_value=[subsidiaries[:3], subsidiaries[3:]]
+    )
+    upsert = mocker.spy(DestinationAttribute, 'bulk_create_or_update_destination_attributes')
+    DestinationAttribute.objects.filter(attribute_type='SUBSIDIARY', workspace_id=49).delete()
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=49)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=49)
+    netsuite_connection.sync_subsidiaries()
+
+    upserted_ids = [attribute['destination_id'] for call in upsert.call_args_list for attribute in call.args[0]]
+    assert upsert.call_count == 2
+    assert sorted(upserted_ids) == sorted(subsidiary['internalId'] for subsidiary in subsidiaries)
+    assert DestinationAttribute.objects.filter(attribute_type='SUBSIDIARY', workspace_id=49).count() == len(subsidiaries)
+
 def test_sync_locations(mocker, db):
     mocker.patch(
         'netsuitesdk.api.locations.Locations.count',
@@ -650,10 +1032,71 @@ def test_sync_departments(mocker, db):
     assert departments == 13
 
 
+def test_sync_departments_with_zeep_records(mocker, db):
+    department_type = xsd.ComplexType(
+        xsd.Sequence([xsd.Element('name', xsd.String()), xsd.Element('isInactive', xsd.Boolean())]),
+        attributes=[xsd.Attribute('internalId', xsd.String())]
+    )
+    mocker.patch(
+        'netsuitesdk.api.departments.Departments.count',
+        return_value=1
+    )
+    mocker.patch(
+        'netsuitesdk.api.departments.Departments.get_all_generator',
+        return_value=[[
+            department_type(name='Zeep Sales', internalId='9001', isInactive=False),
+            department_type(name='Zeep Marketing', internalId='9002', isInactive=True)
+        ]]
+    )
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=49)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=49)
+
+    netsuite_connection.sync_departments()
+
+    assert DestinationAttribute.objects.filter(attribute_type='DEPARTMENT', workspace_id=49, destination_id='9001').exists()
+    assert not DestinationAttribute.objects.filter(attribute_type='DEPARTMENT', workspace_id=49, destination_id='9002').exists()
+
+
+def test_sync_departments_skips_unchanged_attributes(mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.departments.Departments.count',
+        return_value=5
+    )
+    mocker.patch(
+        'netsuitesdk.api.departments.Departments.get_all_generator',
+        return_value=data['get_all_departments']
+    )
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=49)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=49)
+
+    netsuite_connection.sync_departments()
+
+    upsert = mocker.spy(DestinationAttribute, 'bulk_create_or_update_destination_attributes')
+    netsuite_connection.sync_departments()
+    assert upsert.call_count == 0
+
+    department = DestinationAttribute.objects.filter(attribute_type='DEPARTMENT', workspace_id=49).first()
+    sync_context = SyncContext(workspace_id=49)
+    attributes = [
+        {
+            'destination_id': department.destination_id, 'value': department.value,
+            'active': department.active, 'detail': department.detail, 'code': department.code
+        },
+        {'destination_id': department.destination_id + '_new', 'value': department.value, 'active': True}
+    ]
+
+    changed_attributes = sync_context.get_changed_attributes(attributes, 'DEPARTMENT')
+    assert [attribute['destination_id'] for attribute in changed_attributes] == [department.destination_id + '_new']
+
+    attributes[0]['value'] = 'Renamed Department'
+    changed_attributes = sync_context.get_changed_attributes(attributes, 'DEPARTMENT')
+    assert [attribute['destination_id'] for attribute in changed_attributes] == [department.destination_id]
+
+
 def test_sync_customers(mocker, db):
     mocker.patch(
-        'netsuitesdk.api.customers.Customers.get_records_generator',
-        return_value=data['get_all_projects']  
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Customer': data['get_all_projects']})
     )
 
     mocker.patch(
@@ -946,6 +1389,93 @@ def test_post_bill_exception(db, mocker, create_bill_account_based):
         netsuite_connection.post_bill(bill_transaction, bill_transaction_lineitems, general_mapping)
 
 
+def test_post_exports_in_batch(db, mocker, create_bill_account_based):
+    workspace_id = 1
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=workspace_id)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=workspace_id)
+    general_mapping = GeneralMapping.objects.get(workspace_id=workspace_id)
+    configuration = Configuration.objects.get(workspace_id=workspace_id)
+
+    bill_transaction, bill_transaction_lineitems = create_bill_account_based
+
+    success_response = mock.Mock()
+    success_response.status.isSuccess = True
+    success_response.baseRef = {'internalId': '1234', 'externalId': 'bill 1', 'type': 'vendorBill'}
+
+    failure_response = mock.Mock()
+    failure_response.status.isSuccess = False
+    failure_response.status.statusDetail = [{'code': 'INVALID_KEY_OR_REF', 'message': 'Invalid entity reference key'}]
+
+    response = mock.Mock()
+    response.body.writeResponseList.writeResponse = [success_response, failure_response]
+
+    mocker.patch('netsuitesdk.api.vendor_bills.VendorBills.post')
+    request = mocker.patch('netsuitesdk.internal.client.NetSuiteClient.request', return_value=response)
+
+    results = netsuite_connection.post_exports_in_batch(
+        'CREATING_BILL',
+        [(bill_transaction, bill_transaction_lineitems), (bill_transaction, bill_transaction_lineitems)],
+        configuration,
+        general_mapping
+    )
+
+    assert request.call_count == 1
+    assert request.call_args[0][0] == 'upsertList'
+    assert results[0]['internalId'] == '1234'
+    assert isinstance(results[1], NetSuiteRequestError)
+    assert results[1].code == 'INVALID_KEY_OR_REF'
+    assert results[1].message == 'An error occured in a upsert request: Invalid entity reference key'
+
+
+def test_upsert_list_builds_records_with_client_factories(db, mocker):
+    workspace_id = 1
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=workspace_id)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=workspace_id)
+    client = netsuite_connection.connection.client
+
+    record_ref_type = xsd.ComplexType(
+        xsd.Sequence([xsd.Element('name', xsd.String())]),
+        attributes=[xsd.Attribute('internalId', xsd.String()), xsd.Attribute('externalId', xsd.String()), xsd.Attribute('type', xsd.String())]
+    )
+    expense_type = xsd.ComplexType(xsd.Sequence([xsd.Element('amount', xsd.Double()), xsd.Element('memo', xsd.String())]))
+    expense_list_type = xsd.ComplexType(xsd.Sequence([xsd.Element('expense', expense_type, max_occurs='unbounded')]))
+    vendor_bill_type = xsd.ComplexType(
+        xsd.Sequence([xsd.Element('memo', xsd.String()), xsd.Element('entity', record_ref_type), xsd.Element('expenseList', expense_list_type)]),
+        attributes=[xsd.Attribute('externalId', xsd.String())]
+    )
+    mocker.patch.object(client, 'VendorBill', vendor_bill_type, create=True)
+    mocker.patch.object(client, 'RecordRef', record_ref_type, create=True)
+    mocker.patch.object(client, 'VendorBillExpense', expense_type, create=True)
+    mocker.patch.object(client, 'VendorBillExpenseList', expense_list_type, create=True)
+
+    success_response = mock.Mock()
+    success_response.status.isSuccess = True
+    success_response.baseRef = {'internalId': '1234', 'externalId': 'bill 1', 'type': 'vendorBill'}
+
+    response = mock.Mock()
+    response.body.writeResponseList.writeResponse = [success_response]
+
+    request = mocker.patch('netsuitesdk.internal.client.NetSuiteClient.request', return_value=response)
+    upsert = mocker.patch('netsuitesdk.internal.client.NetSuiteClient.upsert')
+
+    results = netsuite_connection.upsert_list('CREATING_BILL', [{
+        'externalId': 'bill 1',
+        'memo': 'Reimbursable expenses',
+        'entity': {'internalId': '1674'},
+        'expenseList': [{'amount': 10, 'memo': 'Taxi'}]
+    }])
+
+    upsert.assert_not_called()
+    records = request.call_args.kwargs['record']
+    assert len(records) == 1
+    assert records[0].externalId == 'bill 1'
+    assert records[0].entity.internalId == '1674'
+    assert records[0].expenseList.expense[0].amount == 10
+    assert results[0]['internalId'] == '1234'
+
+
 def test_post_expense_report_exception(db, mocker, create_expense_report):
     workspace_id = 1
 
@@ -1067,6 +1597,21 @@ def test_update_destination_attributes_with_duplicate_values(db, mocker):
     assert duplicate_type_attribute.destination_id == '3'
 
 
+def test_update_destination_attributes_in_one_query(db, django_assert_num_queries):
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
+
+    custom_records = [{
+        'recType': {'name': 'custom_type'},
+        'name': 'Type {}'.format(index),
+        'internalId': str(index),
+        'isInactive': False
+    } for index in range(100)]
+
+    with django_assert_num_queries(1):
+        netsuite_connection.update_destination_attributes('CUSTOM_TYPE', custom_records)
+
+
 def test_skip_sync_attributes(mocker, db):
     mocker.patch(
         'netsuitesdk.api.projects.Projects.count',
@@ -1250,7 +1795,7 @@ def test_constructs_tax_details_list_for_multiple_items(mocker, db):
     assert result == data['tax_list_detail']
 
 
-def test_is_sync_allowed(db):
+def test_is_sync_allowed(db, django_assert_num_queries):
     netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
     netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
     assert netsuite_connection.is_sync_allowed(attribute_count=1000) is True
@@ -1263,6 +1808,12 @@ def test_is_sync_allowed(db):
     new_date = timezone.make_aware(datetime(2024, 11, 1), timezone.get_current_timezone())
     workspace.created_at = new_date
     workspace.save()
+
+    # creation date is loaded once per connector
+    with django_assert_num_queries(0):
+        assert netsuite_connection.is_sync_allowed(attribute_count=35000) is True
+
+    netsuite_connection = NetSuiteConnector(netsuite_credentials=netsuite_credentials, workspace_id=1)
     assert netsuite_connection.is_sync_allowed(attribute_count=35000) is False
 
 
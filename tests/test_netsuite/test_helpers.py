@@ -1,9 +1,11 @@
+import threading
 from datetime import datetime, timezone
 
 from apps.netsuite.helpers import check_interval_and_sync_dimension, sync_dimensions
 from fyle_accounting_mappings.models import DestinationAttribute
-from apps.workspaces.models import NetSuiteCredentials, Workspace
+from apps.workspaces.models import NetSuiteCredentials, Workspace, FeatureConfig
 from apps.netsuite.connector import parse_error_and_get_message
+from tests.helper import get_search_results
 from .fixtures import data
 
 
@@ -39,8 +41,8 @@ def test_sync_dimensions(mocker, db):
     )
 
     mocker.patch(
-        'netsuitesdk.api.employees.Employees.get_all_generator',
-        return_value=data['get_all_employees']    
+        'apps.netsuite.connector.NetSuiteConnector.get_search_results_generator',
+        side_effect=get_search_results({'Employee': data['get_all_employees']})
     )
     mocker.patch('netsuitesdk.api.employees.Employees.count', return_value=6)
 
@@ -111,6 +113,46 @@ def test_sync_dimensions(mocker, db):
     assert category_count == 34
 
 
+def test_sync_dimensions_in_parallel(mocker, db):
+    synced_dimensions = []
+
+    class FakeNetSuiteConnector:
+        def __init__(self, ns_credentials, workspace_id):
+            pass
+
+        def __getattr__(self, name):
+            dimension = name.replace('sync_', '')
+
+            def sync():
+                synced_dimensions.append((dimension, threading.get_ident()))
+                if dimension == 'vendors':
+                    raise Exception('vendor sync failed')
+
+            return sync
+
+    mocker.patch('apps.netsuite.connector.NetSuiteConnector', FakeNetSuiteConnector)
+
+    FeatureConfig.objects.filter(workspace_id=1).update(parallel_dimension_sync=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='parallel_dimension_sync')
+
+    netsuite_credentials = NetSuiteCredentials.get_active_netsuite_credentials(workspace_id=1)
+    result = sync_dimensions(netsuite_credentials, 1, ['vendors', 'accounts', 'projects', 'items', 'customers'])
+
+    assert set(result.timings) == {'vendors', 'accounts', 'projects', 'items', 'customers'}
+    assert list(result.failures) == ['vendors']
+    assert set(result.synced_dimensions) == {'accounts', 'projects', 'items', 'customers'}
+
+    threads = dict(synced_dimensions)
+    dimensions_in_order = [dimension for dimension, _ in synced_dimensions]
+    assert threads['accounts'] == threads['items']
+    assert dimensions_in_order.index('accounts') < dimensions_in_order.index('items')
+    assert threads['projects'] == threads['customers']
+    assert dimensions_in_order.index('projects') < dimensions_in_order.index('customers')
+
+    FeatureConfig.objects.filter(workspace_id=1).update(parallel_dimension_sync=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='parallel_dimension_sync')
+
+
 def test_parse_error_and_get_message():
     raw_responses = data['charge_card_error_raw_responses']
 
@@ -335,6 +335,32 @@ def test_get_custom_segments(db, mocker):
     assert custom_segments == [{'scriptId': 'custcol780', 'type': 'Select', 'value': '1017'}]
 
 
+def test_mapping_resolver(db, django_assert_num_queries):
+    for expense_group in ExpenseGroup.objects.filter(workspace_id__in=[1, 2, 49]):
+        expenses = expense_group.expenses.all()
+        general_mappings = GeneralMapping.objects.filter(workspace_id=expense_group.workspace_id).first()
+        mapping_resolver = MappingResolver(expense_group.workspace_id, expenses, expense_group.description)
+
+        for expense in expenses:
+            assert get_department_id_or_none(expense_group, expense, mapping_resolver) == get_department_id_or_none(expense_group, expense)
+            assert get_class_id_or_none(expense_group, expense, mapping_resolver) == get_class_id_or_none(expense_group, expense)
+            assert get_location_id_or_none(expense_group, expense, mapping_resolver) == get_location_id_or_none(expense_group, expense)
+            assert get_customer_id_or_none(expense_group, expense, mapping_resolver) == get_customer_id_or_none(expense_group, expense)
+            assert get_custom_segments(expense_group, expense, mapping_resolver) == get_custom_segments(expense_group, expense)
+            if general_mappings:
+                assert get_tax_item_id_or_none(expense_group, general_mappings, expense, mapping_resolver) == \
+                    get_tax_item_id_or_none(expense_group, general_mappings, expense)
+
+        with django_assert_num_queries(0):
+            for expense in expenses:
+                get_department_id_or_none(expense_group, expense, mapping_resolver)
+                get_class_id_or_none(expense_group, expense, mapping_resolver)
+                get_location_id_or_none(expense_group, expense, mapping_resolver)
+                get_customer_id_or_none(expense_group, expense, mapping_resolver)
+                get_custom_segments(expense_group, expense, mapping_resolver)
+                mapping_resolver.get_employee_mapping(expense_group.description.get('employee_email'))
+
+
 def test_create_credit_card_charge(db):
 
     expense_group = ExpenseGroup.objects.get(id=4)
@@ -1,6 +1,5 @@
 from datetime import datetime
 import json
-import base64
 from unittest import mock
 import pytest
 import random
@@ -13,17 +12,17 @@ from django_q.models import Schedule
 from netsuitesdk import NetSuiteRequestError, NetSuiteRateLimitError, NetSuiteLoginError
 from fyle.platform.exceptions import InternalServerError, InvalidTokenError
 from datetime import datetime, timezone
-from fyle_integrations_platform_connector import PlatformConnector
 from fyle_accounting_library.fyle_platform.enums import ExpenseImportSourceEnum
 
 from apps.fyle.models import ExpenseGroup, Reimbursement, Expense
 from apps.netsuite.connector import NetSuiteConnector
-from apps.netsuite.models import CreditCardCharge, ExpenseReport, Bill, JournalEntry, BillLineitem, JournalEntryLineItem, ExpenseReportLineItem
-from apps.workspaces.models import Configuration, LastExportDetail, NetSuiteCredentials, FyleCredential
-from apps.tasks.models import TaskLog
+from apps.netsuite.models import CreditCardCharge, ExpenseReport, Bill, JournalEntry, BillLineitem, JournalEntryLineItem, ExpenseReportLineItem, \
+    CreditCardChargeLineItem, NetSuiteDimensionSyncState
+from apps.workspaces.models import Configuration, LastExportDetail, NetSuiteCredentials, FyleCredential, FeatureConfig
+from apps.tasks.models import TaskLog, Error
 from apps.netsuite.tasks import __validate_general_mapping, __validate_subsidiary_mapping, run_check_netsuite_object_status, create_credit_card_charge, create_journal_entry, create_or_update_employee_mapping, run_create_vendor_payment, get_all_internal_ids, \
      get_or_create_credit_card_vendor, create_bill, create_expense_report, load_attachments, run_process_reimbursements, process_vendor_payment, schedule_netsuite_objects_status_sync, schedule_reimbursements_sync, schedule_vendor_payment_creation, \
-        __validate_tax_group_mapping, check_expenses_reimbursement_status, __validate_expense_group, upload_attachments_and_update_export, sync_inactive_employee
+        __validate_tax_group_mapping, get_id_filters, __validate_expense_group, upload_attachments_and_update_export, sync_inactive_employee, create_exports_in_batch, discard_interrupted_exports, get_expense_attachments, mark_paid_on_fyle
 from apps.netsuite.queue import *
 from apps.netsuite.exceptions import __handle_netsuite_connection_error
 from apps.mappings.models import GeneralMapping, SubsidiaryMapping
@@ -230,6 +229,211 @@ def test_post_bill_success(add_tax_destination_attributes, mocker, db):
     assert task_log.status == 'FAILED'
 
 
+def test_post_bill_discards_unposted_bill(add_tax_destination_attributes, mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.vendor_bills.VendorBills.post',
+        side_effect=NetSuiteRequestError('An error occured in a upsert request: Invalid entity', code='INVALID_KEY_OR_REF')
+    )
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.search',
+        return_value={}
+    )
+    workspace_id = 2
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'READY'
+    task_log.save()
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    for expenses in expense_group.expenses.all():
+        expenses.workspace_id = 2
+        expenses.save()
+    create_bill(expense_group.id, task_log.id, True, False)
+
+    task_log = TaskLog.objects.get(pk=task_log.id)
+
+    assert task_log.status == 'FAILED'
+    assert not Bill.objects.filter(expense_group_id=expense_group.id).exists()
+    assert not BillLineitem.objects.filter(expense__in=expense_group.expenses.all()).exists()
+
+
+def test_discard_interrupted_exports(db):
+    expense_group = ExpenseGroup.objects.get(id=2)
+    expense_group.exported_at = None
+    expense_group.save()
+
+    configuration = Configuration.objects.get(workspace_id=expense_group.workspace_id)
+    bill = Bill.create_bill(expense_group)
+    BillLineitem.create_bill_lineitems(expense_group, configuration)
+
+    discard_interrupted_exports([expense_group.id])
+
+    assert not Bill.objects.filter(id=bill.id).exists()
+    assert not BillLineitem.objects.filter(bill_id=bill.id).exists()
+
+
+def test_create_bill_discards_interrupted_bill(add_tax_destination_attributes, mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.vendor_bills.VendorBills.post',
+        return_value=data['creation_response']
+    )
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.search',
+        return_value={}
+    )
+    workspace_id = 2
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'READY'
+    task_log.save()
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    expense_group.exported_at = None
+    expense_group.save()
+    for expenses in expense_group.expenses.all():
+        expenses.workspace_id = 2
+        expenses.save()
+
+    configuration = Configuration.objects.get(workspace_id=workspace_id)
+    interrupted_bill = Bill.create_bill(expense_group)
+    BillLineitem.create_bill_lineitems(expense_group, configuration)
+
+    create_bill(expense_group.id, task_log.id, True, False)
+
+    task_log = TaskLog.objects.get(pk=task_log.id)
+
+    assert task_log.status == 'COMPLETE'
+    assert not BillLineitem.objects.filter(bill_id=interrupted_bill.id).exists()
+    assert BillLineitem.objects.filter(bill_id=task_log.bill_id).count() == expense_group.expenses.count()
+
+
+def test_create_exports_in_batch(add_tax_destination_attributes, mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.search',
+        return_value={}
+    )
+    post_exports_in_batch = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.post_exports_in_batch',
+        return_value=[data['creation_response']]
+    )
+    workspace_id = 2
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'READY'
+    task_log.save()
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    for expenses in expense_group.expenses.all():
+        expenses.workspace_id = 2
+        expenses.save()
+
+    create_exports_in_batch('CREATING_BILL', [expense_group.id], [task_log.id], True, False)
+
+    task_log = TaskLog.objects.get(pk=task_log.id)
+    bill = Bill.objects.get(expense_group_id=expense_group.id)
+    expense_group = ExpenseGroup.objects.get(id=expense_group.id)
+
+    assert post_exports_in_batch.call_count == 1
+    assert task_log.status == 'COMPLETE'
+    assert task_log.bill_id == bill.id
+    assert expense_group.response_logs == data['creation_response']
+    assert expense_group.exported_at is not None
+
+
+def test_create_exports_in_batch_record_failure(add_tax_destination_attributes, mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.search',
+        return_value={}
+    )
+    mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.post_exports_in_batch',
+        return_value=[NetSuiteRequestError('An error occured in a upsert request: Invalid entity', code='INVALID_KEY_OR_REF')]
+    )
+    vendor_bills_post = mocker.patch(
+        'netsuitesdk.api.vendor_bills.VendorBills.post',
+        side_effect=NetSuiteRequestError('An error occured in a upsert request: Invalid entity', code='INVALID_KEY_OR_REF')
+    )
+    workspace_id = 2
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'READY'
+    task_log.save()
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    for expenses in expense_group.expenses.all():
+        expenses.workspace_id = 2
+        expenses.save()
+
+    create_exports_in_batch('CREATING_BILL', [expense_group.id], [task_log.id], True, False)
+
+    task_log = TaskLog.objects.get(pk=task_log.id)
+
+    assert vendor_bills_post.call_count == 0
+    assert task_log.status == 'FAILED'
+    assert not Bill.objects.filter(expense_group_id=expense_group.id).exists()
+    assert Error.objects.filter(expense_group_id=expense_group.id, is_resolved=False).exists()
+
+
+def test_create_exports_in_batch_accounting_period_retry(add_tax_destination_attributes, mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.search',
+        return_value={}
+    )
+    mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.post_exports_in_batch',
+        return_value=[NetSuiteRequestError('An error occured in a upsert request: The transaction date you specified is not within the date range of your accounting period.')]
+    )
+    post_export = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.post_export',
+        return_value=data['creation_response']
+    )
+    workspace_id = 2
+    configuration = Configuration.objects.get(workspace_id=workspace_id)
+    configuration.change_accounting_period = True
+    configuration.save()
+
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'READY'
+    task_log.save()
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    for expenses in expense_group.expenses.all():
+        expenses.workspace_id = 2
+        expenses.save()
+
+    create_exports_in_batch('CREATING_BILL', [expense_group.id], [task_log.id], True, False)
+
+    task_log = TaskLog.objects.get(pk=task_log.id)
+
+    assert post_export.call_count == 1
+    assert task_log.status == 'COMPLETE'
+
+
+def test_create_exports_in_batch_deleted_task_log(add_tax_destination_attributes, mocker, db):
+    mocker.patch(
+        'netsuitesdk.api.vendors.Vendors.search',
+        return_value={}
+    )
+    post_exports_in_batch = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.post_exports_in_batch',
+        return_value=[data['creation_response']]
+    )
+    workspace_id = 2
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'READY'
+    task_log.save()
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    for expenses in expense_group.expenses.all():
+        expenses.workspace_id = 2
+        expenses.save()
+
+    deleted_task_log_id = TaskLog.objects.order_by('-id').values_list('id', flat=True).first() + 1
+
+    create_exports_in_batch('CREATING_BILL', [expense_group.id, expense_group.id], [deleted_task_log_id, task_log.id], True, False)
+
+    task_log = TaskLog.objects.get(pk=task_log.id)
+
+    assert post_exports_in_batch.call_count == 1
+    assert len(post_exports_in_batch.call_args[0][1]) == 1
+    assert task_log.status == 'COMPLETE'
+
 def test_post_bill_mapping_error(mocker, db):
     mocker.patch(
         'apps.netsuite.connector.NetSuiteConnector.get_or_create_employee',
@@ -570,8 +774,30 @@ def test_create_credit_card_charge(mocker, db):
         return_value=data['post_vendor']
     )
     mocker.patch(
-        'apps.netsuite.tasks.load_attachments',
-        return_value='https://aaa.bbb.cc/x232sds'
+        'netsuitesdk.api.folders.Folders.post',
+        return_value={'internalId': 'qwertyui', 'externalId': 'sdfghjk'}
+    )
+    files_post = mocker.patch(
+        'netsuitesdk.api.files.Files.post',
+        return_value={'internalId': '3451', 'externalId': 'txjvDntdQDo6', 'type': 'file', 'name': 'fiJjDdr67nl3_uber_expenses_vmrpw.pdf'}
+    )
+    mocker.patch(
+        'netsuitesdk.api.files.Files.get',
+        return_value={'url': 'https://aaa.bbb.cc/x232sds'}
+    )
+    mocker.patch(
+        'apps.netsuite.connector.requests.get',
+        return_value=mocker.MagicMock(content=b'receipt')
+    )
+    mocker.patch(
+        'fyle.platform.apis.v1.admin.Files.bulk_generate_file_urls',
+        return_value={'data': [{
+            "id": "fiJjDdr67nl3",
+            "name": "uber_expenses_vmrpw.pdf",
+            "content_type": "application/pdf",
+            "download_url": "https://aaa.bbb.cc/x232sds",
+            "upload_url": "https://aaa.bbb.cc/x232sds"
+        }]}
     )
 
     task_log = TaskLog.objects.filter(workspace_id=1).first()
@@ -580,9 +806,15 @@ def test_create_credit_card_charge(mocker, db):
 
     expense_group = ExpenseGroup.objects.filter(workspace_id=1, fund_source='CCC').first()
 
+    # split expenses share the receipt of the expense they were split from
+    for expense in expense_group.expenses.all():
+        expense.file_ids = ['fiJjDdr67nl3']
+        expense.save()
+
     configuration = Configuration.objects.get(workspace_id=1)
     configuration.auto_map_employees = True
     configuration.auto_create_destination_entity = True
+    configuration.is_attachment_upload_enabled = True
     configuration.save()
 
     general_mappings = GeneralMapping.objects.get(workspace_id=1)
@@ -599,6 +831,10 @@ def test_create_credit_card_charge(mocker, db):
     assert credit_card_charge.currency == '1'
     assert credit_card_charge.credit_card_account_id == '10'
     assert credit_card_charge.external_id == 'cc-charge 2 - ashwin.t@fyle.in'
+    assert files_post.call_count == expense_group.expenses.count()
+    assert sorted(call.args[0]['externalId'] for call in files_post.call_args_list) == sorted(expense_group.expenses.values_list('expense_id', flat=True))
+    for lineitem in CreditCardChargeLineItem.objects.filter(credit_card_charge_id=credit_card_charge.id):
+        assert lineitem.netsuite_receipt_url == 'https://aaa.bbb.cc/x232sds'
 
     task_log.status = 'READY'
     task_log.save()
@@ -673,8 +909,8 @@ def test_accounting_period_working_credit_card_charge(mocker, db):
         return_value=data['post_vendor']
     )
     mocker.patch(
-        'apps.netsuite.tasks.load_attachments',
-        return_value='https://aaa.bbb.cc/x232sds'
+        'apps.netsuite.tasks.load_expense_attachments',
+        return_value={}
     )
     general_mappings = GeneralMapping.objects.get(workspace_id=1)
     general_mappings.default_ccc_account_id = '10'
@@ -748,6 +984,97 @@ def test_check_netsuite_object_status_bill(create_bill_task, mocker, db):
     assert bill.paid_on_netsuite == True
 
 
+def test_check_netsuite_object_status_bill_with_bulk_status_polling(create_bill_task, mocker, db):
+    FeatureConfig.objects.filter(workspace_id=1).update(bulk_status_polling=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='bulk_status_polling')
+
+    bill, bill_lineitems = create_bill_task
+    internal_id = get_all_internal_ids([bill])[bill.expense_group_id]['internal_id']
+
+    get_bill = mocker.patch('apps.netsuite.connector.NetSuiteConnector.get_bill')
+    get_transaction_statuses = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_transaction_statuses',
+        return_value={str(internal_id): 'Paid In Full'}
+    )
+
+    run_check_netsuite_object_status(1, trigger_reimbursements=False)
+
+    assert get_bill.call_count == 0
+    get_transaction_statuses.assert_any_call('vendorBill', [internal_id])
+
+    bill.refresh_from_db()
+    assert bill.paid_on_netsuite == True
+    assert bill.payment_synced == True
+    assert all(expense.paid_on_netsuite for expense in Expense.objects.filter(
+        id__in=BillLineitem.objects.filter(bill_id=bill.id).values('expense_id')))
+
+    FeatureConfig.objects.filter(workspace_id=1).update(bulk_status_polling=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='bulk_status_polling')
+
+
+def test_check_netsuite_object_status_bill_incrementally(create_bill_task, mocker, db):
+    FeatureConfig.objects.filter(workspace_id=1).update(incremental_status_sync=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='incremental_status_sync')
+
+    bill, bill_lineitems = create_bill_task
+    internal_id = get_all_internal_ids([bill])[bill.expense_group_id]['internal_id']
+
+    get_bill = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_bill',
+        return_value={'status': 'Open'}
+    )
+    get_modified_transaction_statuses = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_modified_transaction_statuses',
+        return_value={str(internal_id): 'Paid In Full'}
+    )
+
+    run_check_netsuite_object_status(1, trigger_reimbursements=False)
+
+    assert get_bill.call_count == 1
+    assert get_modified_transaction_statuses.call_count == 0
+    sync_state = NetSuiteDimensionSyncState.objects.get(workspace_id=1, dimension='vendor_bill_status')
+    assert sync_state.last_full_sync_at == sync_state.last_modified_at
+    bill.refresh_from_db()
+    assert bill.paid_on_netsuite == False
+
+    run_check_netsuite_object_status(1, trigger_reimbursements=False)
+
+    assert get_bill.call_count == 1
+    get_modified_transaction_statuses.assert_called_once()
+    assert get_modified_transaction_statuses.call_args.args[1] == sync_state.last_modified_at
+    bill.refresh_from_db()
+    assert bill.paid_on_netsuite == True
+
+    FeatureConfig.objects.filter(workspace_id=1).update(incremental_status_sync=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='incremental_status_sync')
+
+
+def test_check_netsuite_object_status_bill_keeps_watermark_on_failure(create_bill_task, mocker, db):
+    FeatureConfig.objects.filter(workspace_id=1).update(incremental_status_sync=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='incremental_status_sync')
+
+    bill, bill_lineitems = create_bill_task
+
+    mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_bill',
+        return_value={'status': 'Paid In Full'}
+    )
+    mocker.patch(
+        'apps.netsuite.tasks.NetSuiteDimensionSyncState.update_sync_state',
+        side_effect=Exception('could not save sync state')
+    )
+
+    with pytest.raises(Exception):
+        run_check_netsuite_object_status(1, trigger_reimbursements=False)
+
+    bill.refresh_from_db()
+    assert bill.paid_on_netsuite == False
+    assert not NetSuiteDimensionSyncState.objects.filter(workspace_id=1, dimension='vendor_bill_status').exists()
+
+    FeatureConfig.objects.filter(workspace_id=1).update(incremental_status_sync=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='incremental_status_sync')
+
+
 def test_check_netsuite_object_status_exception(create_bill_task, create_expense_report, mocker, db):
 
     mocker.patch(
@@ -786,33 +1113,37 @@ def test_load_attachments(db, add_netsuite_credentials, add_fyle_credentials, mo
     )
     mocker.patch(
         'netsuitesdk.api.files.Files.post',
-        return_value={'url': 'https://aaa.bbb.cc/x232sds'}
+        return_value={'internalId': '3451', 'externalId': 'txjvDntdQDo6', 'type': 'file', 'name': 'fiJjDdr67nl3_uber_expenses_vmrpw.pdf'}
     )
     mocker.patch(
         'netsuitesdk.api.files.Files.get',
         return_value={'url': 'https://aaa.bbb.cc/x232sds'}
     )
     mocker.patch(
-        'fyle_integrations_platform_connector.apis.Files.bulk_generate_file_urls',
-        return_value=[{
+        'apps.netsuite.connector.requests.get',
+        return_value=mocker.MagicMock(content=b'receipt')
+    )
+    mocker.patch(
+        'fyle.platform.apis.v1.admin.Files.bulk_generate_file_urls',
+        return_value={'data': [{
             "id": "sdfghjk",
             "name": "receipt.html",
             "content_type": "text/html",
-            "download_url": base64.b64encode("https://aaa.bbb.cc/x232sds".encode("utf-8")),
+            "download_url": "https://aaa.bbb.cc/x232sds",
             "upload_url": "https://john.cena/you_cant_see_me"
         },
         {
             "id": "sdfd2391",
             "name": "uber_expenses_vmrpw.pdf",
             "content_type": "application/pdf",
-            "download_url": base64.b64encode("https://aaa.bbb.cc/x232sds".encode("utf-8")),
+            "download_url": "https://aaa.bbb.cc/x232sds",
             "upload_url": "https://aaa.bbb.cc/x232sds"
-        }]
+        }]}
     )
 
     expense_group = ExpenseGroup.objects.filter(workspace_id=1).first()
     expense = expense_group.expenses.first()
-    expense.file_ids = ['sdfghjk']
+    expense.file_ids = ['sdfghjk', 'sdfd2391']
     expense.save()
 
     task_log = TaskLog.objects.filter(workspace_id=1).first()
@@ -824,14 +1155,14 @@ def test_load_attachments(db, add_netsuite_credentials, add_fyle_credentials, mo
     assert attachment == 'https://aaa.bbb.cc/x232sds'
 
     mocker.patch(
-        'fyle_integrations_platform_connector.apis.Files.bulk_generate_file_urls',
-        return_value=[{
+        'fyle.platform.apis.v1.admin.Files.bulk_generate_file_urls',
+        return_value={'data': [{
             "id": "sdfghjk",
             "name": "receipt.html",
             "content_type": "text/html",
-            "download_url": base64.b64encode("https://aaa.bbb.cc/x232sds".encode("utf-8")),
+            "download_url": "https://aaa.bbb.cc/x232sds",
             "upload_url": "https://john.cena/you_cant_see_me"
-        }]
+        }]}
     )
 
     attachment = load_attachments(netsuite_connection, expense_group.expenses.first(), expense_group, task_log)
@@ -844,6 +1175,30 @@ def test_load_attachments(db, add_netsuite_credentials, add_fyle_credentials, mo
     assert task_log.is_attachment_upload_failed == True
 
 
+def test_get_expense_attachments_shared_file(mocker, db, settings):
+    settings.FYLE_FILE_URLS_BATCH_SIZE = 1
+
+    platform = mocker.MagicMock()
+    platform.files.connection.bulk_generate_file_urls.side_effect = [
+        {'data': [{'id': 'fiHtml', 'name': 'receipt.html', 'content_type': 'text/html', 'download_url': 'https://aaa.bbb.cc/html'}]},
+        {'data': [{'id': 'fiJjDdr67nl3', 'name': 'receipt.pdf', 'content_type': 'application/pdf', 'download_url': 'https://aaa.bbb.cc/x232sds'}]}
+    ]
+
+    expenses = list(Expense.objects.order_by('id')[:2])
+    for expense in expenses:
+        expense.file_ids = ['fiHtml', 'fiJjDdr67nl3']
+
+    attachments = get_expense_attachments(platform, expenses)
+
+    assert platform.files.connection.bulk_generate_file_urls.call_args_list == [
+        mocker.call(payload={'data': [{'id': 'fiHtml'}]}),
+        mocker.call(payload={'data': [{'id': 'fiJjDdr67nl3'}]})
+    ]
+    platform.files.bulk_generate_file_urls.assert_not_called()
+    assert set(attachments) == {expense.expense_id for expense in expenses}
+    assert all(attachment['id'] == 'fiJjDdr67nl3' for attachment in attachments.values())
+
+
 def test_create_or_update_employee_mapping(mocker, db):
     mocker.patch(
         'apps.netsuite.connector.NetSuiteConnector.get_or_create_vendor',
@@ -1057,14 +1412,17 @@ def test_create_vendor_payment(db, mocker):
         return_value=data['creation_response']
     )
 
-    mocker.patch('fyle_integrations_platform_connector.apis.Expenses.get', return_value=data['expense'])
-
     workspace_id = 1
 
     expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
     expense_group.exported_at = datetime.now()
     expense_group.save()
 
+    mocker.patch(
+        'fyle.platform.apis.v1.admin.Expenses.list_all',
+        return_value=[{'data': [{'report_id': expense.report_id} for expense in expense_group.expenses.all()]}]
+    )
+
     task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
     task_log.status = 'COMPLETE'
     task_log.expense_group = expense_group
@@ -1127,14 +1485,17 @@ def test_create_vendor_payment_expense_report(db, mocker):
         return_value=data['creation_response']
     )
 
-    mocker.patch('fyle_integrations_platform_connector.apis.Expenses.get', return_value=data['expense'])
-
     workspace_id = 1
 
     expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
     expense_group.exported_at = datetime.now()
     expense_group.save()
 
+    mocker.patch(
+        'fyle.platform.apis.v1.admin.Expenses.list_all',
+        return_value=[{'data': [{'report_id': expense.report_id} for expense in expense_group.expenses.all()]}]
+    )
+
     task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
     task_log.status = 'COMPLETE'
     task_log.expense_group = expense_group
@@ -1155,6 +1516,53 @@ def test_create_vendor_payment_expense_report(db, mocker):
     assert task_log.detail == data['creation_response']
 
 
+def test_create_vendor_payment_with_bulk_status_polling(db, mocker):
+    FeatureConfig.objects.filter(workspace_id=1).update(bulk_status_polling=True)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='bulk_status_polling')
+
+    workspace_id = 1
+
+    expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
+    expense_group.exported_at = datetime.now()
+    expense_group.save()
+
+    task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
+    task_log.status = 'COMPLETE'
+    task_log.expense_group = expense_group
+    task_log.detail = {'internalId': 'sdfghjk'}
+    task_log.save()
+
+    bill = Bill.create_bill(expense_group)
+
+    list_all = mocker.patch(
+        'fyle.platform.apis.v1.admin.Expenses.list_all',
+        return_value=[{'data': [{'report_id': expense.report_id} for expense in expense_group.expenses.all()]}]
+    )
+    get_bill = mocker.patch('apps.netsuite.connector.NetSuiteConnector.get_bill')
+    get_transactions = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.get_transactions',
+        return_value={'sdfghjk': data['get_bill_response'][1]}
+    )
+    post_vendor_payment = mocker.patch(
+        'apps.netsuite.connector.NetSuiteConnector.post_vendor_payment',
+        return_value=data['creation_response']
+    )
+
+    run_create_vendor_payment(workspace_id)
+
+    assert list_all.call_count == 1
+    assert get_bill.call_count == 0
+    get_transactions.assert_called_once_with('vendorBill', ['sdfghjk'])
+    assert post_vendor_payment.call_args.args[2] == data['get_bill_response'][1]
+
+    bill.refresh_from_db()
+    assert bill.payment_synced == True
+    assert bill.paid_on_netsuite == True
+    assert all(expense.paid_on_fyle for expense in expense_group.expenses.all())
+
+    FeatureConfig.objects.filter(workspace_id=1).update(bulk_status_polling=False)
+    FeatureConfig.reset_feature_config_cache(workspace_id=1, key='bulk_status_polling')
+
 def test_schedule_vendor_payment_creation(db):
     
     general_mappings = GeneralMapping.objects.get(workspace_id=1)
@@ -1345,23 +1753,10 @@ def test__validate_tax_group_mapping(db):
     assert len(errs) == 1
 
 
-@pytest.mark.django_db()
-def test_check_expenses_reimbursement_status(db, mocker):
-
-    mocker.patch(
-        'fyle_integrations_platform_connector.apis.Expenses.get',
-        return_value=[],
-    )
-
-    fyle_credentials = FyleCredential.objects.get(workspace_id=1)
-    platform = PlatformConnector(fyle_credentials)
-
-    expenses = Expense.objects.filter(id=1)
-    expenses[0].settlement_id = 'setqi0eM6HUgZ'
-    expenses[0].save()
-
-    status = check_expenses_reimbursement_status(expenses, workspace_id=1, platform=platform, filter_credit_expenses=False)
-    assert status == False
+def test_get_id_filters():
+    assert list(get_id_filters(['rp1'])) == ['eq.rp1']
+    assert list(get_id_filters(['rp1', 'rp2', 'rp3'], chunk_size=2)) == ['in.("rp1", "rp2")', 'eq.rp3']
+    assert list(get_id_filters([])) == []
 
 
 def test__validate_expense_group(mocker, db):
@@ -1453,6 +1848,67 @@ def test_schedule_bills_creation(db, mocker):
     assert task_log.type == 'CREATING_BILL'
 
 
+def test_schedule_bills_creation_in_batches(db, mocker):
+    workspace_id = 1
+    mocker.patch(
+        'apps.tasks.models.TaskLog.objects.get_or_create',
+        return_value=[TaskLog.objects.filter(workspace_id=workspace_id, status='READY').first(),None]
+    )
+    run = mocker.patch(
+        'apps.netsuite.queue.TaskChainRunner.run',
+        return_value=None
+    )
+
+    feature_config = FeatureConfig.objects.get(workspace_id=workspace_id)
+    feature_config.export_in_batches = True
+    feature_config.save()
+    FeatureConfig.reset_feature_config_cache(workspace_id, 'export_in_batches')
+
+    expense_group = ExpenseGroup.objects.get(id=1)
+    expense_group.exported_at = None
+    expense_group.save()
+
+    schedule_bills_creation(workspace_id, [1], False, 'CCC', 0, triggered_by=ExpenseImportSourceEnum.DASHBOARD_SYNC)
+
+    chain_tasks = run.call_args[0][0]
+    assert len(chain_tasks) == 1
+    assert chain_tasks[0].target == 'apps.netsuite.tasks.create_exports_in_batch'
+    assert chain_tasks[0].args[0] == 'CREATING_BILL'
+    assert chain_tasks[0].args[1] == [1]
+    assert chain_tasks[0].args[3] is True
+
+    feature_config.export_in_batches = False
+    feature_config.save()
+    FeatureConfig.reset_feature_config_cache(workspace_id, 'export_in_batches')
+
+
+def test_schedule_bills_creation_query_count(db, mocker, django_assert_max_num_queries):
+    workspace_id = 1
+    mocker.patch('apps.netsuite.queue.check_interval_and_sync_dimension')
+    run = mocker.patch(
+        'apps.netsuite.queue.TaskChainRunner.run',
+        return_value=None
+    )
+
+    expense_groups = ExpenseGroup.objects.bulk_create([
+        ExpenseGroup(workspace_id=workspace_id, fund_source='PERSONAL', description={}) for _ in range(50)
+    ])
+    expense_group_ids = [expense_group.id for expense_group in expense_groups]
+    FeatureConfig.get_feature_config(workspace_id=workspace_id, key='export_in_batches')
+    FeatureConfig.get_feature_config(workspace_id=workspace_id, key='fyle_webhook_sync_enabled')
+
+    with django_assert_max_num_queries(8):
+        schedule_bills_creation(workspace_id, expense_group_ids, False, 'PERSONAL', 0, triggered_by=ExpenseImportSourceEnum.DASHBOARD_SYNC)
+
+    task_logs = TaskLog.objects.filter(expense_group_id__in=expense_group_ids)
+    assert task_logs.count() == 50
+    assert all(task_log.status == 'ENQUEUED' and task_log.type == 'CREATING_BILL' for task_log in task_logs)
+
+    chain_tasks = run.call_args[0][0]
+    assert len(chain_tasks) == 50
+    assert [task.args[2] for task in chain_tasks].count(True) == 1
+
+
 def test_schedule_credit_card_charge_creation(db, mocker):
     workspace_id = 1
     mocker.patch(
@@ -1564,21 +2020,25 @@ def test_upload_attachments_and_update_export(mocker, db):
     # mocking file upload
     mocker.patch(
         'netsuitesdk.api.files.Files.post',
-        return_value={'url': 'https://aaa.bbb.cc/x232sds'}
+        return_value={'internalId': '3451', 'externalId': 'txjvDntdQDo6', 'type': 'file', 'name': 'fiJjDdr67nl3_uber_expenses_vmrpw.pdf'}
     )
     mocker.patch(
         'netsuitesdk.api.files.Files.get',
         return_value={'url': 'https://aaa.bbb.cc/x232sds'}
     )
     mocker.patch(
-        'fyle_integrations_platform_connector.apis.Files.bulk_generate_file_urls',
-        return_value=[{
-            "id": "sdfd2391",
+        'apps.netsuite.connector.requests.get',
+        return_value=mocker.MagicMock(content=b'receipt')
+    )
+    mocker.patch(
+        'fyle.platform.apis.v1.admin.Files.bulk_generate_file_urls',
+        return_value={'data': [{
+            "id": "fiJjDdr67nl3",
             "name": "uber_expenses_vmrpw.pdf",
             "content_type": "application/pdf",
-            "download_url": base64.b64encode("https://aaa.bbb.cc/x232sds".encode("utf-8")),
+            "download_url": "https://aaa.bbb.cc/x232sds",
             "upload_url": "https://aaa.bbb.cc/x232sds"
-        }],
+        }]}
     )
 
     # mocking bill creation with the file being present
@@ -1742,14 +2202,17 @@ def test_skipping_vendor_payment(mocker, db):
         return_value=data['creation_response']
     )
 
-    mocker.patch('fyle_integrations_platform_connector.apis.Expenses.get', return_value=data['expense'])
-
     workspace_id = 1
 
     expense_group = ExpenseGroup.objects.filter(workspace_id=workspace_id, fund_source='PERSONAL').first()
     expense_group.exported_at = datetime.now()
     expense_group.save()
 
+    mocker.patch(
+        'fyle.platform.apis.v1.admin.Expenses.list_all',
+        return_value=[{'data': [{'report_id': expense.report_id} for expense in expense_group.expenses.all()]}]
+    )
+
     task_log = TaskLog.objects.filter(workspace_id=workspace_id).first()
     task_log.status = 'COMPLETE'
     task_log.expense_group = expense_group
@@ -2079,7 +2542,7 @@ def test_load_attachments_invalid_token_error(db, add_netsuite_credentials, mock
         return_value={'internalId': 'qwertyui', 'externalId': 'sdfghjk'}
     )
     mocker.patch(
-        'fyle_integrations_platform_connector.apis.Files.bulk_generate_file_urls',
+        'fyle.platform.apis.v1.admin.Files.bulk_generate_file_urls',
         side_effect=InvalidTokenError('Invalid token', 'invalid_token')
     )
 
@@ -2245,7 +2708,7 @@ def test_upload_attachments_invalid_token_error(mocker, db):
     task_log.save()
 
     mocker.patch(
-        'fyle_integrations_platform_connector.apis.Files.bulk_generate_file_urls',
+        'fyle.platform.apis.v1.admin.Files.bulk_generate_file_urls',
         side_effect=InvalidTokenError('Invalid token', 'invalid_token')
     )
 
@@ -2365,6 +2828,75 @@ def test_process_reimbursements_with_partial_payment(db, mocker, add_fyle_creden
     assert expense2.paid_on_fyle == False
 
 
+def test_process_reimbursements_in_batches(db, mocker, add_fyle_credentials, settings):
+    settings.FYLE_MARK_PAID_BATCH_SIZE = 2
+    workspace_id = 1
+
+    Expense.objects.filter(workspace_id=workspace_id).update(paid_on_fyle=True)
+    expense = Expense.objects.get(id=1)
+    for index in range(3):
+        expense.pk = None
+        expense.expense_id = 'txbatch{}'.format(index)
+        expense.report_id = 'rpbatch{}'.format(index)
+        expense.fund_source = 'PERSONAL'
+        expense.paid_on_fyle = False
+        expense.paid_on_netsuite = True
+        expense.save()
+
+    bulk_mark_as_paid = mocker.patch(
+        'fyle_integrations_platform_connector.apis.Reports.bulk_mark_as_paid',
+        side_effect=[
+            InternalServerError(msg='internal server error', response={
+                'data': [{'key': 'rpbatch0', 'message': 'Report is not in APPROVED or PAYMENT_PROCESSING State'}]
+            }),
+            [],
+            []
+        ]
+    )
+
+    run_process_reimbursements(workspace_id)
+
+    payload_report_ids = [[payload['id'] for payload in call.args[0]] for call in bulk_mark_as_paid.call_args_list]
+    assert bulk_mark_as_paid.call_count == 3
+    assert all(len(report_ids) <= 2 for report_ids in payload_report_ids)
+    assert 'rpbatch0' not in payload_report_ids[1]
+    assert sorted(payload_report_ids[1] + payload_report_ids[2]) == ['rpbatch1', 'rpbatch2']
+    assert Expense.objects.filter(workspace_id=workspace_id, report_id__startswith='rpbatch', paid_on_fyle=False).count() == 0
+
+
+def test_mark_paid_on_fyle_retries_failures(db, mocker):
+    workspace_id = 1
+
+    Expense.objects.filter(workspace_id=workspace_id).update(paid_on_fyle=True)
+    expense = Expense.objects.get(id=1)
+    expense.report_id = 'rpretry'
+    expense.fund_source = 'PERSONAL'
+    expense.paid_on_fyle = False
+    expense.save()
+
+    platform = mocker.MagicMock()
+    bulk_mark_as_paid = platform.reports.bulk_mark_as_paid
+    bulk_mark_as_paid.side_effect = [InternalServerError(msg='internal server error', response='Internal server error.'), []]
+    payloads = [{'id': 'rpretry', 'paid_notify_at': '2024-01-01T00:00:00.000000Z'}]
+
+    mark_paid_on_fyle(platform, payloads, {'rpretry'}, workspace_id)
+
+    assert bulk_mark_as_paid.call_count == 2
+    expense.refresh_from_db()
+    assert expense.paid_on_fyle == True
+
+    expense.paid_on_fyle = False
+    expense.save()
+    bulk_mark_as_paid.reset_mock()
+    bulk_mark_as_paid.side_effect = InternalServerError(msg='internal server error', response='Internal server error.')
+
+    mark_paid_on_fyle(platform, payloads, {'rpretry'}, workspace_id, retry_num=2)
+
+    assert bulk_mark_as_paid.call_count == 3
+    expense.refresh_from_db()
+    assert expense.paid_on_fyle == False
+
+
 def test_create_vendor_payment_trigger(db, mocker):
     """
     Test create_vendor_payment trigger function that publishes to RabbitMQ